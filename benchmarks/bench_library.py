@@ -0,0 +1,297 @@
+"""
+Бенчмарк основных операций библиотеки на каталогах разного размера.
+
+Для каждого размера каталога (по умолчанию 10 000, 100 000 и 1 000 000 книг) генерируется
+синтетический каталог (см. benchmarks.catalog) и измеряются операции Library:
+load_books, search_books, fuzzy_index (построение индекса нечеткого поиска с первым запросом),
+fuzzy_search (нечеткий поиск с опечаткой в запросе), update_status, add_book, remove_book и save_books.
+По каждой операции выводятся:
+- пропускная способность (операций в секунду);
+- задержка p50 и p99 (миллисекунды);
+- пиковая память, выделенная за одну операцию (МБ, по tracemalloc).
+
+Результаты сохраняются в JSON и сравниваются с сохраненным базовым результатом:
+операция считается регрессией, если ее p50 или пиковая память выросли больше чем на threshold.
+При регрессии программа завершается с кодом 1.
+
+Запуск:
+python -m benchmarks.bench_library --sizes 10000 100000 --output results.json
+python -m benchmarks.bench_library --sizes 10000 --baseline benchmarks/baseline.json
+python -m benchmarks.bench_library --sizes 10000 --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from benchmarks.catalog import FIRST_NAMES, LAST_NAMES, TITLE_WORDS, random_year, write_catalog
+from book.book_class import Library
+from book.user_exception import NotBookError
+
+
+DEFAULT_SIZES: List[int] = [10000, 100000, 1000000]
+
+# Количество повторов операции по умолчанию (операция останавливается раньше, если вышло время)
+ITERATIONS: Dict[str, int] = {
+    'load_books': 3,
+    'search_books': 200,
+    'fuzzy_index': 1,
+    'fuzzy_search': 200,
+    'update_status': 200,
+    'add_book': 200,
+    'remove_book': 200,
+    'save_books': 3,
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Возвращает процентиль выборки (методом ближайшего ранга).
+
+    :param samples: Значения выборки.
+    :param fraction: Доля от 0 до 1 (0.5 - медиана, 0.99 - p99).
+    """
+    ordered = sorted(samples)
+    # Округление убирает погрешность вида 0.99 * 100 = 99.00000000000001
+    rank = max(0, min(len(ordered) - 1, math.ceil(round(fraction * len(ordered), 9)) - 1))
+    return ordered[rank]
+
+
+def peak_memory(operation: Callable[[], Any]) -> float:
+    """
+    Измеряет пиковую память, выделенную при выполнении операции.
+
+    :param operation: Операция без аргументов.
+    :return: Пиковая память в мегабайтах.
+    """
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def run_operation(operations: List[Callable[[], Any]], max_seconds: float,
+                  measure_memory: bool) -> Dict[str, Any]:
+    """
+    Выполняет серию операций и собирает статистику.
+
+    :param operations: Операции без аргументов (каждая выполняется один раз).
+    :param max_seconds: Время, после которого серия останавливается (выполняется хотя бы одна операция).
+    :param measure_memory: Если True, последняя операция выполняется под tracemalloc.
+    :return: Словарь статистики операции.
+    """
+    samples: List[float] = []
+    started = time.perf_counter()
+    timed = operations[:-1] if measure_memory and len(operations) > 1 else operations
+    for operation in timed:
+        begin = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - begin)
+        if time.perf_counter() - started > max_seconds:
+            break
+    result = {
+        'iterations': len(samples),
+        'ops_per_sec': len(samples) / sum(samples) if sum(samples) else None,
+        'p50_ms': percentile(samples, 0.5) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+    }
+    if measure_memory:
+        result['peak_memory_mb'] = peak_memory(operations[-1])
+    return result
+
+
+def library_operations(library: Library, filename: str, options: Dict[str, Any],
+                       rng: random.Random) -> List[Tuple[str, List[Callable[[], Any]]]]:
+    """
+    Готовит операции для измерения на загруженной библиотеке.
+
+    Операции строятся заранее, чтобы генерация данных не попадала в замер.
+
+    :param library: Загруженная библиотека.
+    :param filename: Файл библиотеки.
+    :param options: Параметры Library.
+    :param rng: Генератор случайных чисел.
+    :return: Список (имя операции, операции).
+    """
+    ids = list(library.books)
+
+    def search(term: str) -> Callable[[], Any]:
+        def operation():
+            try:
+                library.search_books(term)
+            except NotBookError:
+                pass
+        return operation
+
+    def fuzzy_search(term: str) -> Callable[[], Any]:
+        def operation():
+            try:
+                library.search_books(term, fuzzy=True)
+            except NotBookError:
+                pass
+        return operation
+
+    def build_fuzzy_index(term: str) -> Callable[[], Any]:
+        def operation():
+            library.fuzzy_index = None
+            fuzzy_search(term)()
+        return operation
+
+    def typo(word: str) -> str:
+        # Одна опечатка в слове длиннее 3 букв - такие слова нечеткий поиск находит
+        if len(word) <= 3:
+            return word
+        position = rng.randrange(len(word))
+        return word[:position] + rng.choice('абвгдеклмнопрст') + word[position + 1:]
+
+    def update(book_id: int) -> Callable[[], Any]:
+        def operation():
+            status = library.books[book_id].status
+            library.update_status(str(book_id), 'выдана' if status == 'в наличии' else 'в наличии')
+        return operation
+
+    def add(title: str, author: str, year: int) -> Callable[[], Any]:
+        return lambda: library.add_book(title, author, str(year))
+
+    def remove(book_id: int) -> Callable[[], Any]:
+        return lambda: library.remove_book(str(book_id))
+
+    terms = [rng.choice(TITLE_WORDS + LAST_NAMES) for _ in range(ITERATIONS['search_books'])]
+    typos = [typo(rng.choice(TITLE_WORDS + LAST_NAMES)) for _ in range(ITERATIONS['fuzzy_search'])]
+    removed = rng.sample(ids, min(len(ids), ITERATIONS['remove_book']))
+    return [
+        ('load_books', [lambda: Library(filename, **options)] * ITERATIONS['load_books']),
+        ('search_books', [search(term) for term in terms]),
+        ('fuzzy_index', [build_fuzzy_index(term) for term in typos[:ITERATIONS['fuzzy_index']]]),
+        ('fuzzy_search', [fuzzy_search(term) for term in typos]),
+        ('update_status', [update(rng.choice(ids)) for _ in range(ITERATIONS['update_status'])]),
+        ('add_book', [add(f'{rng.choice(TITLE_WORDS).capitalize()} {number}',
+                          f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', random_year(rng))
+                      for number in range(ITERATIONS['add_book'])]),
+        ('remove_book', [remove(book_id) for book_id in removed]),
+        ('save_books', [library.save_books] * ITERATIONS['save_books']),
+    ]
+
+
+def bench_size(size: int, directory: str, options: Dict[str, Any], max_seconds: float,
+               measure_memory: bool, seed: int = 42) -> Dict[str, Any]:
+    """
+    Измеряет операции библиотеки на каталоге заданного размера.
+
+    :param size: Количество книг в каталоге.
+    :param directory: Каталог для временных файлов.
+    :param options: Параметры Library (journal, columnar и т.д.).
+    :param max_seconds: Наибольшее время серии одной операции.
+    :param measure_memory: Если True, измеряется пиковая память операций.
+    :param seed: Начальное значение генератора каталога.
+    :return: Словарь {операция: статистика}.
+    """
+    filename = os.path.join(directory, f'library_{size}.json')
+    write_catalog(filename, size, seed)
+    results: Dict[str, Any] = {}
+    library = Library(filename, **options)
+    try:
+        for name, operations in library_operations(library, filename, options, random.Random(seed)):
+            results[name] = run_operation(operations, max_seconds, measure_memory)
+    finally:
+        library.close()
+    return results
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Сравнивает результаты с базовыми и возвращает описания регрессий.
+
+    :param results: Результаты текущего запуска.
+    :param baseline: Базовые результаты.
+    :param threshold: Допустимый относительный рост p50 и пиковой памяти (0.25 - на 25%).
+    :return: Список строк с описанием регрессий (пустой, если регрессий нет).
+    """
+    regressions = []
+    for size, operations in results['sizes'].items():
+        for name, current in operations.items():
+            previous = baseline.get('sizes', {}).get(size, {}).get(name)
+            if previous is None:
+                continue
+            for metric in ('p50_ms', 'peak_memory_mb'):
+                if current.get(metric) is None or not previous.get(metric):
+                    continue
+                ratio = current[metric] / previous[metric]
+                if ratio > 1 + threshold:
+                    regressions.append(f'{size:>8} {name:<14} {metric}: '
+                                       f'{previous[metric]:.3f} -> {current[metric]:.3f} (x{ratio:.2f})')
+    return regressions
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Выводит таблицу результатов."""
+    print(f"{'книг':>8} {'операция':<14} {'опер/с':>10} {'p50 мс':>10} {'p99 мс':>10} {'память МБ':>10}")
+    for size, operations in results['sizes'].items():
+        for name, stats in operations.items():
+            memory = stats.get('peak_memory_mb')
+            print(f"{size:>8} {name:<14} {stats['ops_per_sec'] or 0:>10.1f} {stats['p50_ms']:>10.3f} "
+                  f"{stats['p99_ms']:>10.3f} {'-' if memory is None else f'{memory:.2f}':>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк операций библиотеки')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='размеры каталога')
+    parser.add_argument('--journal', action='store_true', help='библиотека в режиме журнала')
+    parser.add_argument('--columnar', action='store_true', help='колоночное хранилище книг')
+    parser.add_argument('--max-seconds', type=float, default=10.0, help='наибольшее время серии одной операции')
+    parser.add_argument('--no-memory', action='store_true', help='не измерять пиковую память')
+    parser.add_argument('--output', help='файл JSON для результатов')
+    parser.add_argument('--baseline', help='файл JSON с базовыми результатами для поиска регрессий')
+    parser.add_argument('--save-baseline', help='сохранить результаты как базовые в указанный файл')
+    parser.add_argument('--threshold', type=float, default=0.25, help='допустимый рост p50 и памяти (доля)')
+    args = parser.parse_args(argv)
+
+    options = {'journal': args.journal, 'columnar': args.columnar}
+    results: Dict[str, Any] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': options,
+        'sizes': {},
+    }
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        for size in args.sizes:
+            # Библиотека печатает сообщения пользователю - в замер они не выводятся
+            with contextlib.redirect_stdout(devnull):
+                results['sizes'][str(size)] = bench_size(size, directory, options, args.max_seconds,
+                                                         not args.no_memory)
+            print(f'Каталог {size} книг измерен', file=sys.stderr)
+    print_results(results)
+
+    for filename in (args.output, args.save_baseline):
+        if filename:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('options') != options:
+            print('Внимание: базовые результаты получены с другими параметрами библиотеки', file=sys.stderr)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print('Регрессии относительно базовых результатов:')
+            for line in regressions:
+                print(line)
+            return 1
+        print('Регрессий нет')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Бенчмарк памяти, занимаемой книгами библиотеки.
+
+Сравнивает количество байт на одну книгу для трех представлений:
+- до: обычные объекты с __dict__ (как класс Book до перехода на __slots__);
+- Book с __slots__ в словаре {id: Book};
+- колоночное хранилище ColumnarBooks.
+
+Запуск:
+python -m benchmarks.bench_memory --books 100000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from book.book_class import Book
+from book.columnar import ColumnarBooks
+
+
+class DictBook:
+    """Книга с __dict__ - представление Book до перехода на __slots__."""
+
+    def __init__(self, book_id: int, title: str, author: str, year: int) -> None:
+        self.id = book_id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.status = 'в наличии'
+
+
+def generate_books(count: int):
+    """Возвращает данные книг: уникальные названия и повторяющиеся авторы."""
+    for book_id in range(1, count + 1):
+        # Строки собираются заново, как при разборе JSON, поэтому одинаковые авторы не разделяются
+        yield book_id, f'Книга номер {book_id}', ''.join(['Автор ', str(book_id % 1000)]), 1800 + book_id % 225
+
+
+def measure(build, count: int) -> float:
+    """
+    Измеряет память, выделенную при построении хранилища книг.
+
+    :param build: Функция, которая строит хранилище из данных книг.
+    :param count: Количество книг.
+    :return: Количество байт на одну книгу.
+    """
+    gc.collect()
+    tracemalloc.start()
+    storage = build(generate_books(count))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del storage
+    return size / count
+
+
+def build_dict_books(rows):
+    return {book_id: DictBook(book_id, title, author, year) for book_id, title, author, year in rows}
+
+
+def build_slotted_books(rows):
+    return {book_id: Book(book_id, title, sys.intern(author), year) for book_id, title, author, year in rows}
+
+
+def build_columnar_books(rows):
+    books = ColumnarBooks()
+    for book_id, title, author, year in rows:
+        books[book_id] = Book(book_id, title, author, year)
+    return books
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Память на одну книгу')
+    parser.add_argument('--books', type=int, default=100000, help='количество книг')
+    args = parser.parse_args()
+
+    for name, build in (('dict Book (до)', build_dict_books),
+                        ('slots Book', build_slotted_books),
+                        ('ColumnarBooks', build_columnar_books)):
+        print(f'{name:<16} {measure(build, args.books):8.1f} байт/книга')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Бенчмарк поиска в библиотеке с шардами (book.sharded_library) в сравнении с одной Library.
+
+Синтетический каталог (см. benchmarks.catalog) делится на 1, 2, 4, ... шардов (split_library),
+и для каждого количества шардов измеряются:
+- open_s - открытие ShardedLibrary (шарды загружаются параллельно, каждый в своем процессе);
+- search_qps - поисковых запросов в секунду (поиск по названию, автору и году выполняется
+  во всех шардах одновременно, результаты сливаются в порядке id);
+- speedup - отношение search_qps к поиску в одной Library в этом же процессе.
+
+Кэш поиска отключен, чтобы каждый запрос действительно выполнялся. Ускорение ограничено
+количеством процессоров (оно выводится в начале) и передачей найденных книг между процессами:
+запросы, которые находят большую часть каталога, масштабируются хуже избирательных.
+
+Запуск:
+python -m benchmarks.bench_sharded --books 1000000 --shards 1 2 4 8
+python -m benchmarks.bench_sharded --books 100000 --rounds 5 --output sharded.json
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+from benchmarks.catalog import write_catalog
+from book.book_class import Library
+from book.sharded_library import ShardedLibrary, split_library
+from book.user_exception import NotBookError
+
+
+# Запросы разной избирательности: слово названия, фамилия автора, год, сочетание слов
+QUERIES: List[str] = ['сад', 'вишневый', 'чехов', 'пастернак', '1995', '1812', 'мастер и', 'том 3',
+                      'идиот', 'анна', 'собачье сердце', 'ревизор']
+
+
+def search_qps(search: Callable[[str], Any], rounds: int) -> float:
+    """Выполняет все запросы rounds раз и возвращает количество запросов в секунду."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            try:
+                search(query)
+            except NotBookError:
+                pass
+    return rounds * len(QUERIES) / (time.perf_counter() - start)
+
+
+def bench_sharded(books: int, shard_counts: List[int], directory: str, rounds: int) -> Dict[str, Any]:
+    """
+    Измеряет поиск в одной библиотеке и в библиотеках с разным количеством шардов.
+
+    :return: Словарь {'library': {...}, 'shards': {количество шардов: {замер: значение}}}.
+    """
+    source = os.path.join(directory, 'library.json')
+    write_catalog(source, books)
+    library = Library(source, search_cache=0)
+    baseline = search_qps(library.search_books, rounds)
+    library.close()
+    # Книги одной библиотеки не должны оставаться в памяти процесса: сборщик мусора обходил бы их
+    # при каждом слиянии результатов шардов
+    del library
+    gc.collect()
+    results: Dict[str, Any] = {'books': books, 'cpus': os.cpu_count(),
+                               'library': {'search_qps': baseline}, 'shards': {}}
+    for shards in shard_counts:
+        filename = os.path.join(directory, f'sharded_{shards}.json')
+        split_library(source, filename, shards)
+        start = time.perf_counter()
+        sharded = ShardedLibrary(filename, search_cache=0)
+        opened = time.perf_counter() - start
+        try:
+            qps = search_qps(sharded.search_books, rounds)
+        finally:
+            sharded.close()
+        results['shards'][str(shards)] = {'open_s': opened, 'search_qps': qps, 'speedup': qps / baseline}
+    return results
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    print(f"Книг: {results['books']}, процессоров: {results['cpus']}")
+    print(f"{'шардов':>7} {'открытие с':>11} {'запросов/с':>11} {'ускорение':>10}")
+    print(f"{'-':>7} {'-':>11} {results['library']['search_qps']:>11.1f} {1.0:>10.2f}")
+    for shards, stats in results['shards'].items():
+        print(f"{shards:>7} {stats['open_s']:>11.2f} {stats['search_qps']:>11.1f} {stats['speedup']:>10.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк поиска в библиотеке с шардами')
+    parser.add_argument('--books', type=int, default=1000000, help='размер каталога')
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8], help='количества шардов')
+    parser.add_argument('--rounds', type=int, default=3, help='количество повторов набора запросов')
+    parser.add_argument('--output', help='файл JSON для результатов')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        # Библиотека печатает сообщения пользователю - в замер они не выводятся
+        with contextlib.redirect_stdout(devnull):
+            results = bench_sharded(args.books, args.shards, directory, args.rounds)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Бенчмарк двоичного снимка библиотеки (book.snapshot) в сравнении с файлом JSON.
+
+Для каждого размера каталога генерируется синтетический каталог (см. benchmarks.catalog)
+в формате JSON, переводится в снимок (convert_library) и измеряются:
+- размер файла;
+- чтение книг из файла (iter_book_records для JSON, read_snapshot для снимка);
+- загрузка Library без поискового и вторичных индексов - время, которое определяется форматом файла;
+- загрузка Library с индексами (параметр --indexes);
+- открытие снимка только для чтения (Library(..., read_only=True), см. book.mapped_storage).
+
+По каждому замеру выводится медиана из --repeat повторов.
+
+Запуск:
+python -m benchmarks.bench_snapshot --sizes 100000 1000000
+python -m benchmarks.bench_snapshot --sizes 100000 --indexes --output snapshot.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+from benchmarks.catalog import write_catalog
+from book.book_class import Library
+from book.snapshot import read_snapshot
+from book.storage import convert_library, iter_book_records
+
+
+DEFAULT_SIZES: List[int] = [10000, 100000, 1000000]
+
+
+def median_seconds(operation: Callable[[], Any], repeat: int) -> float:
+    """Возвращает медиану времени выполнения операции в секундах."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_size(size: int, directory: str, repeat: int, indexes: bool) -> Dict[str, Any]:
+    """
+    Сравнивает JSON и снимок на каталоге заданного размера.
+
+    :return: Словарь {формат: {замер: значение}}.
+    """
+    json_filename = os.path.join(directory, f'library_{size}.json')
+    snap_filename = os.path.join(directory, f'library_{size}.snap')
+    write_catalog(json_filename, size)
+    convert_library(json_filename, snap_filename)
+    readers = {
+        'json': lambda: sum(1 for _ in iter_book_records(json_filename)),
+        'snap': lambda: sum(1 for _ in read_snapshot(snap_filename)),
+    }
+    results: Dict[str, Any] = {}
+    for name, filename in (('json', json_filename), ('snap', snap_filename)):
+        stats = {
+            'size_mb': os.path.getsize(filename) / (1024 * 1024),
+            'read_s': median_seconds(readers[name], repeat),
+            'load_s': median_seconds(
+                lambda: Library(filename, search_index=False, secondary_index=False), repeat),
+        }
+        if indexes:
+            stats['load_indexed_s'] = median_seconds(lambda: Library(filename), repeat)
+        results[name] = stats
+    results['snap']['open_mapped_s'] = median_seconds(
+        lambda: Library(snap_filename, read_only=True).close(), repeat)
+    return results
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Выводит таблицу результатов и ускорение снимка относительно JSON."""
+    print(f"{'книг':>8} {'формат':<6} {'МБ':>8} {'чтение с':>10} {'загрузка с':>11} {'с индексами с':>14} "
+          f"{'mmap с':>9}")
+    for size, formats in results['sizes'].items():
+        for name, stats in formats.items():
+            indexed, mapped = stats.get('load_indexed_s'), stats.get('open_mapped_s')
+            print(f"{size:>8} {name:<6} {stats['size_mb']:>8.2f} {stats['read_s']:>10.3f} {stats['load_s']:>11.3f} "
+                  f"{'-' if indexed is None else f'{indexed:.3f}':>14} {'-' if mapped is None else f'{mapped:.4f}':>9}")
+        json_stats, snap_stats = formats['json'], formats['snap']
+        print(f"{size:>8} {'x':<6} {json_stats['size_mb'] / snap_stats['size_mb']:>8.1f} "
+              f"{json_stats['read_s'] / snap_stats['read_s']:>10.1f} {json_stats['load_s'] / snap_stats['load_s']:>11.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк двоичного снимка библиотеки')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='размеры каталога')
+    parser.add_argument('--repeat', type=int, default=3, help='количество повторов каждого замера')
+    parser.add_argument('--indexes', action='store_true', help='измерить и загрузку с поисковыми индексами')
+    parser.add_argument('--output', help='файл JSON для результатов')
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {'sizes': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results['sizes'][str(size)] = bench_size(size, directory, args.repeat, args.indexes)
+            print(f'Каталог {size} книг измерен', file=sys.stderr)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Бенчмарк запуска приложения: время импорта и время до первого приглашения меню.
+
+На синтетическом каталоге (см. benchmarks.catalog) измеряются:
+- interpreter_s - запуск пустого интерпретатора python (нижняя граница остальных замеров);
+- import_s - запуск python с импортом модуля main;
+- first_prompt_s - от запуска 'python main.py --library <файл>' до вывода приглашения меню.
+  Консоль загружает каталог в фоновом потоке, поэтому время не должно зависеть от размера каталога;
+- eager_load_s - для сравнения: создание Library с загрузкой всех книг;
+- get_book_s - чтение книги по id во время фоновой загрузки каталога (по индексу смещений).
+
+Замеры запуска процесса - медиана из --repeat запусков. Если время до первого приглашения больше
+--budget секунд или время импорта больше --import-budget секунд, бенчмарк завершается с кодом 1,
+поэтому его можно запускать в CI.
+
+Запуск:
+python -m benchmarks.bench_startup --books 100000 --budget 0.5
+python -m benchmarks.bench_startup --books 1000000 --import-budget 0.2 --output startup.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+from benchmarks.catalog import write_catalog
+from book.book_class import Library
+from book.lexicon import LEXICON
+
+
+# Каталог проекта: в нем находится main.py
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child_environment() -> Dict[str, str]:
+    """Возвращает окружение дочернего процесса: модули проекта доступны, вывод в UTF-8."""
+    return {**os.environ, 'PYTHONPATH': ROOT, 'PYTHONIOENCODING': 'utf-8'}
+
+
+def time_process(args: List[str], directory: str) -> float:
+    """Возвращает время работы процесса python с аргументами args в секундах."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=directory, env=child_environment(), check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def time_to_prompt(filename: str, directory: str) -> float:
+    """
+    Запускает консольное меню и возвращает время до вывода приглашения выбрать действие.
+
+    :raises RuntimeError: Если процесс завершился, не выведя приглашение.
+    """
+    prompt = LEXICON['choice_menu'].encode('utf-8')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py'), '--library', filename],
+                               cwd=directory, env=child_environment(), stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        output = b''
+        while prompt not in output:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError('консоль завершилась до приглашения меню')
+            output += chunk
+        return time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+        process.stdout.close()
+        process.stdin.close()
+
+
+def get_book_during_load(filename: str, book_id: int) -> Dict[str, Any]:
+    """Измеряет чтение книги по id сразу после создания библиотеки с фоновой загрузкой."""
+    library = Library(filename, background_load=True)
+    start = time.perf_counter()
+    library.get_book(book_id)
+    elapsed = time.perf_counter() - start
+    before_load = not library.loaded
+    library.close()
+    return {'get_book_s': elapsed, 'get_book_before_load': before_load}
+
+
+def bench_startup(books: int, directory: str, repeat: int) -> Dict[str, Any]:
+    """
+    Выполняет замеры запуска на каталоге из books книг.
+
+    :return: Словарь {замер: значение}.
+    """
+    filename = os.path.join(directory, 'library.json')
+    write_catalog(filename, books)
+    # Сохранение библиотеки с отложенной загрузкой записывает индекс смещений книг
+    Library(filename, search_index=False, secondary_index=False, lazy=True).save_books()
+
+    def median(samples: List[float]) -> float:
+        return statistics.median(samples)
+
+    results: Dict[str, Any] = {
+        'books': books,
+        'interpreter_s': median([time_process(['-c', 'pass'], directory) for _ in range(repeat)]),
+        'import_s': median([time_process(['-c', 'import main'], directory) for _ in range(repeat)]),
+        'first_prompt_s': median([time_to_prompt(filename, directory) for _ in range(repeat)]),
+    }
+    start = time.perf_counter()
+    Library(filename)
+    results['eager_load_s'] = time.perf_counter() - start
+    results.update(get_book_during_load(filename, max(books // 2, 1)))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк запуска приложения')
+    parser.add_argument('--books', type=int, default=100000, help='размер каталога')
+    parser.add_argument('--repeat', type=int, default=5, help='количество запусков процесса для каждого замера')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='наибольшее допустимое время до первого приглашения меню, секунды')
+    parser.add_argument('--import-budget', type=float, help='наибольшее допустимое время импорта main, секунды')
+    parser.add_argument('--output', help='файл JSON для результатов')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        # Библиотека печатает сообщения пользователю - в замер они не выводятся
+        with contextlib.redirect_stdout(devnull):
+            results = bench_startup(args.books, directory, args.repeat)
+    for name, value in results.items():
+        print(f'{name:<22} {value:.4f}' if isinstance(value, float) else f'{name:<22} {value}')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+    exceeded = []
+    if results['first_prompt_s'] > args.budget:
+        exceeded.append(f"first_prompt_s {results['first_prompt_s']:.3f} с > {args.budget} с")
+    if args.import_budget is not None and results['import_s'] > args.import_budget:
+        exceeded.append(f"import_s {results['import_s']:.3f} с > {args.import_budget} с")
+    if exceeded:
+        print('Превышен бюджет запуска:')
+        for line in exceeded:
+            print(line)
+        return 1
+    print('Бюджет запуска соблюден')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
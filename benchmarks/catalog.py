@@ -0,0 +1,74 @@
+"""
+Генератор синтетического каталога книг для бенчмарков.
+
+Каталог детерминирован (задается seed) и похож на настоящий:
+- названия из 1-4 русских слов с номером тома у части книг;
+- авторы - имя и фамилия из ограниченного набора, поэтому у автора много книг;
+- годы издания распределены неравномерно: больше всего книг XX и XXI века;
+- около 15% книг выданы.
+
+Пример использования:
+write_catalog('library.json', 100000)
+"""
+
+import random
+from typing import Dict, Any, Iterator, List
+from book.storage import is_jsonl, write_book_records
+
+
+FIRST_NAMES: List[str] = [
+    'Лев', 'Федор', 'Антон', 'Александр', 'Михаил', 'Иван', 'Николай', 'Анна', 'Марина',
+    'Борис', 'Владимир', 'Сергей', 'Евгений', 'Константин', 'Ольга', 'Татьяна', 'Юрий', 'Василий',
+]
+LAST_NAMES: List[str] = [
+    'Толстой', 'Достоевский', 'Чехов', 'Пушкин', 'Булгаков', 'Тургенев', 'Гоголь', 'Ахматова',
+    'Цветаева', 'Пастернак', 'Набоков', 'Шолохов', 'Бунин', 'Паустовский', 'Островский', 'Лермонтов',
+    'Грибоедов', 'Куприн', 'Платонов', 'Солженицын', 'Есенин', 'Маяковский', 'Гончаров', 'Лесков',
+]
+TITLE_WORDS: List[str] = [
+    'война', 'мир', 'преступление', 'наказание', 'вишневый', 'сад', 'мастер', 'маргарита', 'отцы',
+    'дети', 'мертвые', 'души', 'тихий', 'дон', 'белая', 'гвардия', 'горе', 'ума', 'обломов',
+    'идиот', 'бесы', 'братья', 'капитанская', 'дочка', 'герой', 'нашего', 'времени', 'записки',
+    'охотника', 'гроза', 'доктор', 'живаго', 'собачье', 'сердце', 'дворянское', 'гнездо', 'пиковая',
+    'дама', 'степь', 'чайка', 'поединок', 'котлован', 'ревизор', 'шинель', 'лето', 'господне',
+]
+
+
+def random_year(rng: random.Random) -> int:
+    """Возвращает год издания: большинство книг изданы после 1900 года."""
+    return int(rng.triangular(1700, 2024, 1995))
+
+
+def generate_catalog(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    Возвращает записи книг каталога (в формате файла библиотеки).
+
+    :param count: Количество книг.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Итератор по словарям книг с id от 1 до count.
+    """
+    rng = random.Random(seed)
+    for book_id in range(1, count + 1):
+        words = rng.sample(TITLE_WORDS, rng.randint(1, 4))
+        title = ' '.join(words).capitalize()
+        if rng.random() < 0.2:
+            title = f'{title}. Том {rng.randint(1, 5)}'
+        yield {
+            'id': book_id,
+            'title': title,
+            'author': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'year': random_year(rng),
+            'status': 'выдана' if rng.random() < 0.15 else 'в наличии',
+        }
+
+
+def write_catalog(filename: str, count: int, seed: int = 42) -> None:
+    """
+    Записывает каталог в файл библиотеки (JSON или JSON Lines по расширению файла).
+
+    :param filename: Имя файла библиотеки.
+    :param count: Количество книг.
+    :param seed: Начальное значение генератора случайных чисел.
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        write_book_records(f, generate_catalog(count, seed), jsonl=is_jsonl(filename))
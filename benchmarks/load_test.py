@@ -0,0 +1,215 @@
+"""
+Нагрузочный тест HTTP-сервиса библиотеки (python main.py serve).
+
+Скрипт запускает сервис в отдельном процессе на синтетическом каталоге (см. benchmarks.catalog)
+или подключается к уже запущенному сервису (--url) и нагружает его множеством параллельных
+клиентов. Каждый клиент выполняет смесь запросов:
+- чтение: поиск (GET /books/search), нечеткий поиск и страница книг (GET /books);
+- изменение (доля --write-ratio): добавление книги и изменение статуса.
+
+По каждому виду запроса выводятся количество, ошибки, задержка p50 и p99,
+а также общая пропускная способность (запросов в секунду).
+
+Запуск:
+python -m benchmarks.load_test --books 100000 --clients 32 --requests 200
+python -m benchmarks.load_test --url http://127.0.0.1:8080 --clients 64 --write-ratio 0.2
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+from benchmarks.bench_library import percentile
+from benchmarks.catalog import FIRST_NAMES, LAST_NAMES, TITLE_WORDS, random_year, write_catalog
+
+
+def request(host: str, port: int, method: str, path: str,
+            body: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+    """
+    Выполняет один запрос к сервису.
+
+    :return: Код ответа и тело ответа JSON.
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        connection.close()
+
+
+def client_requests(rng: random.Random, count: int, write_ratio: float,
+                    max_id: int) -> List[Tuple[str, str, str, Optional[Dict[str, Any]]]]:
+    """
+    Готовит запросы одного клиента заранее, чтобы генерация данных не попадала в замер.
+
+    :return: Список (вид запроса, метод, путь, тело).
+    """
+    requests = []
+    for _ in range(count):
+        if rng.random() < write_ratio:
+            if rng.random() < 0.5:
+                body = {'title': rng.choice(TITLE_WORDS).capitalize(),
+                        'author': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                        'year': random_year(rng)}
+                requests.append(('add', 'POST', '/books', body))
+            else:
+                status = rng.choice(['в наличии', 'выдана'])
+                requests.append(('status', 'PUT', f'/books/{rng.randint(1, max_id)}/status', {'status': status}))
+        else:
+            kind = rng.choices(['search', 'fuzzy', 'page'], weights=[6, 1, 3])[0]
+            if kind == 'search':
+                path = f'/books/search?q={quote(rng.choice(TITLE_WORDS + LAST_NAMES))}'
+            elif kind == 'fuzzy':
+                word = rng.choice(LAST_NAMES).lower()
+                position = rng.randrange(len(word))
+                path = f'/books/search?fuzzy=1&q={quote(word[:position] + word[position + 1:])}'
+            else:
+                path = f'/books?offset={rng.randint(0, max_id)}&limit=20'
+            requests.append((kind, 'GET', path, None))
+    return requests
+
+
+def run_load(host: str, port: int, clients: int, count: int, write_ratio: float, max_id: int,
+             seed: int = 42) -> Dict[str, Any]:
+    """
+    Нагружает сервис параллельными клиентами.
+
+    Код 404 (книга не найдена) и 400 (статус уже установлен) - ожидаемые ответы,
+    ошибками считаются ответы 5xx и сбои соединения.
+
+    :param host: Адрес сервиса.
+    :param port: Порт сервиса.
+    :param clients: Количество параллельных клиентов.
+    :param count: Количество запросов каждого клиента.
+    :param write_ratio: Доля изменяющих запросов.
+    :param max_id: Наибольший id книги для запросов изменения статуса и страниц.
+    :param seed: Начальное значение генератора запросов.
+    :return: Статистика по видам запросов и общая пропускная способность.
+    """
+    plans = [client_requests(random.Random(seed + number), count, write_ratio, max_id)
+             for number in range(clients)]
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    start = threading.Barrier(clients + 1)
+
+    def client(plan) -> None:
+        local: List[Tuple[str, float, bool]] = []
+        start.wait()
+        for kind, method, path, body in plan:
+            begin = time.perf_counter()
+            try:
+                status, _ = request(host, port, method, path, body)
+                failed = status >= 500
+            except (OSError, http.client.HTTPException, ValueError):
+                failed = True
+            local.append((kind, time.perf_counter() - begin, failed))
+        with lock:
+            for kind, elapsed, failed in local:
+                samples.setdefault(kind, []).append(elapsed)
+                errors[kind] = errors.get(kind, 0) + failed
+
+    threads = [threading.Thread(target=client, args=(plan,)) for plan in plans]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in samples.values())
+    return {
+        'clients': clients,
+        'requests': total,
+        'seconds': elapsed,
+        'requests_per_sec': total / elapsed if elapsed else None,
+        'operations': {
+            kind: {
+                'count': len(values),
+                'errors': errors[kind],
+                'p50_ms': percentile(values, 0.5) * 1000,
+                'p99_ms': percentile(values, 0.99) * 1000,
+            }
+            for kind, values in sorted(samples.items())
+        },
+    }
+
+
+def start_service(filename: str, workers: int) -> Tuple[subprocess.Popen, int]:
+    """
+    Запускает сервис библиотеки в отдельном процессе на свободном порту.
+
+    :return: Процесс сервиса и его порт.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(root, 'main.py'), '--library', filename,
+         'serve', '--port', '0', '--workers', str(workers)],
+        stdout=subprocess.PIPE, text=True, encoding='utf-8', cwd=os.path.dirname(filename))
+    # Первая строка вывода - адрес сервиса (после загрузки библиотеки)
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError('сервис библиотеки не запустился')
+    return process, urlsplit(line.split()[-1]).port
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Выводит таблицу результатов."""
+    print(f"Клиентов: {results['clients']}, запросов: {results['requests']}, "
+          f"время: {results['seconds']:.2f} с, запросов/с: {results['requests_per_sec']:.1f}")
+    print(f"{'запрос':<8} {'кол-во':>8} {'ошибки':>8} {'p50 мс':>10} {'p99 мс':>10}")
+    for kind, stats in results['operations'].items():
+        print(f"{kind:<8} {stats['count']:>8} {stats['errors']:>8} {stats['p50_ms']:>10.2f} {stats['p99_ms']:>10.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Нагрузочный тест HTTP-сервиса библиотеки')
+    parser.add_argument('--url', help='адрес запущенного сервиса (по умолчанию сервис запускается скриптом)')
+    parser.add_argument('--books', type=int, default=100000, help='размер синтетического каталога')
+    parser.add_argument('--workers', type=int, default=8, help='потоки обработки запросов запускаемого сервиса')
+    parser.add_argument('--clients', type=int, default=32, help='количество параллельных клиентов')
+    parser.add_argument('--requests', type=int, default=100, help='количество запросов каждого клиента')
+    parser.add_argument('--write-ratio', type=float, default=0.1, help='доля изменяющих запросов')
+    parser.add_argument('--output', help='файл JSON для результатов')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        process = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+            max_id = args.books
+        else:
+            filename = os.path.join(directory, 'library.json')
+            write_catalog(filename, args.books)
+            process, port = start_service(filename, args.workers)
+            host, max_id = '127.0.0.1', args.books
+        try:
+            results = run_load(host, port, args.clients, args.requests, args.write_ratio, max_id)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+    return 1 if any(stats['errors'] for stats in results['operations'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
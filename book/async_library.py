@@ -0,0 +1,146 @@
+"""
+Модуль асинхронного интерфейса библиотеки.
+
+Класс AsyncLibrary позволяет работать с библиотекой из asyncio (например, из веб-сервиса
+на aiohttp), не останавливая цикл событий на файловых операциях:
+- методы библиотеки выполняются в пуле потоков (executor);
+- изменения выполняются по одному под asyncio.Lock, в порядке вызова;
+- чтение выполняется под блокировкой для чтения (book.rwlock.RWLock) одновременно с другим
+  чтением, а изменения - под блокировкой для изменения;
+- библиотека, открытая через AsyncLibrary.open, сохраняет файл в фоновом потоке
+  (см. book.writer); чтение не захватывает блокировку библиотеки, поэтому не ждет ни записи
+  файла, ни снимка книг для нее.
+
+Пример использования:
+async def main():
+    async with await AsyncLibrary.open('library.json', journal=True) as library:
+        await library.add_book('Война и мир', 'Лев Толстой', '1869')
+        books = await library.search_books('война')
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, List, Optional, Union
+from book.book_class import Book, Library
+from book.rwlock import RWLock
+
+
+class AsyncLibrary:
+    def __init__(self, library: Library, executor: Optional[Executor] = None) -> None:
+        """
+        Инициализация асинхронного интерфейса к библиотеке.
+
+        Чтобы чтение не ждало сохранения, библиотека должна быть создана с background_save
+        (так ее создает AsyncLibrary.open) или хранить книги в SQLite.
+
+        :param library: Библиотека.
+        :param executor: Пул потоков для операций с библиотекой. По умолчанию - пул цикла событий.
+        """
+        self.library: Library = library
+        self.executor: Optional[Executor] = executor
+        # Изменения выполняются строго по одному: в пуле потоков они могли бы идти параллельно
+        self._lock = asyncio.Lock()
+        # Чтение в пуле потоков идет параллельно, но не одновременно с изменением
+        self._rwlock = RWLock()
+
+    @classmethod
+    async def open(cls, filename: str = 'library.json', save_delay: Optional[float] = 0.2,
+                   executor: Optional[Executor] = None, **options: Any) -> 'AsyncLibrary':
+        """
+        Загружает библиотеку в пуле потоков и возвращает асинхронный интерфейс к ней.
+
+        :param filename: Имя файла библиотеки.
+        :param save_delay: Пауза фонового сохранения в секундах (None - сохранять сразу).
+                           Для библиотеки с shared=True фоновое сохранение не используется.
+        :param executor: Пул потоков для операций с библиотекой.
+        :param options: Остальные параметры Library.
+        :return: Экземпляр AsyncLibrary.
+        """
+        if save_delay is not None and not options.get('shared'):
+            options.setdefault('background_save', save_delay)
+        loop = asyncio.get_running_loop()
+        library = await loop.run_in_executor(executor, functools.partial(Library, filename, **options))
+        return cls(library, executor)
+
+    async def _run(self, function: Callable, *args: Any) -> Any:
+        """Выполняет функцию в пуле потоков."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args))
+
+    async def _mutate(self, function: Callable, *args: Any) -> Any:
+        """Выполняет изменяющий метод библиотеки в пуле потоков под asyncio.Lock."""
+        async with self._lock:
+            return await self._run(self._write, function, *args)
+
+    def _write(self, function: Callable, *args: Any) -> Any:
+        """Выполняет изменяющий метод библиотеки под блокировкой для изменения."""
+        with self._rwlock.write():
+            return function(*args)
+
+    def _read(self, function: Callable, *args: Any) -> Any:
+        """
+        Выполняет читающий метод библиотеки под блокировкой для чтения.
+
+        Блокировка потоков библиотеки не захватывается: ее держит фоновое сохранение на время
+        снимка книг, а снимок не мешает чтению (книги во время записи не меняются, см. Library._snapshot_books).
+        """
+        with self._rwlock.read():
+            return function(*args)
+
+    async def add_book(self, title: str, author: str, year: str) -> str:
+        """Асинхронная версия Library.add_book."""
+        return await self._mutate(self.library.add_book, title, author, year)
+
+    async def create_book(self, title: str, author: str, year: Union[int, str],
+                          book_id: Optional[int] = None) -> Book:
+        """Асинхронная версия Library.create_book."""
+        return await self._mutate(self.library.create_book, title, author, year, book_id)
+
+    async def reserve_ids(self, count: int) -> range:
+        """Асинхронная версия Library.reserve_ids."""
+        return await self._mutate(self.library.reserve_ids, count)
+
+    async def remove_book(self, book_id: str) -> str:
+        """Асинхронная версия Library.remove_book."""
+        return await self._mutate(self.library.remove_book, book_id)
+
+    async def update_status(self, book_id: int, new_status: str) -> str:
+        """Асинхронная версия Library.update_status."""
+        return await self._mutate(self.library.update_status, book_id, new_status)
+
+    async def remove_books(self, book_ids: Iterable[Union[int, str]]) -> str:
+        """Асинхронная версия Library.remove_books."""
+        return await self._mutate(self.library.remove_books, list(book_ids))
+
+    async def update_status_many(self, book_ids: Iterable[Union[int, str]], new_status: str) -> str:
+        """Асинхронная версия Library.update_status_many."""
+        return await self._mutate(self.library.update_status_many, list(book_ids), new_status)
+
+    async def search_books(self, search_date: str, fuzzy: bool = False, top_k: int = 10) -> List[Book]:
+        """Асинхронная версия Library.search_books."""
+        return await self._run(self._read, self.library.search_books, search_date, fuzzy, top_k)
+
+    async def get_book(self, book_id: Union[int, str]) -> Book:
+        """Асинхронная версия Library.get_book."""
+        return await self._run(self._read, self.library.get_book, book_id)
+
+    async def display_books(self, offset: int = 0, limit: Optional[int] = None) -> List[Book]:
+        """Асинхронная версия Library.display_books."""
+        return await self._run(self._read, self.library.display_books, offset, limit)
+
+    async def flush(self) -> None:
+        """Дожидается сохранения всех изменений."""
+        async with self._lock:
+            await self._run(self.library.flush)
+
+    async def close(self) -> None:
+        """Сохраняет отложенные изменения и закрывает библиотеку."""
+        async with self._lock:
+            await self._run(self._write, self.library.close)
+
+    async def __aenter__(self) -> 'AsyncLibrary':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
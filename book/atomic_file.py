@@ -0,0 +1,88 @@
+"""
+Модуль атомарной записи файлов.
+
+Файл записывается во временный файл в том же каталоге, данные сбрасываются на диск (fsync),
+после чего временный файл атомарно заменяет исходный (os.replace). При сбое или нехватке
+места на диске во время записи исходный файл остается целым.
+
+Перед заменой можно сохранить несколько предыдущих версий файла:
+'<файл>.1' - предыдущая версия, '<файл>.2' - версия перед ней и т.д.
+
+Пример использования:
+with atomic_write('library.json', backups=3) as f:
+    f.write(data)
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, IO
+
+
+def fsync_directory(path: str) -> None:
+    """
+    Сбрасывает на диск запись каталога, чтобы переименование файла пережило сбой питания.
+
+    :param path: Путь к каталогу.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        # На Windows каталоги нельзя открыть для fsync
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def rotate_backups(filename: str, backups: int) -> None:
+    """
+    Сдвигает резервные копии файла и сохраняет текущую версию как '<файл>.1'.
+
+    :param filename: Имя файла.
+    :param backups: Количество хранимых резервных копий.
+    """
+    if backups <= 0 or not os.path.exists(filename):
+        return
+    for number in range(backups - 1, 0, -1):
+        older = f'{filename}.{number}'
+        if os.path.exists(older):
+            os.replace(older, f'{filename}.{number + 1}')
+    backup = f'{filename}.1'
+    if os.path.exists(backup):
+        os.remove(backup)
+    try:
+        # Жесткая ссылка не копирует данные: исходный файл все равно будет заменен новым
+        os.link(filename, backup)
+    except OSError:
+        shutil.copy2(filename, backup)
+
+
+@contextmanager
+def atomic_write(filename: str, mode: str = 'w', encoding: str = 'utf-8', backups: int = 0) -> Iterator[IO]:
+    """
+    Открывает временный файл для записи и атомарно заменяет им исходный файл.
+
+    Если внутри блока with возникает ошибка, временный файл удаляется, а исходный не меняется.
+
+    :param filename: Имя файла.
+    :param mode: Режим открытия временного файла ('w' или 'wb').
+    :param encoding: Кодировка для текстового режима.
+    :param backups: Количество хранимых предыдущих версий файла.
+    :return: Открытый временный файл.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_filename = tempfile.mkstemp(prefix=f'.{os.path.basename(filename)}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        rotate_backups(filename, backups)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+    fsync_directory(directory)
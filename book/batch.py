@@ -0,0 +1,217 @@
+"""
+Модуль пакетного (неинтерактивного) режима работы с библиотекой.
+
+Команды читаются из файла или стандартного ввода, по одной на строку, без вывода меню и пауз.
+Аргументы разделяются пробелами, аргументы с пробелами берутся в двойные кавычки
+(кавычка внутри такого аргумента удваивается: "Сказка ""Морозко"" и другие").
+
+add "Война и мир" "Лев Толстой" 1869
+remove 10-50,77
+status 3,5 выдана
+search толстой
+fuzzy грибоедв
+list 0 20
+
+Пустые строки и строки, начинающиеся с '#', пропускаются.
+На каждую команду выводится одна строка JSON (JSON Lines):
+{"line": 1, "command": "add", "ok": true, "result": {"id": 1, "title": "Война и мир", ...}}
+{"line": 2, "command": "remove", "ok": false, "error": "InvalidBookIDError", "message": "..."}
+
+Библиотека сохраняется в фоновом потоке (см. book.writer), поэтому серия изменений
+не перезаписывает файл после каждой команды. Все изменения сохраняются до завершения работы.
+
+Пример использования:
+python main.py --batch commands.txt
+cat commands.txt | python main.py --batch -
+"""
+
+import contextlib
+import csv
+import json
+import logging
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+from book.book_class import Library, Book
+from book.lexicon import LEXICON_LOG
+from book.validators import validate_book, parse_book_ids
+from book.user_exception import BookError, BulkOperationError, BatchCommandError, InvalidBookIntError
+
+
+# Пауза фонового сохранения в пакетном режиме (секунды)
+SAVE_DELAY = 0.2
+
+
+def parse_command(line: str) -> List[str]:
+    """
+    Разбирает строку команды на имя команды и аргументы.
+
+    :param line: Строка команды.
+    :raises BatchCommandError: Если кавычки в строке расставлены неверно.
+    :return: Список из имени команды и аргументов.
+    """
+    # Строки без кавычек разбираются быстрым split, остальные - модулем csv (он написан на C)
+    if '"' not in line:
+        return line.split()
+    try:
+        return next(csv.reader([line], delimiter=' ', skipinitialspace=True, strict=True))
+    except csv.Error as e:
+        raise BatchCommandError(f"кавычки в строке - {e}")
+
+
+def books_result(books: List[Book]) -> List[Dict[str, Any]]:
+    """Возвращает книги в виде списка словарей."""
+    return [book.book_dict() for book in books]
+
+
+def _add(library: Library, title: str, author: str, year: str) -> Dict[str, Any]:
+    validate_book(title, author, year)
+    return library.create_book(title, author, year).book_dict()
+
+
+def _remove(library: Library, book_ids: str) -> Dict[str, Any]:
+    ids = parse_book_ids(book_ids)
+    if len(ids) == 1:
+        library.remove_book(str(ids[0]))
+    else:
+        library.remove_books(ids)
+    return {'removed': ids}
+
+
+def _status(library: Library, book_ids: str, new_status: str) -> Dict[str, Any]:
+    ids = parse_book_ids(book_ids)
+    if len(ids) == 1:
+        library.update_status(str(ids[0]), new_status)
+    else:
+        library.update_status_many(ids, new_status)
+    return {'updated': ids, 'status': new_status}
+
+
+def _search(library: Library, search_date: str) -> List[Dict[str, Any]]:
+    return books_result(library.search_books(search_date))
+
+
+def _int_arg(value: str) -> int:
+    """Возвращает неотрицательный целый аргумент команды (как параметры запроса в book.server)."""
+    if not value.isdigit():
+        raise InvalidBookIntError(value)
+    return int(value)
+
+
+def _fuzzy(library: Library, search_date: str, top_k: str = '10') -> List[Dict[str, Any]]:
+    return books_result(library.search_books(search_date, fuzzy=True, top_k=_int_arg(top_k)))
+
+
+def _list(library: Library, offset: str = '0', limit: Optional[str] = None) -> List[Dict[str, Any]]:
+    return books_result(library.display_books(_int_arg(offset), _int_arg(limit) if limit is not None else None))
+
+
+def _save(library: Library) -> None:
+    library.save_books()
+
+
+# Команды: имя -> (функция, наименьшее и наибольшее количество аргументов)
+COMMANDS: Dict[str, Tuple[Callable[..., Any], int, int]] = {
+    'add': (_add, 3, 3),
+    'remove': (_remove, 1, 1),
+    'status': (_status, 2, 2),
+    'search': (_search, 1, 1),
+    'fuzzy': (_fuzzy, 1, 2),
+    'list': (_list, 0, 2),
+    'save': (_save, 0, 0),
+}
+
+
+def execute(library: Library, command: str, args: List[str]) -> Any:
+    """
+    Выполняет одну команду пакетного режима.
+
+    :param library: Библиотека.
+    :param command: Имя команды.
+    :param args: Аргументы команды.
+    :raises BatchCommandError: Если команда неизвестна или число аргументов неверно.
+    :raises BookError: Ошибки проверки данных библиотеки.
+    :return: Результат команды, который можно записать в JSON.
+    """
+    if command not in COMMANDS:
+        raise BatchCommandError(f"неизвестная команда {command}")
+    function, min_args, max_args = COMMANDS[command]
+    if not min_args <= len(args) <= max_args:
+        raise BatchCommandError(f"неверное количество аргументов команды {command}: {len(args)}")
+    return function(library, *args)
+
+
+def run_batch(library: Library, lines: Iterable[str], output: TextIO) -> Tuple[int, int]:
+    """
+    Выполняет команды и выводит результат каждой команды строкой JSON.
+
+    Ошибка в одной команде (в том числе ошибка хранилища) не прерывает выполнение остальных:
+    она выводится строкой JSON с "ok": false.
+
+    :param library: Библиотека.
+    :param lines: Строки команд.
+    :param output: Поток для вывода результатов.
+    :return: Количество выполненных команд и количество команд с ошибкой.
+    """
+    executed = failed = 0
+    write = output.write
+    # Методы библиотеки печатают сообщения для меню - в пакетном режиме они не выводятся
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            executed += 1
+            response: Dict[str, Any] = {'line': line_number}
+            try:
+                command, *args = parse_command(line)
+                response['command'] = command
+                response['result'] = execute(library, command, args)
+                response['ok'] = True
+            except (BookError, ValueError) as e:
+                failed += 1
+                response['ok'] = False
+                response['error'] = type(e).__name__
+                response['message'] = str(e)
+                if isinstance(e, BulkOperationError):
+                    response['errors'] = [str(error) for error in e.errors]
+                logging.error("%s %s: %s", LEXICON_LOG['error_batch_command'], line_number, e)
+            except Exception as e:
+                # Ошибка хранилища (OSError, sqlite3.Error и т.д.) - тоже ошибка только этой команды
+                failed += 1
+                response['ok'] = False
+                response['error'] = type(e).__name__
+                response['message'] = str(e)
+                logging.exception("%s %s", LEXICON_LOG['error_batch_command'], line_number)
+            write(json.dumps(response, ensure_ascii=False))
+            write('\n')
+    logging.info("%s %s, %s", LEXICON_LOG['batch_done'], executed, failed)
+    return executed, failed
+
+
+def batch_console(filename: str, commands: str, journal: bool = False, shared: bool = False,
+                  output: Optional[TextIO] = None) -> int:
+    """
+    Запускает пакетный режим: открывает библиотеку, выполняет команды и сохраняет изменения.
+
+    :param filename: Файл библиотеки.
+    :param commands: Файл команд или '-' для чтения команд из стандартного ввода.
+    :param journal: Если True, изменения дописываются в журнал.
+    :param shared: Если True, с библиотекой могут работать несколько процессов
+                   (тогда изменения сохраняются сразу, без фонового сохранения).
+    :param output: Поток для вывода результатов (по умолчанию стандартный вывод).
+    :return: Код завершения: 0 - все команды выполнены, 1 - были ошибки.
+    """
+    logging.info("%s %s", LEXICON_LOG['batch_start'], commands)
+    output = output if output is not None else sys.stdout
+    library = Library(filename, journal=journal, shared=shared,
+                      background_save=None if shared else SAVE_DELAY)
+    try:
+        if commands == '-':
+            _, failed = run_batch(library, sys.stdin, output)
+        else:
+            with open(commands, encoding='utf-8') as f:
+                _, failed = run_batch(library, f, output)
+    finally:
+        library.close()
+    return 1 if failed else 0
@@ -35,24 +35,35 @@ for book in found_books:
 
 
 import json
-import os
+import sqlite3
+from array import array
+from bisect import bisect_left
+import sys
+import threading
 import logging
-from typing import Dict, Any, List
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, Union, MutableMapping
 from book.lexicon import LEXICON_LOG, LEXICON, LEXICON_STEP
+from book.search_index import SearchIndex
+from book.search_cache import SearchCache
+from book.fuzzy_search import FuzzyIndex
+from book.id_allocator import IdAllocator
+from book.index_file import LoadedIndexes
+from book.snapshot import SnapshotError
+from book.secondary_index import SecondaryIndex, book_year
+from book.validators import validate_book
+from book.storage import StorageBackend, open_storage
+from book.writer import BackgroundWriter
 from book.user_exception import (NotInputError, InvalidBookIDError, NotBookError, DisplayBookError, 
-                            InvalidStatusError, DuplicateStatusError)
-
-
-# Настройка логирования. Логи сохраняются в файл "book.log".
-logging.basicConfig(
-    filename = 'book.log',  
-    level = logging.INFO,  
-    format = '%(asctime)s - %(levelname)s - %(message)s', 
-)
+                            InvalidStatusError, DuplicateStatusError, BookError, InvalidBookIntError,
+                            BulkOperationError, InvalidRowError)
 
 
 class Book:
-    def __init__(self, book_id: int, title: str, author: str, year: str)-> None:
+    # Книг в библиотеке могут быть миллионы, поэтому экземпляры не имеют __dict__
+    __slots__ = ('id', 'title', 'author', 'year', 'status')
+
+    def __init__(self, book_id: int, title: str, author: str, year: Union[int, str])-> None:
         """
         Инициализация экземпляра класса Book.
 
@@ -64,7 +75,7 @@ class Book:
         self.id: int = book_id
         self.title: str = title
         self.author: str = author
-        self.year: str = year
+        self.year: Union[int, str] = year
         self.status: str = 'в наличии'
     
     def book_dict(self) -> Dict[str, str]:
@@ -90,64 +101,487 @@ class Book:
         :return: Экземпляр Book.
         :raises KeyError: если в словаре отсутствуют необходимые ключи.
         """
-        book = Book(data['id'], data['title'], data['author'], data['year'])
-        book.status = data['status']
+        # Авторы и статусы повторяются у многих книг - храним одну копию каждой строки
+        book = Book(data['id'], data['title'], sys.intern(data['author']), data['year'])
+        book.status = sys.intern(data['status'])
         return book
     
 
+def check_page(offset: int, limit: Optional[int]) -> None:
+    """
+    Проверяет границы страницы книг: срез с отрицательным offset или limit вернул бы не ту страницу.
+
+    :raises ValueError: Если offset или limit отрицательные.
+    """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError(f'offset и limit страницы не могут быть отрицательными: {offset}, {limit}')
+
+
 class Library:
-    def __init__(self, filename: str = 'library.json') -> None:
+    def __init__(self, filename: str = 'library.json', journal: bool = False,
+                 compact_threshold: int = 1000, compact_bytes: int = 64 * 1024 * 1024,
+                 search_index: bool = True, columnar: bool = False,
+                 storage: Optional[StorageBackend] = None, shared: bool = False, backups: int = 0,
+                 background_save: Optional[float] = None, secondary_index: bool = True,
+                 search_cache: int = 1024, search_cache_ttl: Optional[float] = None,
+                 reuse_ids: bool = False, read_only: bool = False, lazy: bool = False,
+                 background_load: bool = False, journal_fsync: bool = True) -> None:
         """
         Инициализация экземпляра класса Library.
 
         :param filename: Имя файла для хранения данных о книгах. По умолчанию 'library.json'.
+                         Файлы '.db'/'.sqlite' хранятся в базе SQLite.
+        :param journal: Если True, изменения дописываются в журнал '<filename>.journal', 
+                        а не перезаписывают весь файл библиотеки.
+        :param compact_threshold: Количество записей в журнале, после которого журнал 
+                                  сворачивается в файл библиотеки.
+        :param compact_bytes: Размер журнала в байтах, после которого журнал сворачивается.
+        :param journal_fsync: Если True (по умолчанию), каждое изменение в режиме журнала сбрасывается
+                              на диск (os.fsync) и переживает сбой питания. False быстрее, но последние
+                              изменения могут пропасть при сбое питания (см. book.journal).
+        :param search_index: Если True, поиск выполняется по инвертированному индексу, 
+                             а не полным перебором книг.
+        :param columnar: Если True, книги хранятся в компактном колоночном хранилище 
+                         (book.columnar.ColumnarBooks) вместо словаря объектов Book.
+        :param storage: Хранилище библиотеки. По умолчанию выбирается по имени файла.
+        :param shared: Если True, с файлом библиотеки могут одновременно работать несколько процессов 
+                       (изменения выполняются под межпроцессной блокировкой, см. book.locking).
+        :param backups: Количество хранимых предыдущих версий файла библиотеки.
+        :param background_save: Если задано, полная перезапись файла выполняется в фоновом потоке 
+                                после паузы в background_save секунд без новых изменений 
+                                (см. book.writer). Несовместимо с shared=True.
+        :param secondary_index: Если True, поддерживаются индексы по автору, году и статусу 
+                                для методов find_by_* (см. book.secondary_index).
+        :param search_cache: Количество поисковых запросов, результаты которых хранятся в кэше 
+                             (см. book.search_cache). 0 - без кэша.
+        :param search_cache_ttl: Время жизни результата в кэше в секундах (None - без ограничения).
+        :param reuse_ids: Если True, id удаленных книг выдаются новым книгам повторно 
+                          (см. book.id_allocator).
+        :param read_only: Если True, файл двоичного снимка отображается в память, а книги читаются 
+                          из него при обращении (см. book.mapped_storage). Изменения запрещены.
+        :param lazy: Если True, книги загружаются не при создании библиотеки, а при первом обращении
+                     к каталогу (поиск, вывод, изменение). Книгу по id (get_book) до загрузки можно
+                     получить из файла по индексу смещений (см. book.offset_index), который записывается
+                     при сохранении библиотеки с lazy или background_load.
+        :param background_load: Если True, книги загружаются в фоновом потоке сразу после создания
+                                библиотеки (включает lazy): методы, которым нужен каталог, дожидаются
+                                окончания загрузки, а get_book отвечает и во время загрузки.
+        :raises ValueError: Если одновременно заданы shared и background_save.
         """
+        if shared and background_save is not None:
+            raise ValueError('background_save несовместим с shared=True')
         self.filename: str = filename
-        self.books: dict = {}
-        self.next_id: int = 1
-        self.load_books()
+        self.storage: StorageBackend = storage or open_storage(
+            filename, read_only=read_only, journal=journal, compact_threshold=compact_threshold,
+            compact_bytes=compact_bytes, shared=shared, backups=backups,
+            offset_index=lazy or background_load, journal_fsync=journal_fsync)
+        # Блокировка потоков: изменения библиотеки и фоновое сохранение не выполняются одновременно
+        self.lock = threading.RLock()
+        self.writer: Optional[BackgroundWriter] = None
+        if background_save is not None:
+            self.writer = BackgroundWriter(self._save_in_background, delay=background_save)
+        self.columnar: bool = columnar
+        self.books: MutableMapping[int, Book] = self._empty_books()
+        # True, пока словарь books без копирования записывает фоновое сохранение (см. _snapshot_books)
+        self._books_shared: bool = False
+        # Выдача id книг; ее состояние хранится вместе с метаданными библиотеки
+        self.ids: IdAllocator = IdAllocator(reuse=reuse_ids)
+        self.index: Optional[SearchIndex] = None
+        if search_index and not self.storage.native_search:
+            self.index = SearchIndex()
+        self.secondary_index: Optional[SecondaryIndex] = None
+        if secondary_index and not self.storage.native_search:
+            self.secondary_index = SecondaryIndex()
+        # Хранилище, которое ищет само (SQLite), могут менять другие процессы - его результаты не кэшируем
+        self.search_cache: Optional[SearchCache] = None
+        if search_cache and not self.storage.native_search:
+            self.search_cache = SearchCache(search_cache, ttl=search_cache_ttl)
+        # Индекс нечеткого поиска (строится при первом нечетком поиске) и версия данных хранилища,
+        # по которой он построен (см. StorageBackend.data_version)
+        self.fuzzy_index: Optional[FuzzyIndex] = None
+        self._fuzzy_version: Optional[int] = None
+        # Отсортированные id книг для постраничного вывода словаря книг (строится при первом запросе)
+        self._id_order: Optional[array] = None
+        # False, пока при загрузке проигрываются записи, уже учтенные в индексах из файла (см. book.index_file)
+        self._indexing: bool = True
+        # Отложенная загрузка: событие окончания загрузки и поток фоновой загрузки
+        self._loaded = threading.Event()
+        self._loader: Optional[threading.Thread] = None
+        self._load_error: Optional[BaseException] = None
+        if background_load:
+            self._loader = threading.Thread(target=self._load_in_background, name='library-loader', daemon=True)
+            self._loader.start()
+        elif not lazy:
+            self.load_books()
+            self._loaded.set()
+
+    @property
+    def next_id(self) -> int:
+        """Следующий еще не выданный id книги."""
+        return self.ids.next_id
+
+    @next_id.setter
+    def next_id(self, value: int) -> None:
+        self.ids.next_id = value
+
+    @property
+    def loaded(self) -> bool:
+        """True, если книги уже загружены (при отложенной загрузке - False до первого обращения)."""
+        return self._loaded.is_set()
+
+    def wait_loaded(self) -> None:
+        """
+        Дожидается загрузки книг, а при отложенной загрузке без фонового потока загружает их сейчас.
+
+        До окончания загрузки словарь books неполон, поэтому код, который обращается к нему напрямую,
+        а не через методы Library, сначала вызывает wait_loaded.
+        """
+        if self._loaded.is_set():
+            return
+        if self._loader is not None:
+            self._loaded.wait()
+            if self._load_error is not None:
+                raise self._load_error
+            return
+        with self.lock:
+            if not self._loaded.is_set():
+                self.load_books()
+                self._loaded.set()
+
+    def _load_in_background(self) -> None:
+        """
+        Загружает книги в фоновом потоке.
+
+        Блокировка библиотеки не захватывается: методы, которым нужен каталог, ждут события 
+        окончания загрузки, поэтому до его установки книги никто, кроме этого потока, не меняет.
+        """
+        try:
+            self.load_books()
+        except BaseException as e:
+            # Ошибку получат методы, которые ждут загрузки
+            self._load_error = e
+        finally:
+            self._loaded.set()
+
+    def _empty_books(self) -> MutableMapping[int, Book]:
+        """Создает пустой словарь книг (обычный или колоночный)."""
+        if self.columnar:
+            # Импорт внутри метода: модуль columnar сам использует класс Book из этого модуля
+            from book.columnar import ColumnarBooks
+            return ColumnarBooks()
+        return {}
 
     def load_books(self) -> None:
         """
-        Загружает книги из файла JSON.
+        Загружает книги из хранилища (по умолчанию - файл JSON, массив или JSON Lines).
 
         Метод пытается открыть указанный файл и загрузить данные о книгах в словарь books.
+        Если рядом с файлом есть журнал изменений, его записи проигрываются поверх загруженных книг.
+        Хранилище, которое само ведет словарь книг (SQLite), не загружает книги в память.
+        Поисковый и вторичные индексы загружаются из файла индексов, если он относится к текущей
+        версии библиотеки (к ним применяются только более поздние записи журнала), иначе строятся заново.
         Если файл не существует или возникает ошибка при десериализации данных,
         записывает сообщение об ошибке в лог и выводит сообщение пользователю.
         """
         try: 
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data:List[Dict[str, Any]] = json.load(f)
-                    for book_data in data:
-                        book = Book.from_book_in_dict(book_data)
-                        self.books[book.id] = book
-                        if book.id >= self.next_id:
-                            self.next_id = book.id + 1
+            books = self.storage.open_books()
+            if books is not None:
+                self.books = books
+                self.ids.advance((self.storage.max_id() or 0) + 1)
+            if self.index is not None:
+                self.index = SearchIndex()
+            if self.secondary_index is not None:
+                self.secondary_index = SecondaryIndex()
+            self._id_order = None
+            self.fuzzy_index = None
+            if self.search_cache is not None:
+                self.search_cache.clear()
+            if self.index is not None or self.secondary_index is not None:
+                self._use_saved_indexes(self.storage.read_indexes())
+            for record in self.storage.load():
+                self._apply_record(record)
             logging.info(LEXICON_LOG['load_library'])
-        except (IOError, json.JSONDecodeError) as e:
-            logging.error(f"{LEXICON_LOG['error_load_library']} {e}")
+        except (IOError, json.JSONDecodeError, sqlite3.Error, SnapshotError) as e:
+            if not self._indexing:
+                # Книги загружены не полностью - индексы из файла им не соответствуют
+                self.index = SearchIndex(self.books.values()) if self.index is not None else None
+                if self.secondary_index is not None:
+                    self.secondary_index = SecondaryIndex(self.books.values())
+            logging.error("%s %s", LEXICON_LOG['error_load_library'], e)
             print(LEXICON['error_load_library'])
+        finally:
+            self._indexing = True
+
+    def _use_saved_indexes(self, loaded: Optional[LoadedIndexes]) -> None:
+        """
+        Подставляет индексы, загруженные из файла, вместо пустых индексов библиотеки.
+
+        Индексы используются, только если в файле есть все индексы, включенные в библиотеке.
+        До записи {'op': 'indexed'} книги, которые передает хранилище, в индексы не добавляются.
+
+        :param loaded: Результат StorageBackend.read_indexes.
+        """
+        if loaded is None:
+            return
+        _, index, secondary_index = loaded
+        if (self.index is not None and index is None) or (self.secondary_index is not None and secondary_index is None):
+            return
+        if self.index is not None:
+            self.index = index
+        if self.secondary_index is not None:
+            self.secondary_index = secondary_index
+        logging.info(LEXICON_LOG['load_indexes'])
+        self._indexing = False
+
+    def reload(self) -> None:
+        """Загружает библиотеку из хранилища заново, отбрасывая книги в памяти."""
+        self.books = self._empty_books()
+        self.ids = IdAllocator(reuse=self.ids.reuse)
+        self.load_books()
+
+    def refresh(self) -> None:
+        """
+        Подтягивает изменения, сделанные другими процессами (для библиотеки с shared=True).
+
+        Изменяющие методы делают это сами; refresh нужен перед чтением, если важно видеть 
+        самые свежие данные.
+        """
+        self.wait_loaded()
+        # Изменения другого процесса меняют книги и индексы - как и свои изменения, под блокировкой
+        with self.lock:
+            self.storage.refresh(self)
 
     def save_books(self):
         """
-        Сохраняет книги в файл JSON.
+        Сохраняет книги в хранилище (по умолчанию - файл JSON).
 
-        Метод открывает файл для записи и сериализует данные о книгах из словаря books в формате JSON.
+        Метод открывает файл для записи и сериализует данные о книгах из словаря books в формате JSON
+        (или JSON Lines, если у файла расширение '.jsonl').
         Если при сохранении возникает ошибка, она записывается в лог и выводится сообщение об ошибке.
+        Книгу, которую нельзя записать в формат файла (ValueError, например год-дробь в снимке),
+        повторное сохранение не исправит, поэтому такая ошибка передается вызывающему коду.
+        При фоновом сохранении запись выполняется в потоке сохранения, а метод дожидается ее окончания.
         """
+        self.wait_loaded()
+        if self.writer is not None:
+            self.writer.schedule()
+            self.writer.flush()
+            return
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                data:List[Dict[str, Any]] = [book.book_dict() for book in self.books.values()]
-                json.dump(data, f, ensure_ascii=False, indent=4)
-                logging.info(LEXICON_LOG['save_books'])
+            with self._transaction():
+                self.storage.prepare_save(self)
+                self.storage.save(self.books)
+            logging.info(LEXICON_LOG['save_books'])
         except OSError as e:
-            logging.error(f"{LEXICON_LOG['error_save_books']} {e}")
+            logging.error("%s %s", LEXICON_LOG['error_save_books'], e)
+            print(LEXICON['error_save_books'])
+        except ValueError as e:
+            logging.error("%s %s", LEXICON_LOG['error_save_books'], e)
+            raise
+        except Exception as e:
+            logging.error("%s %s", LEXICON_LOG['error_save_books'], e)
             print(LEXICON['error_save_books'])
+
+    def _save_in_background(self) -> None:
+        """
+        Сохраняет библиотеку в потоке фонового сохранения.
+
+        Под блокировкой фиксируется только снимок книг (без копирования словаря, см. _snapshot_books),
+        а сам файл записывается без блокировки, 
+        поэтому чтение и изменение библиотеки не ждут окончания записи. Изменения, сделанные 
+        во время записи, попадают в журнал или в следующее сохранение.
+        """
+        try:
+            with self.lock:
+                self.storage.prepare_save(self)
+                books = self._snapshot_books()
+            try:
+                self.storage.save(books)
+            finally:
+                with self.lock:
+                    if self.books is books:
+                        # Во время записи книги не менялись - словарь снова принадлежит только библиотеке
+                        self._books_shared = False
+            logging.info(LEXICON_LOG['save_books'])
         except Exception as e:
-            logging.error(f"{LEXICON_LOG['error_save_books']} {e}")
+            logging.error("%s %s", LEXICON_LOG['error_save_books'], e)
+            print(LEXICON['error_save_books'])
+
+    def _snapshot_books(self) -> MutableMapping[int, Book]:
+        """
+        Возвращает книги для записи без блокировки (книги SQLite уже в базе).
+
+        Словарь не копируется: изменение, сделанное до окончания записи, сначала копирует его
+        (см. _own_books), поэтому снимок занимает постоянное время, а копия создается, только
+        если книги меняются во время записи.
+        """
+        if isinstance(self.books, dict) or hasattr(self.books, 'copy'):
+            self._books_shared = True
+        return self.books
+
+    def _own_books(self) -> None:
+        """Перед изменением копирует словарь книг, если его записывает фоновое сохранение (под блокировкой)."""
+        if self._books_shared:
+            self.books = dict(self.books) if isinstance(self.books, dict) else self.books.copy()
+            self._books_shared = False
+
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """
+        Применяет одну запись журнала к словарю books и поисковому индексу.
+
+        Применение идемпотентно: повторное проигрывание записи, уже попавшей в файл библиотеки,
+        не меняет результат. Кроме записей журнала хранилище может передать запись 'next_id' 
+        со следующим свободным идентификатором, запись 'ids' с сохраненным состоянием выдачи id,
+        запись 'books' со всеми книгами двоичного снимка в виде кортежей (см. book.snapshot)
+        и запись 'indexed', после которой записи применяются и к индексам из файла (см. load_books).
+
+        :param record: Запись журнала (см. модуль book.journal).
+        """
+        op = record.get('op')
+        if op == 'add':
+            self._put_book(Book.from_book_in_dict(record['book']))
+        elif op == 'books':
+            for book_id, title, author, year, status in record['rows']:
+                book = Book(book_id, title, author, year)
+                book.status = status
+                self._put_book(book)
+        elif op == 'remove':
+            book = self.books.pop(record['id'], None)
+            if book is not None:
+                self._unindex_book(book)
+                self.ids.release(book.id)
+        elif op == 'next_id':
+            self.ids.advance(record['next_id'])
+        elif op == 'ids':
+            self.ids.restore(record)
+        elif op == 'indexed':
+            # Дальнейшие записи не учтены в индексах из файла
+            self._indexing = True
+        elif op == 'status':
+            if record['id'] in self.books:
+                book = self.books[record['id']]
+                if self.secondary_index is not None and self._indexing:
+                    self.secondary_index.update_status(book.id, book.status, record['status'])
+                book.status = record['status']
+                self.books[book.id] = book
+
+    def _put_book(self, book: Book) -> None:
+        """Записывает загруженную книгу в словарь books и индексы (книга с тем же id заменяется)."""
+        if book.id in self.books:
+            # Повторное проигрывание записи: убираем из индексов прежнее состояние книги
+            self._unindex_book(self.books[book.id])
+        self.books[book.id] = book
+        self._index_book(book)
+        self.ids.observe(book.id)
+
+    def _index_book(self, book: Book) -> None:
+        """Добавляет книгу в поисковый и вторичные индексы и в порядок постраничного вывода."""
+        if not self._indexing:
+            # Книга уже есть в индексах из файла
+            return
+        if self.index is not None:
+            self.index.add(book)
+        if self.secondary_index is not None:
+            self.secondary_index.add(book)
+        if self.search_cache is not None:
+            self.search_cache.invalidate_book(book)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add(book)
+        if self._id_order is not None:
+            ids = self._id_order
+            # Новые книги получают наибольший id, поэтому почти всегда id добавляется в конец
+            if not ids or book.id > ids[-1]:
+                ids.append(book.id)
+            else:
+                row = bisect_left(ids, book.id)
+                if row == len(ids) or ids[row] != book.id:
+                    ids.insert(row, book.id)
+
+    def _unindex_book(self, book: Book) -> None:
+        """Удаляет книгу из поискового и вторичных индексов и из порядка постраничного вывода."""
+        if not self._indexing:
+            return
+        if self.index is not None:
+            self.index.remove(book)
+        if self.secondary_index is not None:
+            self.secondary_index.remove(book)
+        if self.search_cache is not None:
+            self.search_cache.invalidate_book(book)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.remove(book)
+        if self._id_order is not None:
+            row = bisect_left(self._id_order, book.id)
+            if row < len(self._id_order) and self._id_order[row] == book.id:
+                del self._id_order[row]
+
+    def _persist(self, *records: Dict[str, Any]) -> None:
+        """
+        Сохраняет изменения библиотеки в хранилище.
+
+        Для файла JSON в режиме журнала записи дописываются в журнал, а при превышении порога 
+        журнал сворачивается в файл библиотеки. Без журнала файл библиотеки перезаписывается целиком.
+
+        :param records: Записи об изменениях (см. модуль book.journal).
+        """
+        try:
+            self.storage.persist(self, list(records))
+        except (OSError, sqlite3.Error) as e:
+            logging.error("%s %s", LEXICON_LOG['error_save_books'], e)
             print(LEXICON['error_save_books'])
 
+    def compact(self) -> None:
+        """
+        Сворачивает журнал изменений: перезаписывает файл библиотеки и очищает журнал.
+
+        При фоновом сохранении свертка выполняется в потоке сохранения.
+        """
+        logging.info(LEXICON_LOG['compact_journal'])
+        self.request_save()
+
+    def request_save(self) -> None:
+        """Сохраняет библиотеку сразу или, при фоновом сохранении, ставит сохранение в очередь."""
+        if self.writer is not None:
+            self.writer.schedule()
+        else:
+            self.save_books()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Выполняет изменение под блокировкой потоков и в транзакции хранилища (после загрузки книг)."""
+        self.wait_loaded()
+        with self.lock:
+            self._own_books()
+            with self.storage.transaction(self):
+                yield
+
+    def flush(self) -> None:
+        """Дожидается сохранения всех изменений, отложенных фоновым сохранением."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        """Сохраняет отложенные изменения и индексы и освобождает ресурсы хранилища."""
+        if self._loader is not None:
+            # Хранилище нельзя закрыть, пока из него читает поток загрузки
+            self._loader.join()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self._loaded.is_set():
+            # Индексы сохраняются, чтобы при следующем запуске не строить их заново
+            try:
+                with self.lock:
+                    self.storage.save_indexes(self)
+            except OSError as e:
+                logging.error("%s %s", LEXICON_LOG['error_save_indexes'], e)
+        self.storage.close()
+
+    def __enter__(self) -> 'Library':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     
     def add_book(self, title: str, author: str, year: str) -> str:
         """
@@ -158,13 +592,113 @@ class Library:
         :param year: Год издания книги.
         :return: Сообщение об успешном добавлении книги.
         """     
-        book = Book(self.next_id, title, author, int(year))
-        self.books[self.next_id] = book
-        self.next_id += 1
-        self.save_books()
+        book = self.create_book(title, author, year)
         print(f"{LEXICON_STEP['stars']}")
         return f"{LEXICON['add_book_true']} {book.title}\n {LEXICON_STEP['stars']}"
 
+    def create_book(self, title: str, author: str, year: Union[int, str], book_id: Optional[int] = None) -> Book:
+        """
+        Добавляет новую книгу в библиотеку и возвращает ее (без сообщений для меню).
+
+        :param title: Название книги.
+        :param author: Автор книги.
+        :param year: Год издания книги.
+        :param book_id: Id книги, заранее полученный через reserve_ids. По умолчанию id выдается библиотекой.
+        :raises InvalidBookIDError: Если book_id занят или не был выдан библиотекой.
+        :return: Добавленная книга.
+        """
+        # Изменение выполняется в транзакции хранилища: так id согласован с другими процессами
+        with self._transaction():
+            if book_id is None:
+                book_id = self.ids.allocate()
+            elif book_id in self.books or book_id >= self.next_id or book_id <= 0:
+                raise InvalidBookIDError(book_id)
+            else:
+                self.ids.observe(book_id)
+            book = Book(book_id, title, author, int(year))
+            self.books[book_id] = book
+            self._index_book(book)
+            self._persist({'op': 'add', 'book': book.book_dict()})
+        return book
+
+    def reserve_ids(self, count: int) -> range:
+        """
+        Выдает блок новых идущих подряд id для книг, которые будут добавлены позже (create_book).
+
+        Блок сохраняется в хранилище, поэтому его id не будут выданы ни этой библиотекой после 
+        перезапуска, ни другими процессами, работающими с той же библиотекой.
+
+        :param count: Количество id.
+        :return: Диапазон выданных id.
+        """
+        with self._transaction():
+            block = self.ids.allocate_block(count)
+            self._persist({'op': 'next_id', 'next_id': self.next_id})
+        return block
+
+    def add_books(self, rows: Iterable[Union[Dict[str, Any], Tuple[str, str, str], BookError]],
+                  batch_size: int = 10000) -> Tuple[int, List[Tuple[int, BookError]]]:
+        """
+        Добавляет в библиотеку книги из потока строк (пакетный импорт).
+
+        Каждая строка проверяется по тем же правилам, что и ввод в консоли. Ошибочные строки
+        пропускаются и попадают в отчет, не прерывая импорт. Корректные книги получают 
+        идентификаторы подряд, а библиотека сохраняется один раз на каждый пакет из batch_size книг.
+
+        :param rows: Словари с ключами 'title', 'author', 'year', кортежи (title, author, year) 
+                     или экземпляры BookError для строк, которые не удалось прочитать.
+        :param batch_size: Количество книг, после которого изменения сохраняются.
+        :return: Количество добавленных книг и список ошибок в виде (номер строки, ошибка).
+        """
+        added = 0
+        errors: List[Tuple[int, BookError]] = []
+        batch: List[Tuple[str, str, int]] = []
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                if isinstance(row, BookError):
+                    raise row
+                if isinstance(row, dict):
+                    title, author, year = row.get('title'), row.get('author'), row.get('year')
+                else:
+                    title, author, year = row
+                title = str(title).strip() if title is not None else ''
+                author = str(author).strip() if author is not None else ''
+                year = str(year).strip() if year is not None else ''
+                validate_book(title, author, year)
+            except (BookError, ValueError, TypeError) as e:
+                # Строка неверной формы (например, кортеж не из трех полей) - ошибка только этой строки
+                if not isinstance(e, BookError):
+                    e = InvalidRowError(str(e))
+                errors.append((row_number, e))
+                logging.error("%s %s: %s", LEXICON_LOG['error_import_row'], row_number, e)
+                continue
+            batch.append((title, author, int(year)))
+            if len(batch) >= batch_size:
+                added += self._add_batch(batch)
+                batch = []
+        if batch:
+            added += self._add_batch(batch)
+        logging.info("%s %s", LEXICON_LOG['import_books'], added)
+        return added, errors
+
+    def _add_batch(self, batch: List[Tuple[str, str, int]]) -> int:
+        """
+        Добавляет в библиотеку пакет проверенных книг и сохраняет изменения один раз.
+
+        Книги пакета получают идентификаторы одним блоком, подряд.
+
+        :param batch: Проверенные данные книг (название, автор, год).
+        :return: Количество добавленных книг.
+        """
+        with self._transaction():
+            books = [Book(book_id, title, author, year)
+                     for book_id, (title, author, year) in zip(self.ids.allocate_block(len(batch)), batch)]
+            for book in books:
+                self.books[book.id] = book
+                self._index_book(book)
+            self._persist(*({'op': 'add', 'book': book.book_dict()} for book in books))
+        return len(books)
+
 
     def remove_book(self, book_id: str) -> str:
         """
@@ -181,24 +715,74 @@ class Library:
             raise NotInputError
         book_id= int(book_id)  
         
-        # Проверяем наличие книги по ID. Если нет такого id, поднимает ошибку 
-        if book_id not in self.books:
-            raise InvalidBookIDError(book_id)
-        
-        # Если все условия выполнены, возвращаем информацию по удаленной книги 
-        if book_id in self.books:
+        with self._transaction():
+            # Проверяем наличие книги по ID. Если нет такого id, поднимает ошибку 
+            if book_id not in self.books:
+                raise InvalidBookIDError(book_id)
+            
+            # Если все условия выполнены, возвращаем информацию по удаленной книги 
             removed_book = self.books.pop(book_id)
-            self.save_books()
-            print(f"{LEXICON_STEP['stars']}")
-            return f"{LEXICON['delete_books_true']} {removed_book.id} c названием - {removed_book.title}"
+            self._unindex_book(removed_book)
+            self.ids.release(book_id)
+            self._persist({'op': 'remove', 'id': book_id})
+        print(f"{LEXICON_STEP['stars']}")
+        return f"{LEXICON['delete_books_true']} {removed_book.id} c названием - {removed_book.title}"
        
 
-    def search_books(self, search_date:str) -> List[Book]:
+    def remove_books(self, book_ids: Iterable[Union[int, str]]) -> str:
+        """
+        Удаляет несколько книг одной операцией.
+
+        Сначала проверяются все id: если хотя бы одна книга не найдена, ни одна книга не удаляется,
+        а все ошибки сообщаются вместе. Изменения сохраняются один раз.
+
+        :param book_ids: Идентификаторы книг (числа или строки из цифр).
+        :raises NotInputError: Если список id пустой.
+        :raises BulkOperationError: Если часть id неверна (InvalidBookIntError, InvalidBookIDError).
+        :return: Сообщение с количеством удаленных книг.
+        """
+        ids, errors = self._bulk_ids(book_ids)
+        with self._transaction():
+            errors.extend(InvalidBookIDError(book_id) for book_id in ids if book_id not in self.books)
+            if errors:
+                raise BulkOperationError(errors)
+            for book_id in ids:
+                self._unindex_book(self.books.pop(book_id))
+                self.ids.release(book_id)
+            self._persist(*({'op': 'remove', 'id': book_id} for book_id in ids))
+        print(f"{LEXICON_STEP['stars']}")
+        return f"{LEXICON['delete_books_many_true']} {len(ids)}"
+
+    def _bulk_ids(self, book_ids: Iterable[Union[int, str]]) -> Tuple[List[int], List[BookError]]:
+        """
+        Приводит идентификаторы групповой операции к числам.
+
+        :param book_ids: Идентификаторы книг (числа или строки из цифр).
+        :raises NotInputError: Если список id пустой.
+        :return: Идентификаторы без повторов (в исходном порядке) и ошибки для id, которые не являются числом.
+        """
+        ids: List[int] = []
+        errors: List[BookError] = []
+        for book_id in book_ids:
+            if isinstance(book_id, str) and not book_id.strip().isdigit():
+                errors.append(InvalidBookIntError(book_id))
+            else:
+                ids.append(int(book_id))
+        if not ids and not errors:
+            raise NotInputError
+        return list(dict.fromkeys(ids)), errors
+
+    def search_books(self, search_date:str, fuzzy: bool = False, top_k: int = 10) -> List[Book]:
         """
         Ищет книги по заданному поисковому запросу.
 
+        По умолчанию ищется точное вхождение запроса (без учета регистра). В нечетком режиме
+        допускаются опечатки, а результат упорядочен по сходству с запросом (см. book.fuzzy_search).
+
         :param search_date: Строка, содержащая поисковый запрос. 
                             Используется для поиска по названию, автору и году.
+        :param fuzzy: Если True, выполняется нечеткий поиск с учетом опечаток.
+        :param top_k: Наибольшее количество книг в результате нечеткого поиска.
         :raises NotInputError: Если ввод пустой.
         :raises NotBookError: Если не найдено ни одной книги по заданному запросу.
         :return: Список найденных книг.
@@ -209,13 +793,36 @@ class Library:
         # Проверяем наличие введенных данных на пустоту. Если поступила пустая строка - поднимает ошибку
         if not search_date:
             raise NotInputError
+
+        self.wait_loaded()
+        if fuzzy:
+            version = self.storage.data_version()
+            if self.fuzzy_index is None or version != self._fuzzy_version:
+                # Индекс строится при первом нечетком поиске и дальше обновляется вместе с библиотекой;
+                # после изменений других процессов, которые библиотека не проигрывает, он строится заново.
+                # Книги SQLite читаются из базы порциями: в памяти остаются только слова и id книг
+                self.fuzzy_index = FuzzyIndex(self.books.values())
+                self._fuzzy_version = version
+            return self._found_books(self.fuzzy_index.search(search_term, top_k))
         
-        found_books = [
-            book for book in self.books.values()
-            if (search_term in book.title.lower() or
-                search_term in book.author.lower() or
-                search_term in str(book.year))
-            ]
+        found_ids = self.search_cache.get(search_term) if self.search_cache is not None else None
+        if found_ids is None:
+            version = self.search_cache.version if self.search_cache is not None else 0
+            found_ids = self.storage.search(search_term)
+            if found_ids is None and self.index is not None:
+                # Запрос короче триграммы индекс не обрабатывает - он выполняется перебором
+                found = self.index.search(search_term, self.books)
+                found_ids = sorted(found) if found is not None else None
+            if found_ids is None:
+                found_ids = [
+                    book.id for book in self.books.values()
+                    if (search_term in book.title.lower() or
+                        search_term in book.author.lower() or
+                        search_term in str(book.year))
+                    ]
+            if self.search_cache is not None:
+                self.search_cache.put(search_term, found_ids, version)
+        found_books = [self.books[book_id] for book_id in found_ids]
         
         # Проверяем наличие книги. Если такой книги нет (не нашли) - поднимаем ошибку
         if not found_books:
@@ -224,21 +831,151 @@ class Library:
         # Если все условия выполнены, возвращаем список книг
         return found_books
 
+    def get_book(self, book_id: Union[int, str]) -> Book:
+        """
+        Возвращает книгу по идентификатору.
+
+        Пока книги не загружены (отложенная или фоновая загрузка), книга читается прямо 
+        из хранилища - из файла JSON по индексу смещений или из двоичного снимка, - поэтому 
+        ответ не ждет загрузки всего каталога.
+
+        :param book_id: Идентификатор книги (число или строка из цифр).
+        :raises InvalidBookIntError: Если id не является числом.
+        :raises InvalidBookIDError: Если книга с данным ID не найдена.
+        :return: Книга.
+        """
+        if isinstance(book_id, str) and not book_id.strip().isdigit():
+            raise InvalidBookIntError(book_id)
+        book_id = int(book_id)
+        if not self._loaded.is_set():
+            try:
+                book_data = self.storage.read_book(book_id)
+            except KeyError:
+                raise InvalidBookIDError(book_id) from None
+            except (OSError, ValueError) as e:
+                # Файл не удалось прочитать по индексу - книга берется из загруженной библиотеки
+                logging.error("%s %s", LEXICON_LOG['error_read_book'], e)
+                book_data = None
+            if book_data is not None:
+                return Book.from_book_in_dict(book_data)
+            self.wait_loaded()
+        if book_id not in self.books:
+            raise InvalidBookIDError(book_id)
+        return self.books[book_id]
+
+    def _found_books(self, found_ids: List[int]) -> List[Book]:
+        """Возвращает книги по списку id или поднимает NotBookError, если список пуст."""
+        if not found_ids:
+            raise NotBookError
+        return [self.books[book_id] for book_id in found_ids]
+
+    def find_by_author(self, author: str) -> List[Book]:
+        """
+        Ищет все книги автора по индексу (точное совпадение имени автора, а не подстрока).
+
+        :param author: Автор книги.
+        :raises NotInputError: Если ввод пустой.
+        :raises NotBookError: Если книг автора нет.
+        :return: Список книг по возрастанию id.
+        """
+        author = author.strip() if author else ''
+        if not author:
+            raise NotInputError
+        self.wait_loaded()
+        found_ids = self.storage.find_by_author(author)
+        if found_ids is None:
+            if self.secondary_index is not None:
+                found_ids = self.secondary_index.by_author(author)
+            else:
+                found_ids = [book.id for book in self.books.values() if book.author == author]
+        return self._found_books(found_ids)
+
+    def find_by_year_range(self, start: Union[int, str], end: Union[int, str]) -> List[Book]:
+        """
+        Ищет книги, изданные с start по end год включительно.
+
+        :param start: Первый год диапазона.
+        :param end: Последний год диапазона.
+        :raises NotInputError: Если один из годов не указан.
+        :raises InvalidBookIntError: Если год не является целым числом.
+        :raises NotBookError: Если книг в диапазоне нет.
+        :return: Список книг, упорядоченный по году, а внутри года - по id.
+        """
+        years = []
+        for year in (start, end):
+            year = str(year).strip() if year is not None else ''
+            if not year:
+                raise NotInputError
+            if not year.isdecimal():
+                raise InvalidBookIntError(year)
+            years.append(int(year))
+        start, end = years
+        self.wait_loaded()
+        found_ids = self.storage.find_by_year_range(start, end)
+        if found_ids is None:
+            if self.secondary_index is not None:
+                found_ids = self.secondary_index.by_year_range(start, end)
+            else:
+                found = [(book_year(book), book.id) for book in self.books.values()]
+                found_ids = [book_id for year, book_id in sorted(
+                    (year, book_id) for year, book_id in found if year is not None and start <= year <= end)]
+        return self._found_books(found_ids)
+
+    def find_by_status(self, status: str) -> List[Book]:
+        """
+        Ищет все книги с заданным статусом.
+
+        :param status: Статус книги: 'в наличии' или 'выдана'.
+        :raises NotInputError: Если ввод пустой.
+        :raises InvalidStatusError: Если статус не является допустимым.
+        :raises NotBookError: Если книг с таким статусом нет.
+        :return: Список книг по возрастанию id.
+        """
+        if not status:
+            raise NotInputError
+        if status not in ['в наличии', 'выдана']:
+            raise InvalidStatusError(status)
+        self.wait_loaded()
+        found_ids = self.storage.find_by_status(status)
+        if found_ids is None:
+            if self.secondary_index is not None:
+                found_ids = self.secondary_index.by_status(status)
+            else:
+                found_ids = [book.id for book in self.books.values() if book.status == status]
+        return self._found_books(found_ids)
+
 
-    def display_books(self) -> List[Book]:
+    def display_books(self, offset: int = 0, limit: Optional[int] = None) -> List[Book]:
         """
-        Отображает все книги в библиотеке.
+        Отображает книги в библиотеке: все или одну страницу.
 
+        Страницы упорядочены по id, поэтому страница с тем же offset показывает те же книги,
+        пока библиотека не изменилась. Время и память на страницу зависят от limit, 
+        а не от размера библиотеки.
+
+        :param offset: Количество книг, пропускаемых от начала библиотеки.
+        :param limit: Размер страницы. По умолчанию возвращаются все книги начиная с offset.
+        :raises ValueError: Если offset или limit отрицательные.
         :raises DisplayBookError: Если в библиотеке нет книг.
-        :return: Список всех книг в библиотеке.
+        :return: Список книг страницы (пустой, если offset за концом библиотеки).
         """
+        check_page(offset, limit)
+        self.wait_loaded()
         # Проверяем библиотеку на наличие книг. Если пусто - поднимаем ошибку
         if not self.books:
             raise DisplayBookError 
         # Если все условия выполнены, возвращаем список книг
-        else:
+        if limit is None and not offset:
             books_library = [book for book in self.books.values()]
             return books_library
+        end = len(self.books) if limit is None else offset + limit
+        page = getattr(self.books, 'page', None)
+        if page is not None:
+            # Колоночное хранилище и SQLite сами хранят книги в порядке id
+            return page(offset, end - offset)
+        if self._id_order is None:
+            self._id_order = array('q', sorted(self.books))
+        return [self.books[book_id] for book_id in self._id_order[offset:end]]
     
     
     def update_status(self, book_id: int, new_status: str) -> str:
@@ -258,24 +995,71 @@ class Library:
         if not book_id or not new_status:
             raise NotInputError
         book_id = int(book_id)
-        
-        # Проверяем наличие книги по ID. Если нет такого id, поднимает ошибку 
-        if book_id not in self.books:
-            raise InvalidBookIDError(book_id)
+
+        with self._transaction():
+            # Проверяем наличие книги по ID. Если нет такого id, поднимает ошибку 
+            if book_id not in self.books:
+                raise InvalidBookIDError(book_id)
             
-        # Проверка допустимости нового статуса (корректность введенных данных) - поднимает ошибку 
-        if new_status not in ['в наличии', 'выдана']:
-            raise InvalidStatusError(new_status)
+            # Проверка допустимости нового статуса (корректность введенных данных) - поднимает ошибку 
+            if new_status not in ['в наличии', 'выдана']:
+                raise InvalidStatusError(new_status)
 
-        current_book:Book = self.books[book_id]
+            current_book:Book = self.books[book_id]
         
-        # Если новый статус совпадает со старым, выбрасываем исключение
-        if current_book.status == new_status:
-            raise DuplicateStatusError(new_status)
+            # Если новый статус совпадает со старым, выбрасываем исключение
+            if current_book.status == new_status:
+                raise DuplicateStatusError(new_status)
         
-        # Если все условия выполнены, обновляем статус книги
-        else:
-            current_book.status = new_status
-            self.save_books()
-            return f"{LEXICON['update_status_true']} {current_book.book_dict()}"
+            # Если все условия выполнены, обновляем статус книги
+            else:
+                if self.secondary_index is not None:
+                    self.secondary_index.update_status(book_id, current_book.status, new_status)
+                current_book.status = new_status
+                # Записываем книгу обратно: колоночное хранилище отдает копию книги
+                self.books[book_id] = current_book
+                self._persist({'op': 'status', 'id': book_id, 'status': new_status})
+                return f"{LEXICON['update_status_true']} {current_book.book_dict()}"
+
+    def update_status_many(self, book_ids: Iterable[Union[int, str]], new_status: str) -> str:
+        """
+        Обновляет статус нескольких книг одной операцией.
+
+        Сначала проверяются все книги: если хотя бы одна не найдена или уже имеет новый статус,
+        ни одна книга не изменяется, а все ошибки сообщаются вместе. Изменения сохраняются один раз.
+
+        :param book_ids: Идентификаторы книг (числа или строки из цифр).
+        :param new_status: Новый статус книг: 'в наличии' или 'выдана'.
+        :raises NotInputError: Если список id или новый статус пустые.
+        :raises InvalidStatusError: Если новый статус не является допустимым.
+        :raises BulkOperationError: Если часть книг не прошла проверку
+                                    (InvalidBookIntError, InvalidBookIDError, DuplicateStatusError).
+        :return: Сообщение с количеством книг, у которых изменен статус.
+        """
+        if not new_status:
+            raise NotInputError
+        if new_status not in ['в наличии', 'выдана']:
+            raise InvalidStatusError(new_status)
+        ids, errors = self._bulk_ids(book_ids)
+
+        with self._transaction():
+            books: List[Book] = []
+            for book_id in ids:
+                if book_id not in self.books:
+                    errors.append(InvalidBookIDError(book_id))
+                    continue
+                book = self.books[book_id]
+                if book.status == new_status:
+                    errors.append(DuplicateStatusError(new_status, book_id))
+                books.append(book)
+            if errors:
+                raise BulkOperationError(errors)
 
+            for book in books:
+                if self.secondary_index is not None:
+                    self.secondary_index.update_status(book.id, book.status, new_status)
+                book.status = new_status
+                # Записываем книгу обратно: колоночное хранилище отдает копию книги
+                self.books[book.id] = book
+            self._persist(*({'op': 'status', 'id': book.id, 'status': new_status} for book in books))
+        return f"{LEXICON['update_status_many_true']} {len(books)}"
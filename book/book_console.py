@@ -12,10 +12,10 @@
 В рамках этой функции выполняются следующие операции:
 1. Отображение основного меню и ожидание выбора пользователя.
 2. Добавление новой книги с запросом названия, автора и года издания.
-3. Удаление книги по идентификатору, указанному пользователем.
+3. Удаление книги по идентификатору, указанному пользователем (или нескольких книг: '10-50,77').
 4. Поиск книг по заданному критерию.
-5. Вывод на экран всех книг, которые есть в библиотеки. 
-6. Изменения статуса книги. 
+5. Вывод на экран всех книг, которые есть в библиотеки (постранично). 
+6. Изменения статуса книги (или нескольких книг сразу). 
 7. Выход из программы.
 
 При возникновении ошибок они логируются, и пользователю предоставляется 
@@ -29,159 +29,199 @@
 
 import logging
 import time
-from datetime import datetime
 from book.book_class import Library
+from book.validators import validate_book, parse_book_ids
 from book.menu import print_main_menu
 from book.lexicon import LEXICON, LEXICON_LOG, LEXICON_STEP
 from book.user_exception import (NotInputError, InvalidBookIDError, NotBookError, DisplayBookError, 
-                            InvalidStatusError, DuplicateStatusError, YearBookError, InvalidBookIntError)
+                            InvalidStatusError, DuplicateStatusError, YearBookError, InvalidBookIntError,
+                            BulkOperationError)
 
 
-# Настройка логирования. Логи сохраняются в файл "book.log".
-logging.basicConfig(
-    filename = 'book.log',  
-    level = logging.INFO,  
-    format = '%(asctime)s - %(levelname)s - %(message)s', 
-)
+# Количество книг на одной странице при отображении библиотеки
+PAGE_SIZE = 20
 
 
-def book_console():
+def display_pages(library: Library, page_size: int = PAGE_SIZE) -> None:
+    """
+    Выводит книги библиотеки постранично с переходом на следующую и предыдущую страницу.
+
+    С библиотеки запрашивается только текущая страница (и одна книга сверх нее, чтобы узнать,
+    есть ли следующая страница).
+
+    :param library: Библиотека.
+    :param page_size: Количество книг на странице.
+    :raises DisplayBookError: Если в библиотеке нет книг.
+    """
+    offset = 0
+    while True:
+        page = library.display_books(offset, page_size + 1)
+        if not page and offset:
+            # Книги удалены, пока пользователь листал, - возвращаемся на предыдущую страницу
+            offset = max(offset - page_size, 0)
+            continue
+        for book in page[:page_size]:
+            print(book.book_dict())
+        logging.info("%s %s", LEXICON_LOG['display_books_page'], offset // page_size + 1)
+        has_next = len(page) > page_size
+        if not has_next and not offset:
+            # Все книги поместились на одной странице
+            return
+        print(f"{LEXICON_STEP['lower']}")
+        print(f"{LEXICON_STEP['space']}{LEXICON['display_books_page']} {offset // page_size + 1}")
+        command = input(LEXICON['display_books_navigation'])
+        if command == '1' and has_next:
+            offset += page_size
+        elif command == '2' and offset:
+            offset -= page_size
+        elif command not in ('1', '2'):
+            return
+
+
+def book_console(filename: str = 'library.json', journal: bool = False, shared: bool = False):
     logging.info(LEXICON_LOG['start'])
-    # создается экземпляр класса библиотеки. Можно указать названия файла, по умолчанию - library.json
-    library = Library() 
+    # создается экземпляр класса библиотеки. Можно указать названия файла, по умолчанию - library.json.
+    # Книги загружаются в фоновом потоке, пока пользователь выбирает пункт меню
+    library = Library(filename, journal=journal, shared=shared, background_load=True)
     
-    # запуск цикла основного меню
-    while True:
-        logging.info(LEXICON_LOG['main_menu'])
-        # загрузка полей меню
-        print_main_menu()
+    # запуск цикла основного меню; библиотека закрывается при любом выходе из него
+    # (пункт 6, конец ввода, Ctrl+C), чтобы отложенные изменения были сохранены
+    try:
+        while True:
+            logging.info(LEXICON_LOG['main_menu'])
+            # загрузка полей меню
+            print_main_menu()
         
-        try:
-            choice = (input(LEXICON['choice_menu']))
-            # Проверяем наличие введенных данных на пустоту. Если поступила пустая строка - поднимает ошибку
-            if not choice: 
-                raise NotInputError
-            # Проверяем, чтобы пользователь ввел число, а не строку
-            if not choice.isdigit():
-                raise ValueError(f'Меню может быть только из челых чисел')
-            choice = int(choice)
-
-            match choice:
+            try:
+                choice = (input(LEXICON['choice_menu']))
+                # Проверяем наличие введенных данных на пустоту. Если поступила пустая строка - поднимает ошибку
+                if not choice: 
+                    raise NotInputError
+                # Проверяем, чтобы пользователь ввел число, а не строку
+                if not choice.isdigit():
+                    raise ValueError(f'Меню может быть только из челых чисел')
+                choice = int(choice)
+
+                match choice:
                 
-                case 1: # Добавление книги в библиотеку
-                    logging.info(LEXICON_LOG['add_book'])
-                    # Запрашиваем у пользователя название, автора и год книги
-                    title = input(LEXICON['add_book_title'])
-                    author = input(LEXICON['add_book_author'])
-                    year = input(LEXICON['add_book_year'])
-                    try:
-                        # Проверяем наличие введенных данных на пустоту. Если поступила пустая строка - поднимает ошибку
-                        if not title or not author or not year:
-                            raise NotInputError
-                        # Проверяем правильность года. Если год меньше(равен) 0 или больше текущего кода - поднимает ошибку
-                        if int(year) <= 0 or int(year) > datetime.now().year:
-                            raise YearBookError(datetime.now().year)
-                        # Проверяем чтобы год был числом, а не строкой. При не правильных данных - поднимает ошибку
-                        if not year.isdigit():
-                            raise InvalidBookIntError(year)
-                        print(library.add_book(title, author, year))
-                        logging.info(LEXICON_LOG['add_book_true'])
+                    case 1: # Добавление книги в библиотеку
+                        logging.info(LEXICON_LOG['add_book'])
+                        # Запрашиваем у пользователя название, автора и год книги
+                        title = input(LEXICON['add_book_title'])
+                        author = input(LEXICON['add_book_author'])
+                        year = input(LEXICON['add_book_year'])
+                        try:
+                            # Проверяем поля книги (пустые поля, год числом и в допустимом диапазоне)
+                            validate_book(title, author, year)
+                            print(library.add_book(title, author, year))
+                            logging.info(LEXICON_LOG['add_book_true'])
                     
-                    except (NotInputError, YearBookError, InvalidBookIntError) as e:
-                        # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(f"{LEXICON_LOG['error_add_book']} {e}")
-                        print(f"{LEXICON_STEP['exclamation_mark']}")
-                        print(e)
+                        except (NotInputError, YearBookError, InvalidBookIntError) as e:
+                            # Выводим информацию в логи и пользователю в зависимости от ошибок
+                            logging.error("%s %s", LEXICON_LOG['error_add_book'], e)
+                            print(f"{LEXICON_STEP['exclamation_mark']}")
+                            print(e)
                             
 
-                case 2:  # Удаление книги из библиотеки
-                    logging.info(LEXICON_LOG['delete_books'])
+                    case 2:  # Удаление книги из библиотеки
+                        logging.info(LEXICON_LOG['delete_books'])
                     
-                    try:
-                        # Запрашиваем у пользователя id книги для удаления
-                        book_id = input(LEXICON['delete_books_id'])
-                        # Проверяем чтобы id был числом, а не строкой. При не правильных данных - поднимает ошибку
-                        if not book_id.isdigit():
-                            raise InvalidBookIntError(book_id)
-                        print(library.remove_book(book_id))
-                        logging.info(LEXICON_LOG['delete_books_true'])
-                    except (NotInputError, InvalidBookIDError, InvalidBookIntError) as e:
-                        # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(f"{LEXICON_LOG['error_delete_books']} {e}")
-                        print(f"{LEXICON_STEP['exclamation_mark']}")
-                        print(e)
+                        try:
+                            # Запрашиваем у пользователя id книги для удаления (можно несколько и диапазоны)
+                            # Проверяем чтобы id были числами, а не строкой. При не правильных данных - поднимает ошибку
+                            book_ids = parse_book_ids(input(LEXICON['delete_books_id']))
+                            if len(book_ids) == 1:
+                                print(library.remove_book(str(book_ids[0])))
+                            else:
+                                # Несколько книг удаляются одной операцией с одним сохранением
+                                print(library.remove_books(book_ids))
+                            logging.info(LEXICON_LOG['delete_books_true'])
+                        except (NotInputError, InvalidBookIDError, InvalidBookIntError, BulkOperationError) as e:
+                            # Выводим информацию в логи и пользователю в зависимости от ошибок
+                            logging.error("%s %s", LEXICON_LOG['error_delete_books'], e)
+                            print(f"{LEXICON_STEP['exclamation_mark']}")
+                            print(e)
                     
 
-                case 3: # Поиск книги в библиотеки
-                    logging.info(LEXICON_LOG['search_books'])
-                    try:
-                        # Запрашиваем у пользователя название, автора или год книги для поиска
-                        search_date = input(LEXICON['search_books_date'])
-                        found_books = library.search_books(search_date)
-                        # Выводим книги, которые найдены
-                        for book in found_books:
-                            print(LEXICON_STEP['lower'])
-                            print(book.book_dict())
-                        logging.info(LEXICON_LOG['search_books_true'])
-                    except (NotBookError, NotInputError) as e:
-                        # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(f"{LEXICON_LOG['error_search_books']} {e}")
-                        print(f"{LEXICON_STEP['exclamation_mark']}")
-                        print(e)
-
-
-                case 4: # Отображение всех книг в библиотеки
-                    logging.info(LEXICON_LOG['display_books'])
-                    try:
-                        library_shows = library.display_books()
-                        print(f"{LEXICON_STEP['lower']}")
-                        print(f"{LEXICON_STEP['space']}{LEXICON['display_books_true']}")
-                        print(f"{LEXICON_STEP['lower']}")
-                        # Выводим книги, которые есть в библиотеки
-                        for book in library_shows:
-                            print(book.book_dict())
-                        logging.info(LEXICON_LOG['display_books_true'])
-                    except DisplayBookError as e:
-                        # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(e)
-                        print(f"{LEXICON_STEP['exclamation_mark']}")
-                        print(e)
+                    case 3: # Поиск книги в библиотеки
+                        logging.info(LEXICON_LOG['search_books'])
+                        try:
+                            # Запрашиваем у пользователя название, автора или год книги для поиска
+                            search_date = input(LEXICON['search_books_date'])
+                            try:
+                                found_books = library.search_books(search_date)
+                            except NotBookError:
+                                # Точных совпадений нет - предлагаем книги, похожие на запрос (с учетом опечаток)
+                                found_books = library.search_books(search_date, fuzzy=True)
+                                logging.info(LEXICON_LOG['search_books_fuzzy'])
+                                print(LEXICON['search_books_fuzzy'])
+                            # Выводим книги, которые найдены
+                            for book in found_books:
+                                print(LEXICON_STEP['lower'])
+                                print(book.book_dict())
+                            logging.info(LEXICON_LOG['search_books_true'])
+                        except (NotBookError, NotInputError) as e:
+                            # Выводим информацию в логи и пользователю в зависимости от ошибок
+                            logging.error("%s %s", LEXICON_LOG['error_search_books'], e)
+                            print(f"{LEXICON_STEP['exclamation_mark']}")
+                            print(e)
+
+
+                    case 4: # Отображение всех книг в библиотеки
+                        logging.info(LEXICON_LOG['display_books'])
+                        try:
+                            print(f"{LEXICON_STEP['lower']}")
+                            print(f"{LEXICON_STEP['space']}{LEXICON['display_books_true']}")
+                            print(f"{LEXICON_STEP['lower']}")
+                            # Выводим книги постранично, чтобы не загружать и не печатать весь каталог сразу
+                            display_pages(library)
+                            logging.info(LEXICON_LOG['display_books_true'])
+                        except DisplayBookError as e:
+                            # Выводим информацию в логи и пользователю в зависимости от ошибок
+                            logging.error(e)
+                            print(f"{LEXICON_STEP['exclamation_mark']}")
+                            print(e)
 
                 
-                case 5: # Изменение статуса книги
-                    logging.info(LEXICON_LOG['update_status'])
-                    try:
-                        # Запрашиваем у пользователя id книги
-                        book_id = input(LEXICON['update_status_id'])
-                        # Проверяем чтобы id был числом, а не строкой. При не правильных данных - поднимает ошибку
-                        if not book_id.isdigit():
-                            raise InvalidBookIntError(book_id)
-                        # Запрашиваем у пользователя статус книги
-                        new_status = input(LEXICON['update_status_input'])
-                        print(library.update_status(book_id, new_status))
-                        logging.info(LEXICON_LOG['update_status_true'])
-                    except (InvalidBookIDError, InvalidStatusError, DuplicateStatusError, 
-                            NotInputError, InvalidBookIntError) as e:
-                        # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(f"{LEXICON_LOG['error_update_status']} {e}")
-                        print(f"{LEXICON_STEP['exclamation_mark']}")
-                        print(e)
-
-                case 6: # Завершение работы приложения
-                    logging.info(LEXICON_LOG['exit_menu'])
-                    print(f"{LEXICON['exit']} \n")
-                    time.sleep(3)
-                    print(f"{LEXICON_STEP['space']}{LEXICON_STEP['space']}{LEXICON['exit_end'].upper()}")
-                    break
+                    case 5: # Изменение статуса книги
+                        logging.info(LEXICON_LOG['update_status'])
+                        try:
+                            # Запрашиваем у пользователя id книги (можно несколько и диапазоны)
+                            # Проверяем чтобы id были числами, а не строкой. При не правильных данных - поднимает ошибку
+                            book_ids = parse_book_ids(input(LEXICON['update_status_id']))
+                            # Запрашиваем у пользователя статус книги
+                            new_status = input(LEXICON['update_status_input'])
+                            if len(book_ids) == 1:
+                                print(library.update_status(str(book_ids[0]), new_status))
+                            else:
+                                # Статус нескольких книг меняется одной операцией с одним сохранением
+                                print(library.update_status_many(book_ids, new_status))
+                            logging.info(LEXICON_LOG['update_status_true'])
+                        except (InvalidBookIDError, InvalidStatusError, DuplicateStatusError, 
+                                NotInputError, InvalidBookIntError, BulkOperationError) as e:
+                            # Выводим информацию в логи и пользователю в зависимости от ошибок
+                            logging.error("%s %s", LEXICON_LOG['error_update_status'], e)
+                            print(f"{LEXICON_STEP['exclamation_mark']}")
+                            print(e)
+
+                    case 6: # Завершение работы приложения (библиотека закрывается после выхода из цикла)
+                        logging.info(LEXICON_LOG['exit_menu'])
+                        break
                 
-                case _: # обработка ошибок, если пользователь выбрал цифры, которые отсутствуют в меню
-                    raise ValueError("Неверный выбор (в меню нет такого варианта)")
-
-
-        except (ValueError, NotInputError) as e:
-            # Выводим информацию в логи и пользователю в зависимости от ошибок
-            logging.error(f"{LEXICON_LOG['exit_error']} {e}")
-            print(f"{LEXICON_STEP['exclamation_mark']}")
-            print(e)
+                    case _: # обработка ошибок, если пользователь выбрал цифры, которые отсутствуют в меню
+                        raise ValueError("Неверный выбор (в меню нет такого варианта)")
+
+
+            except (ValueError, NotInputError) as e:
+                # Выводим информацию в логи и пользователю в зависимости от ошибок
+                logging.error("%s %s", LEXICON_LOG['exit_error'], e)
+                print(f"{LEXICON_STEP['exclamation_mark']}")
+                print(e)
+    finally:
+        # Дожидаемся сохранения отложенных изменений и закрываем хранилище
+        library.close()
+    print(f"{LEXICON['exit']} \n")
+    time.sleep(3)
+    print(f"{LEXICON_STEP['space']}{LEXICON_STEP['space']}{LEXICON['exit_end'].upper()}")
 
 
@@ -0,0 +1,161 @@
+"""
+Модуль колоночного хранилища книг.
+
+Класс ColumnarBooks хранит книги библиотеки не как отдельные объекты Book, а в параллельных
+массивах (колонках):
+- идентификаторы, годы и коды статусов - в компактных массивах array;
+- названия - в списке строк;
+- авторы - в виде номеров в таблице уникальных (интернированных) строк авторов.
+Год, который не является целым числом (например, строка '2020' или 'неизв.' из файла библиотеки),
+хранится как есть в отдельном словаре по id книги, поэтому книга возвращается без изменений.
+
+Снаружи хранилище ведет себя как словарь {id: Book}: объект Book создается при обращении
+к книге, а запись книги по ключу (books[book.id] = book) сохраняет ее поля в колонки.
+Поэтому после изменения полученной книги ее нужно записать обратно в хранилище.
+
+Пример использования:
+books = ColumnarBooks()
+books[1] = Book(1, 'Война и мир', 'Лев Толстой', 1869)
+book = books[1]
+book.status = 'выдана'
+books[1] = book
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Any, Dict, List, Iterator
+from book.book_class import Book
+
+
+# Допустимые статусы книг и их коды в колонке статусов
+STATUSES: List[str] = ['в наличии', 'выдана']
+
+
+class ColumnarBooks(MutableMapping):
+    def __init__(self) -> None:
+        """Инициализация пустого колоночного хранилища книг."""
+        self.ids = array('q')
+        self.years = array('l')
+        # Годы, которые нельзя хранить в колонке years (не целые числа), по id книги
+        self.other_years: Dict[int, Any] = {}
+        self.statuses = array('b')
+        self.titles: List[str] = []
+        self.author_codes = array('l')
+        self.authors: List[str] = []
+        self._author_index: Dict[str, int] = {}
+        self.status_names: List[str] = list(STATUSES)
+        self._status_index: Dict[str, int] = {status: code for code, status in enumerate(STATUSES)}
+
+    def copy(self) -> 'ColumnarBooks':
+        """Возвращает независимую копию хранилища (копируются только колонки, без создания Book)."""
+        books = ColumnarBooks()
+        books.ids = array('q', self.ids)
+        books.years = array('l', self.years)
+        books.other_years = dict(self.other_years)
+        books.statuses = array('b', self.statuses)
+        books.titles = list(self.titles)
+        books.author_codes = array('l', self.author_codes)
+        books.authors = list(self.authors)
+        books._author_index = dict(self._author_index)
+        books.status_names = list(self.status_names)
+        books._status_index = dict(self._status_index)
+        return books
+
+    def _row(self, book_id: int) -> int:
+        """
+        Возвращает номер строки книги в колонках.
+
+        :param book_id: Идентификатор книги.
+        :raises KeyError: Если книги с таким идентификатором нет.
+        """
+        row = bisect_left(self.ids, book_id)
+        if row == len(self.ids) or self.ids[row] != book_id:
+            raise KeyError(book_id)
+        return row
+
+    def _author_code(self, author: str) -> int:
+        """Возвращает номер автора в таблице авторов, добавляя нового автора при необходимости."""
+        code = self._author_index.get(author)
+        if code is None:
+            code = len(self.authors)
+            self.authors.append(author)
+            self._author_index[author] = code
+        return code
+
+    def _status_code(self, status: str) -> int:
+        """Возвращает код статуса, добавляя новый статус при необходимости."""
+        code = self._status_index.get(status)
+        if code is None:
+            code = len(self.status_names)
+            self.status_names.append(status)
+            self._status_index[status] = code
+        return code
+
+    def _book(self, row: int) -> Book:
+        """Создает объект Book по строке колонок."""
+        book_id = self.ids[row]
+        year = self.other_years.get(book_id, self.years[row]) if self.other_years else self.years[row]
+        book = Book(book_id, self.titles[row], self.authors[self.author_codes[row]], year)
+        book.status = self.status_names[self.statuses[row]]
+        return book
+
+    def __getitem__(self, book_id: int) -> Book:
+        return self._book(self._row(book_id))
+
+    def _year(self, book_id: int, year: Any) -> int:
+        """Возвращает значение для колонки years; год другого типа запоминается в other_years."""
+        if type(year) is int and -2 ** 31 <= year < 2 ** 31:
+            self.other_years.pop(book_id, None)
+            return year
+        self.other_years[book_id] = year
+        return 0
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        year = self._year(book_id, book.year)
+        author_code = self._author_code(book.author)
+        status_code = self._status_code(book.status)
+        row = bisect_left(self.ids, book_id)
+        if row < len(self.ids) and self.ids[row] == book_id:
+            # Книга уже есть - обновляем ее поля
+            self.titles[row] = book.title
+            self.years[row] = year
+            self.author_codes[row] = author_code
+            self.statuses[row] = status_code
+            return
+        # Новые книги обычно получают наибольший id, поэтому вставка почти всегда идет в конец
+        self.ids.insert(row, book_id)
+        self.titles.insert(row, book.title)
+        self.years.insert(row, year)
+        self.author_codes.insert(row, author_code)
+        self.statuses.insert(row, status_code)
+
+    def __delitem__(self, book_id: int) -> None:
+        row = self._row(book_id)
+        self.other_years.pop(book_id, None)
+        del self.ids[row]
+        del self.titles[row]
+        del self.years[row]
+        del self.author_codes[row]
+        del self.statuses[row]
+
+    def __contains__(self, book_id: object) -> bool:
+        try:
+            self._row(book_id)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def values(self) -> Iterator[Book]:
+        """Возвращает книги в порядке возрастания id."""
+        return (self._book(row) for row in range(len(self.ids)))
+
+    def page(self, offset: int, limit: int) -> List[Book]:
+        """Возвращает limit книг в порядке возрастания id, пропустив первые offset книг."""
+        return [self._book(row) for row in range(offset, min(offset + limit, len(self.ids)))]
@@ -0,0 +1,256 @@
+"""
+Модуль нечеткого поиска книг с учетом опечаток.
+
+Класс FuzzyIndex разбивает название, автора и год книги на слова и хранит:
+- словарь слов: слово -> множество идентификаторов книг;
+- триграммный индекс словаря: триграмма слова -> множество слов.
+
+Для каждого слова запроса по триграммам выбираются похожие слова словаря, для них считается
+расстояние Левенштейна с ограничением (0 опечаток для слов до 3 букв, 1 - до 7 букв, 2 - длиннее).
+Книга получает за каждое слово запроса балл 1 - (опечатки / длина слова) лучшего совпадения,
+книги упорядочиваются по сумме баллов, а при равенстве - по id.
+
+Словарь слов намного меньше библиотеки, поэтому подбор похожих слов не зависит от числа книг.
+Перед поиском текст приводится к нижнему регистру, а 'ё' заменяется на 'е'.
+
+Пример использования:
+index = FuzzyIndex(library.books.values())
+ids = index.search('грибоедв', top_k=10)
+"""
+
+import heapq
+import itertools
+import re
+from typing import Dict, Set, Iterable, List, Tuple
+
+
+# Длина n-граммы для подбора похожих слов
+GRAM_SIZE = 3
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Наибольшее количество слов запроса, по которым ранжируются книги: число сочетаний уровней
+# растет экспоненциально с числом слов, поэтому из длинного запроса берутся самые редкие слова
+MAX_QUERY_WORDS = 5
+
+
+def normalize_fuzzy(text: str) -> str:
+    """
+    Приводит текст к виду, в котором выполняется нечеткий поиск.
+
+    :param text: Исходная строка.
+    :return: Строка в нижнем регистре с 'е' вместо 'ё'.
+    """
+    return str(text).lower().replace('ё', 'е')
+
+
+def words(text: str) -> List[str]:
+    """Возвращает нормализованные слова строки."""
+    return WORD_PATTERN.findall(normalize_fuzzy(text))
+
+
+def book_words(book) -> Set[str]:
+    """Возвращает множество слов названия, автора и года книги."""
+    return set(words(book.title)) | set(words(book.author)) | set(words(book.year))
+
+
+def word_grams(word: str) -> Set[str]:
+    """Возвращает триграммы слова, дополненного пробелами по краям."""
+    padded = f' {word} '
+    return {padded[start:start + GRAM_SIZE] for start in range(len(padded) - GRAM_SIZE + 1)}
+
+
+def max_typos(word: str) -> int:
+    """Возвращает допустимое количество опечаток для слова запроса."""
+    # Год с опечаткой - это другой год, поэтому числа ищутся точно
+    if len(word) <= 3 or word.isdigit():
+        return 0
+    if len(word) <= 7:
+        return 1
+    return 2
+
+
+def bounded_distance(first: str, second: str, limit: int) -> int:
+    """
+    Вычисляет расстояние Левенштейна, прекращая счет, когда оно превышает limit.
+
+    :param first: Первая строка.
+    :param second: Вторая строка.
+    :param limit: Наибольшее интересующее расстояние.
+    :return: Расстояние или limit + 1, если оно больше limit.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current = [row]
+        for column, second_char in enumerate(second, start=1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1,
+                               previous[column - 1] + (first_char != second_char)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class FuzzyIndex:
+    def __init__(self, books: Iterable = ()) -> None:
+        """
+        Инициализация экземпляра класса FuzzyIndex.
+
+        :param books: Книги, которые нужно сразу добавить в индекс.
+        """
+        self.postings: Dict[str, Set[int]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        for book in books:
+            self.add(book)
+
+    def add(self, book) -> None:
+        """
+        Добавляет книгу в индекс.
+
+        :param book: Экземпляр Book.
+        """
+        for word in book_words(book):
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = set()
+                for gram in word_grams(word):
+                    self.grams.setdefault(gram, set()).add(word)
+            ids.add(book.id)
+
+    def remove(self, book) -> None:
+        """
+        Удаляет книгу из индекса.
+
+        :param book: Экземпляр Book с теми значениями полей, с которыми он был добавлен.
+        """
+        for word in book_words(book):
+            ids = self.postings.get(word)
+            if ids is None:
+                continue
+            ids.discard(book.id)
+            if ids:
+                continue
+            del self.postings[word]
+            for gram in word_grams(word):
+                similar = self.grams.get(gram)
+                if similar is not None:
+                    similar.discard(word)
+                    if not similar:
+                        del self.grams[gram]
+
+    def similar_words(self, word: str) -> List[Tuple[str, float]]:
+        """
+        Подбирает слова словаря, отличающиеся от слова запроса не больше чем на max_typos опечаток.
+
+        :param word: Нормализованное слово запроса.
+        :return: Список (слово словаря, балл сходства от 0 до 1).
+        """
+        limit = max_typos(word)
+        if limit == 0:
+            return [(word, 1.0)] if word in self.postings else []
+        grams = word_grams(word)
+        # Каждая опечатка затрагивает не больше GRAM_SIZE триграмм слова
+        required = max(1, len(grams) - GRAM_SIZE * limit)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        found = []
+        for candidate, count in shared.items():
+            if count < required:
+                continue
+            distance = bounded_distance(word, candidate, limit)
+            if distance <= limit:
+                found.append((candidate, 1 - distance / max(len(word), len(candidate))))
+        return found
+
+    def _levels(self, word: str) -> List[Tuple[float, Set[int]]]:
+        """
+        Разбивает книги, совпавшие со словом запроса, на уровни по баллу сходства.
+
+        Книга попадает только на уровень своего лучшего совпадения.
+
+        :param word: Нормализованное слово запроса.
+        :return: Список (балл, множество id книг) по убыванию балла. Множества не изменяются.
+        """
+        by_score: Dict[float, List[Set[int]]] = {}
+        for candidate, similarity in self.similar_words(word):
+            by_score.setdefault(similarity, []).append(self.postings[candidate])
+        levels: List[Tuple[float, Set[int]]] = []
+        seen: Set[int] = set()
+        scores = sorted(by_score, reverse=True)
+        for position, similarity in enumerate(scores):
+            postings = by_score[similarity]
+            # Единственное множество уровня без книг выше используется без копирования
+            ids = postings[0] if len(postings) == 1 and not seen else set().union(*postings) - seen
+            if ids:
+                levels.append((similarity, ids))
+                if position < len(scores) - 1:
+                    seen |= ids
+        return levels
+
+    def search(self, search_term: str, top_k: int = 10) -> List[int]:
+        """
+        Ищет книги, похожие на поисковый запрос, с учетом опечаток.
+
+        Книги не оцениваются по одной: сочетания уровней сходства слов запроса перебираются
+        от наибольшей суммы баллов к меньшей (книги сочетания - пересечение множеств),
+        пока не найдено top_k книг. Поэтому время поиска почти не зависит от количества
+        книг, в которых встречаются слова запроса. Число сочетаний растет экспоненциально
+        с числом слов, поэтому учитываются только MAX_QUERY_WORDS самых редких слов запроса.
+
+        :param search_term: Поисковый запрос.
+        :param top_k: Наибольшее количество книг в результате.
+        :return: Идентификаторы книг от наиболее к наименее похожей.
+        """
+        query = [levels for levels in (self._levels(word) for word in dict.fromkeys(words(search_term)))
+                 if levels]
+        if not query or top_k <= 0:
+            return []
+        if len(query) > MAX_QUERY_WORDS:
+            # Редкие слова точнее отделяют нужные книги, частые (предлоги, популярные фамилии) отбрасываются
+            rare = sorted(range(len(query)), key=lambda position: sum(len(ids) for _, ids in query[position]))
+            query = [query[position] for position in sorted(rare[:MAX_QUERY_WORDS])]
+        # Сочетание - номер уровня для каждого слова запроса; номер len(levels) - слово в книге не найдено
+        matched: Dict[int, Set[int]] = {}
+
+        def score(combination: Tuple[int, ...]) -> float:
+            return sum(levels[level][0] for levels, level in zip(query, combination) if level < len(levels))
+
+        def combination_ids(combination: Tuple[int, ...]) -> Set[int]:
+            present = sorted((query[position][level][1] for position, level in enumerate(combination)
+                              if level < len(query[position])), key=len)
+            ids = present[0].intersection(*present[1:])
+            for position, level in enumerate(combination):
+                if ids and level == len(query[position]):
+                    if position not in matched:
+                        matched[position] = set().union(*(level_ids for _, level_ids in query[position]))
+                    ids -= matched[position]
+            return ids
+
+        start = (0,) * len(query)
+        heap = [(-score(start), start)]
+        visited = {start}
+        found: List[int] = []
+        while heap and len(found) < top_k:
+            # Сочетания с одинаковым баллом дают книги одного ранга - они упорядочиваются по id
+            group_score = heap[0][0]
+            group: List[Set[int]] = []
+            while heap and heap[0][0] == group_score:
+                _, combination = heapq.heappop(heap)
+                if group_score < 0:
+                    group.append(combination_ids(combination))
+                for position in range(len(query)):
+                    if combination[position] < len(query[position]):
+                        following = (combination[:position] + (combination[position] + 1,)
+                                     + combination[position + 1:])
+                        if following not in visited:
+                            visited.add(following)
+                            heapq.heappush(heap, (-score(following), following))
+            found.extend(heapq.nsmallest(top_k - len(found), itertools.chain.from_iterable(group)))
+        return found
+
+    def __len__(self) -> int:
+        return len(self.postings)
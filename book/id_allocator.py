@@ -0,0 +1,109 @@
+"""
+Модуль выдачи идентификаторов книг.
+
+Класс IdAllocator хранит:
+- next_id - отметку наибольшего выданного id (следующий id, который еще никогда не выдавался);
+- список свободных id - id удаленных книг, которые можно выдать повторно.
+
+Повторная выдача id включается параметром reuse. Без него id удаленных книг не выдаются
+повторно, а свободные id, сохраненные ранее, только хранятся. Отметка next_id никогда
+не уменьшается: id удаленной книги с наибольшим номером не выдается снова и после перезапуска.
+
+Состояние (state) хранится вместе с метаданными библиотеки (см. book.storage и book.sqlite_storage),
+поэтому при запуске next_id не нужно вычислять по всем книгам. Для нескольких процессов или потоков,
+которые добавляют книги одновременно, allocate_block выдает сразу блок идущих подряд id.
+
+Пример использования:
+ids = IdAllocator(reuse=True)
+book_id = ids.allocate()
+ids.release(book_id)
+block = ids.allocate_block(1000)
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Set
+
+
+class IdAllocator:
+    def __init__(self, next_id: int = 1, free_ids: Iterable[int] = (), reuse: bool = False) -> None:
+        """
+        Инициализация выдачи идентификаторов.
+
+        :param next_id: Следующий еще не выданный id.
+        :param free_ids: Id удаленных книг, которые можно выдать повторно.
+        :param reuse: Если True, сначала выдаются свободные id (наименьший первым).
+        """
+        self.next_id: int = next_id
+        self.reuse: bool = reuse
+        # Куча свободных id; id, удаленные из множества, пропускаются при извлечении из кучи
+        self._heap: List[int] = []
+        self._free: Set[int] = set()
+        for book_id in free_ids:
+            self.release(book_id, force=True)
+
+    def allocate(self) -> int:
+        """Выдает один id: свободный (если разрешена повторная выдача) или следующий новый."""
+        while self.reuse and self._heap:
+            book_id = heapq.heappop(self._heap)
+            if book_id in self._free:
+                self._free.remove(book_id)
+                return book_id
+        book_id = self.next_id
+        self.next_id += 1
+        return book_id
+
+    def allocate_block(self, count: int) -> range:
+        """
+        Выдает блок из count новых идущих подряд id.
+
+        :param count: Размер блока.
+        :return: Диапазон выданных id.
+        """
+        start = self.next_id
+        self.next_id += count
+        return range(start, self.next_id)
+
+    def release(self, book_id: int, force: bool = False) -> None:
+        """
+        Возвращает id удаленной книги в список свободных.
+
+        :param book_id: Id удаленной книги.
+        :param force: Сохранить id в списке свободных, даже если повторная выдача выключена.
+        """
+        if (self.reuse or force) and book_id < self.next_id and book_id not in self._free:
+            self._free.add(book_id)
+            heapq.heappush(self._heap, book_id)
+
+    def observe(self, book_id: int) -> None:
+        """Отмечает id как занятый (книга загружена из хранилища или добавлена другим процессом)."""
+        if book_id >= self.next_id:
+            self.next_id = book_id + 1
+        self._free.discard(book_id)
+
+    def advance(self, next_id: int) -> None:
+        """Поднимает отметку next_id (id до нее выданы в другом месте)."""
+        if next_id > self.next_id:
+            self.next_id = next_id
+
+    def state(self) -> Dict[str, Any]:
+        """Возвращает состояние для сохранения в метаданных библиотеки."""
+        return {'next_id': self.next_id, 'free_ids': sorted(self._free)}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Восстанавливает состояние, сохраненное методом state.
+
+        Отметка next_id не уменьшается, а список свободных id заменяется сохраненным.
+
+        :param state: Словарь с ключами 'next_id' и (необязательно) 'free_ids'.
+        """
+        self.advance(state.get('next_id', 1))
+        self._heap = []
+        self._free = set()
+        for book_id in state.get('free_ids', ()):
+            self.release(book_id, force=True)
+
+    @property
+    def free_ids(self) -> List[int]:
+        """Свободные id по возрастанию."""
+        return sorted(self._free)
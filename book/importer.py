@@ -0,0 +1,90 @@
+"""
+Модуль пакетного импорта книг из файлов CSV и JSON Lines.
+
+Файл читается потоково, строка за строкой, и передается в Library.add_books, 
+поэтому в памяти не держится весь файл целиком.
+
+Форматы файлов:
+- CSV с заголовком: title,author,year
+- JSON Lines: по одному объекту {"title": ..., "author": ..., "year": ...} в строке
+
+Пример использования:
+library = Library()
+print(import_books(library, 'books.csv'))
+"""
+
+import csv
+import json
+import logging
+from typing import Any, BinaryIO, Dict, Iterator, List, Union
+from book.lexicon import LEXICON, LEXICON_LOG
+from book.user_exception import InvalidRowError
+
+
+def _decode_lines(f: BinaryIO, errors: List[InvalidRowError]) -> Iterator[str]:
+    """
+    Декодирует строки файла по одной.
+
+    Строка, которая не является UTF-8, заменяется пустой строкой, а ее ошибка добавляется в errors.
+    """
+    for line in f:
+        try:
+            yield line.decode('utf-8')
+        except UnicodeDecodeError as e:
+            errors.append(InvalidRowError(str(e)))
+            yield '\n'
+
+
+def read_rows(filename: str) -> Iterator[Union[Dict[str, Any], InvalidRowError]]:
+    """
+    Потоково читает строки файла импорта.
+
+    :param filename: Путь к файлу .csv или .jsonl.
+    :return: Итератор по словарям с данными книг. Вместо строки, которую не удалось 
+             декодировать или разобрать, возвращается экземпляр InvalidRowError.
+    """
+    decode_errors: List[InvalidRowError] = []
+    with open(filename, 'rb') as f:
+        lines = _decode_lines(f, decode_errors)
+        if filename.lower().endswith('.csv'):
+            reader = csv.DictReader(lines)
+            while True:
+                try:
+                    row: Union[Dict[str, Any], InvalidRowError] = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    row = InvalidRowError(str(e))
+                yield from decode_errors
+                decode_errors.clear()
+                yield row
+            yield from decode_errors
+            return
+
+        for line in lines:
+            yield from decode_errors
+            decode_errors.clear()
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidRowError(str(e))
+                continue
+            yield row if isinstance(row, dict) else InvalidRowError(line.strip())
+
+
+def import_books(library, filename: str, batch_size: int = 10000) -> str:
+    """
+    Импортирует книги из файла в библиотеку.
+
+    :param library: Экземпляр Library.
+    :param filename: Путь к файлу .csv или .jsonl.
+    :param batch_size: Количество книг, после которого изменения сохраняются.
+    :return: Текстовый отчет об импорте с перечнем строк, содержащих ошибки.
+    """
+    logging.info("%s %s", LEXICON_LOG['import_file'], filename)
+    added, errors = library.add_books(read_rows(filename), batch_size=batch_size)
+    report = [f"{LEXICON['import_true']}{added}", f"{LEXICON['import_errors']}{len(errors)}"]
+    report.extend(f"{LEXICON['import_row']} {row_number}: {error}" for row_number, error in errors)
+    return '\n'.join(report)
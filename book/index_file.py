@@ -0,0 +1,177 @@
+"""
+Модуль файла индексов библиотеки.
+
+Построение поискового индекса (book.search_index) - самая долгая часть загрузки библиотеки:
+каждая книга разбивается на триграммы. Поэтому поисковый и вторичные индексы (book.secondary_index)
+сохраняются рядом с файлом библиотеки в '<библиотека>.indexes' и при следующем запуске
+загружаются из файла, а не строятся заново.
+
+Файл индексов состоит из трех частей:
+- заголовок (HEADER): сигнатура b'BOOKINDX', версия формата, CRC32 всего, что следует за заголовком,
+  и размер описания;
+- описание в JSON: отметка версии библиотеки (stamp), к которой относятся индексы, и ключи индексов
+  с количеством id книг: {"stamp": ..., "search": [[триграмма, количество], ...], "authors": [...],
+  "years": [...], "statuses": [...]}. Индекса, выключенного в библиотеке, в файле нет;
+- id книг всех ключей подряд, в порядке описания (int64, little-endian).
+
+Отметку версии задает хранилище (см. JsonStorage.read_indexes): по ней проверяется, что индексы
+относятся к текущему файлу библиотеки, а записи журнала изменений, сделанные после сохранения
+индексов, применяются к загруженным индексам при загрузке библиотеки.
+
+Пример использования:
+write_indexes('library.json.indexes', stamp, dump_indexes(library.index, library.secondary_index))
+stamp, index, secondary_index = read_indexes('library.json.indexes')
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from book.atomic_file import atomic_write
+from book.search_index import SearchIndex
+from book.secondary_index import SecondaryIndex
+
+
+MAGIC = b'BOOKINDX'
+VERSION = 2
+# Сигнатура, версия, CRC32, размер описания в байтах
+HEADER = struct.Struct('<8sIIQ')
+
+# Загруженные индексы: (отметка версии библиотеки, поисковый индекс, вторичные индексы)
+LoadedIndexes = Tuple[Dict[str, Any], Optional[SearchIndex], Optional[SecondaryIndex]]
+# Сериализованные индексы: (описание ключей, id книг всех ключей в байтах)
+DumpedIndexes = Tuple[Dict[str, Any], bytes]
+
+
+def _pack_section(buckets: Iterable[Tuple[Any, Union[Sequence[int], set]]], keys: List[List[Any]],
+                  parts: List[bytes]) -> None:
+    """Добавляет ключи корзин индекса в описание, а их id - в список частей массива id."""
+    for key, ids in buckets:
+        if not ids:
+            continue
+        keys.append([key, len(ids)])
+        # Еще не развернутые id триграммы (срез загруженного массива) записываются без копирования в список
+        parts.append(ids.tobytes() if isinstance(ids, memoryview) else array('q', ids).tobytes())
+
+
+def dump_indexes(index: Optional[SearchIndex],
+                 secondary_index: Optional[SecondaryIndex]) -> Optional[DumpedIndexes]:
+    """
+    Сериализует индексы библиотеки (без отметки версии).
+
+    Вызывается под блокировкой библиотеки, пока индексы не меняются.
+
+    :param index: Поисковый индекс или None.
+    :param secondary_index: Вторичные индексы или None.
+    :return: Описание ключей и id книг или None, если в библиотеке нет индексов.
+    """
+    if index is None and secondary_index is None:
+        return None
+    description: Dict[str, List[List[Any]]] = {}
+    parts: List[bytes] = []
+    if index is not None:
+        _pack_section(index.items(), description.setdefault('search', []), parts)
+    if secondary_index is not None:
+        _pack_section(secondary_index.authors.items(), description.setdefault('authors', []), parts)
+        _pack_section(secondary_index.years.items(), description.setdefault('years', []), parts)
+        _pack_section(secondary_index.statuses.items(), description.setdefault('statuses', []), parts)
+    ids = b''.join(parts)
+    if sys.byteorder == 'big':
+        values = array('q')
+        values.frombytes(ids)
+        values.byteswap()
+        ids = values.tobytes()
+    return description, ids
+
+
+def write_indexes(filename: str, stamp: Dict[str, Any], dumped: DumpedIndexes) -> None:
+    """
+    Атомарно записывает файл индексов.
+
+    :param filename: Имя файла индексов.
+    :param stamp: Отметка версии библиотеки, к которой относятся индексы.
+    :param dumped: Индексы, сериализованные dump_indexes.
+    """
+    keys, ids = dumped
+    description = json.dumps({'stamp': stamp, **keys}, ensure_ascii=False).encode('utf-8')
+    checksum = zlib.crc32(ids, zlib.crc32(description))
+    with atomic_write(filename, mode='wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, checksum, len(description)))
+        f.write(description)
+        f.write(ids)
+
+
+def read_stamp(filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Читает только отметку версии библиотеки из файла индексов.
+
+    :return: Отметка или None, если файла нет или он не является файлом индексов.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            magic, version, _, description_size = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                return None
+            return json.loads(f.read(description_size)).get('stamp')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def read_indexes(filename: str) -> Optional[LoadedIndexes]:
+    """
+    Читает файл индексов.
+
+    :param filename: Имя файла индексов.
+    :return: Отметка версии библиотеки и индексы (None для индекса, которого нет в файле)
+             или None, если файла нет или он поврежден.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, checksum, description_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or zlib.crc32(memoryview(data)[HEADER.size:]) != checksum:
+        return None
+    ids_start = HEADER.size + description_size
+    if ids_start > len(data) or (len(data) - ids_start) % 8:
+        return None
+    try:
+        description = json.loads(data[HEADER.size:ids_start])
+    except ValueError:
+        return None
+    ids = array('q')
+    ids.frombytes(data[ids_start:])
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    view = memoryview(ids)
+    position = 0
+
+    def section(name: str) -> Dict[Any, memoryview]:
+        nonlocal position
+        buckets = {}
+        for key, count in description.get(name, ()):
+            buckets[key] = view[position:position + count]
+            position += count
+        return buckets
+
+    index: Optional[SearchIndex] = None
+    if 'search' in description:
+        # Множества триграмм создаются при первом обращении, остальные индексы невелики
+        index = SearchIndex.from_packed(section('search'))
+    secondary_index: Optional[SecondaryIndex] = None
+    if 'authors' in description:
+        authors = {sys.intern(author): set(book_ids) for author, book_ids in section('authors').items()}
+        years = {int(year): set(book_ids) for year, book_ids in section('years').items()}
+        statuses = {sys.intern(status): set(book_ids) for status, book_ids in section('statuses').items()}
+        secondary_index = SecondaryIndex.from_buckets(authors, years, statuses)
+    if position != len(ids):
+        return None
+    return description.get('stamp', {}), index, secondary_index
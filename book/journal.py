@@ -0,0 +1,163 @@
+"""
+Модуль журнала изменений (write-ahead journal) для библиотеки книг.
+
+Вместо полной перезаписи файла библиотеки при каждом изменении каждая операция
+(добавление, удаление, изменение статуса) дописывается в конец журнала одной строкой JSON.
+При загрузке библиотеки журнал проигрывается поверх основного файла (снимка), а при
+превышении порога по количеству записей или размеру журнал сворачивается в снимок (compaction).
+
+По умолчанию каждая порция записей сбрасывается на диск (os.fsync), поэтому изменение, о котором
+библиотека сообщила, переживает и сбой питания. fsync стоит от долей миллисекунды до десятков
+миллисекунд на запись (в зависимости от диска); с fsync=False запись доходит только до кэша ОС:
+она переживает аварийное завершение процесса, но последние изменения могут пропасть при сбое
+питания или ядра.
+
+Формат записей журнала:
+{"op": "add", "book": {...}}
+{"op": "remove", "id": 1}
+{"op": "status", "id": 1, "status": "выдана"}
+"""
+
+import json
+import os
+import shutil
+import logging
+from typing import Dict, Any, Iterator, List, Tuple
+from book.atomic_file import fsync_directory
+from book.lexicon import LEXICON_LOG
+
+
+class Journal:
+    def __init__(self, filename: str, fsync: bool = True) -> None:
+        """
+        Инициализация экземпляра класса Journal.
+
+        :param filename: Имя файла журнала (обычно '<файл библиотеки>.journal').
+        :param fsync: Если True, каждая порция записей сбрасывается на диск до возврата из append_many.
+        """
+        self.filename: str = filename
+        self.fsync: bool = fsync
+        self.previous_filename: str = f'{filename}.prev'
+        self.records: int = 0
+        self.offset: int = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Дописывает одну запись в конец журнала.
+
+        :param record: Словарь с описанием операции.
+        """
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Дописывает несколько записей в конец журнала за одну операцию записи
+        (и при fsync=True - за один сброс на диск).
+
+        :param records: Список словарей с описанием операций.
+        """
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        with open(self.filename, 'a+b') as f:
+            # Если последняя запись оборвана сбоем, завершаем ее строку, чтобы не испортить новую запись
+            created = f.seek(0, os.SEEK_END) == 0
+            if not created:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    data = b'\n' + data
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        if self.fsync and created:
+            # Новый файл журнала должен пережить сбой вместе со своей записью в каталоге
+            fsync_directory(os.path.dirname(os.path.abspath(self.filename)))
+        self.records += len(records)
+
+    def replay(self, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Последовательно возвращает записи журнала.
+
+        Поврежденная строка (например, недописанная при сбое последняя запись) пропускается
+        с записью в лог. После чтения в атрибуте offset хранится позиция конца последней 
+        полной записи, с которой можно продолжить чтение новых записей.
+        При чтении с начала сначала проигрывается отложенная часть журнала (см. rotate), 
+        если свертка журнала не успела завершиться.
+
+        :param offset: Позиция в файле журнала, с которой начинается чтение.
+        :return: Итератор по записям журнала.
+        """
+        if offset == 0:
+            self.records = 0
+            for record, _ in self._read(self.previous_filename, 0):
+                self.records += 1
+                yield record
+        self.offset = offset
+        for record, end in self._read(self.filename, offset):
+            self.offset = end
+            self.records += 1
+            yield record
+        if not os.path.exists(self.filename):
+            self.offset = 0
+
+    def _read(self, filename: str, offset: int) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Читает записи файла журнала, возвращая каждую запись вместе с позицией ее конца."""
+        if not os.path.exists(filename):
+            return
+        with open(filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Запись еще не дописана (или оборвана сбоем) - позицию не сдвигаем
+                    logging.error("%s %r", LEXICON_LOG['error_journal_record'], line[:100])
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logging.error("%s %s", LEXICON_LOG['error_journal_record'], e)
+                    continue
+                yield record, offset
+
+    def size(self) -> int:
+        """
+        Возвращает размер файла журнала в байтах.
+
+        :return: Размер журнала (0, если журнала нет).
+        """
+        try:
+            return os.path.getsize(self.filename)
+        except OSError:
+            return 0
+
+    def rotate(self) -> None:
+        """
+        Откладывает текущие записи журнала в '<журнал>.prev' перед сверткой.
+
+        Новые записи после этого пишутся в пустой журнал, а отложенные удаляются 
+        (drop_previous), только когда снимок библиотеки записан на диск. 
+        Если отложенная часть уже есть (прошлая свертка не завершилась), записи добавляются к ней.
+        """
+        if os.path.exists(self.filename):
+            if os.path.exists(self.previous_filename):
+                with open(self.filename, 'rb') as source, open(self.previous_filename, 'ab') as target:
+                    shutil.copyfileobj(source, target)
+                os.remove(self.filename)
+            else:
+                os.replace(self.filename, self.previous_filename)
+        self.records = 0
+        self.offset = 0
+
+    def drop_previous(self) -> None:
+        """Удаляет отложенную часть журнала после того, как ее записи попали в снимок библиотеки."""
+        if os.path.exists(self.previous_filename):
+            os.remove(self.previous_filename)
+
+    def clear(self) -> None:
+        """Удаляет журнал после того, как все его записи попали в снимок библиотеки."""
+        for filename in (self.filename, self.previous_filename):
+            if os.path.exists(filename):
+                os.remove(filename)
+        self.records = 0
+        self.offset = 0
@@ -24,21 +24,34 @@ LEXICON: dict[str, str] = {
     "add_book_retry": "Повторно добавить книгу нажмите любую клавишу. Для возврата в меню нажмите 0 - ", 
     'add_book_true': "Добавлена в библиотеку книга - ",
     
-    "delete_books_id": "Введите ID книги для удаления: ",
+    "delete_books_id": "Введите ID книги для удаления (несколько - через запятую или диапазоном 10-50): ",
     "delete_books_true": "Книга удалена с номером (id) ",
+    "delete_books_many_true": "Удалено книг: ",
    
     "search_books_date": 'Введите заголовок, автора или год для поиска: ',
+    "search_books_fuzzy": 'Точных совпадений нет. Возможно, вы искали: ',
     "display_books_true": 'В библиотеке сейчас следующие книги: ',
+    "display_books_page": 'Страница',
+    "display_books_navigation": 'Следующая страница - 1, предыдущая - 2, возврат в меню - любая другая клавиша: ',
     
-    "update_status_id": "Введите ID книги для изменения статуса: ",
+    "update_status_id": "Введите ID книги для изменения статуса (несколько - через запятую или диапазоном 10-50): ",
     "update_status_input": "Введите новый статус (в наличии/выдана): ",
     "update_status_true": "Статус книги обновлен: ",
+    "update_status_many_true": "Статус обновлен у книг: ",
     
     'error_load_library': "Не удалось загрузить библиотеку.",
     "error_save_books":"Ошибка при записи файла",
     "error_add_book": "Неверные данные: название, автор и год должны быть заполнены.Попробуйте еще раз.",
     "error_add_book_year": "Неверные года книги. Попробуйте еще раз.",
     
+    "import_true": "Импортировано книг: ",
+    "import_errors": "Строк с ошибками: ",
+    "import_row": "Строка",
+    "migrate_true": "Перенесено книг в базу SQLite: ",
+    "convert_true": "Перенесено книг в новый формат: ",
+    "server_start": 'Сервис библиотеки запущен по адресу',
+    "error_server_internal": 'Внутренняя ошибка сервиса библиотеки',
+
     "exit":'Завершение работы программы через 3 секунды',
     "exit_end":'Прощай' 
     }
@@ -50,8 +63,13 @@ LEXICON_LOG: dict[str, str] = {
 
     "load_library": 'Книги загружены из файла в библиотеку',
     "error_load_library":"Ошибка при открытии файла библиотеки: ",
+    "error_read_book": 'Не удалось прочитать книгу из файла по индексу смещений: ',
+    "load_indexes": 'Индексы загружены из файла индексов',
+    "error_save_indexes": 'Ошибка при записи файла индексов: ',
     'save_books': "Книга успешна сохранена",
     "error_save_books":"Ошибка при записи файла: ",
+    "compact_journal": 'Журнал изменений свернут в файл библиотеки',
+    "error_journal_record": 'Поврежденная запись журнала изменений пропущена: ',
     
     "add_book": 'Открыто меню - добавить книгу',
     "add_book_true": 'Новая книга добавлена в библиотеку',
@@ -65,14 +83,30 @@ LEXICON_LOG: dict[str, str] = {
     "search_books": 'Открыто меню - Искать книгу',
     "error_search_books": "Неверные данные для поиска книги - ",
     "search_books_true": 'Книги успешно найдены',
+    "search_books_fuzzy": 'Точных совпадений нет, показаны результаты нечеткого поиска',
     
     "display_books": 'Открыто меню - Отображать все книги',
     "display_books_true": 'Книги успешно отоброжены из библиотеки',
+    "display_books_page": 'Показана страница книг ',
     
     "update_status": 'Открыто меню - Изменить статус книги',
     "error_update_status": "Ошибка обновления статуса ",
     "update_status_true": 'Статус книги успешно изменен',
     
+    "server_start": 'Сервис библиотеки запущен по адресу',
+    "server_stop": 'Сервис библиотеки остановлен',
+    "server_request": 'Запрос к сервису библиотеки:',
+    "error_server_request": 'Ошибка запроса к сервису библиотеки',
+    "error_server_internal": 'Внутренняя ошибка при выполнении запроса к сервису библиотеки',
+    
+    "batch_start": 'Пакетный режим, команды из',
+    "batch_done": 'Пакетный режим завершен, выполнено команд и ошибок:',
+    "error_batch_command": 'Ошибка в команде пакетного режима, строка',
+    
+    "import_file": 'Пакетный импорт книг из файла',
+    "import_books": 'Пакетный импорт завершен, добавлено книг: ',
+    "error_import_row": 'Ошибка в строке файла импорта',
+    
     "exit_menu": 'Пользователь нажал выход (программа завершает работу через 3 секунды)',
     "exit_error": 'Ошибка меню - '
    
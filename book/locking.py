@@ -0,0 +1,129 @@
+"""
+Модуль межпроцессной блокировки и метаданных файла библиотеки.
+
+Несколько процессов могут работать с одним файлом библиотеки. Чтобы они не затирали
+изменения друг друга, каждое изменение выполняется под блокировкой файла '<библиотека>.lock',
+а в файле метаданных '<библиотека>.meta' хранится:
+- generation - номер версии библиотеки, увеличивается при каждом изменении;
+- snapshot - номер снимка, увеличивается при каждой полной перезаписи файла библиотеки;
+- next_id - следующий свободный идентификатор книги, общий для всех процессов;
+- free_ids - id удаленных книг, которые можно выдать повторно (см. book.id_allocator);
+- file - размер и время изменения файла библиотеки, к которому относятся метаданные.
+
+Метаданные записываются и без режима нескольких процессов: по ним при запуске восстанавливается
+выдача id, не вычисляя next_id по всем книгам.
+
+Пример использования:
+lock = FileLock('library.json.lock')
+with lock:
+    meta = read_meta('library.json.meta')
+    meta['generation'] += 1
+    write_meta('library.json.meta', meta)
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Any, Optional
+from book.atomic_file import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def default_meta() -> Dict[str, Any]:
+    """Возвращает метаданные новой библиотеки."""
+    return {'generation': 0, 'snapshot': 0, 'next_id': 1, 'free_ids': []}
+
+
+def read_meta(filename: str) -> Dict[str, Any]:
+    """
+    Читает файл метаданных библиотеки.
+
+    :param filename: Имя файла метаданных.
+    :return: Словарь метаданных (значения по умолчанию, если файла еще нет).
+    """
+    meta = default_meta()
+    if os.path.exists(filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            meta.update(json.load(f))
+    return meta
+
+
+def write_meta(filename: str, meta: Dict[str, Any]) -> None:
+    """
+    Атомарно записывает файл метаданных библиотеки.
+
+    :param filename: Имя файла метаданных.
+    :param meta: Словарь метаданных.
+    """
+    with atomic_write(filename) as f:
+        json.dump(meta, f)
+
+
+class FileLock:
+    def __init__(self, filename: str) -> None:
+        """
+        Инициализация межпроцессной блокировки на файле.
+
+        Блокировка реентерабельна в пределах одного потока: вложенные with не блокируют процесс,
+        а другие потоки ждут ее освобождения так же, как другие процессы.
+
+        :param filename: Имя файла блокировки (создается при первом захвате).
+        """
+        self.filename: str = filename
+        # Глубина вложенных захватов; меняет ее только поток, который держит блокировку
+        self.depth: int = 0
+        self._file = None
+        # Блокировка файла не разделяет потоки одного процесса - их разделяет блокировка потоков
+        self._thread_lock = threading.RLock()
+        self._owner: Optional[int] = None
+
+    @property
+    def locked(self) -> bool:
+        """True, если блокировка захвачена этим объектом в текущем потоке."""
+        return self.depth > 0 and self._owner == threading.get_ident()
+
+    def acquire(self) -> None:
+        """Захватывает блокировку, ожидая ее освобождения другими потоками и процессами."""
+        self._thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                self._file = open(self.filename, 'a+b')
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+            self._owner = threading.get_ident()
+        self.depth += 1
+
+    def release(self) -> None:
+        """Освобождает блокировку."""
+        self.depth -= 1
+        if self.depth == 0:
+            self._owner = None
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -0,0 +1,77 @@
+"""
+Модуль настройки логирования приложения.
+
+Логи пишутся в файл (по умолчанию 'book.log', в main - параметр --log-file) без задержки основного потока:
+- обработчик QueueHandler только кладет запись в очередь;
+- фоновый поток QueueListener форматирует записи и пишет их в файл;
+- файл ограничен по размеру: при превышении max_bytes он переименовывается в 'book.log.1'
+  (предыдущие копии сдвигаются), хранится backup_count копий.
+
+Сообщения логируются в виде logging.info('%s %s', LEXICON_LOG[...], value), поэтому строка
+собирается, только если уровень сообщения включен, и уже в фоновом потоке.
+
+Пример использования:
+setup_logging('book.log')  # один раз при запуске приложения (см. main)
+logging.info(LEXICON_LOG['start'])
+stop_logging()             # при выходе из приложения
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler, который не форматирует запись в потоке вызова: это делает поток записи."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(filename: str = 'book.log', level: int = logging.INFO,
+                  max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3) -> None:
+    """
+    Настраивает запись логов в файл через очередь и фоновый поток.
+
+    Настройка выполняется один раз: повторные вызовы ничего не меняют.
+
+    :param filename: Имя файла логов.
+    :param level: Уровень логирования.
+    :param max_bytes: Размер файла, после которого он заменяется новым.
+    :param backup_count: Количество хранимых предыдущих файлов логов.
+    """
+    global _handler, _listener
+    if _listener is not None:
+        return
+    file_handler = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count,
+                                       encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, file_handler)
+    _handler = DeferredQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Дописывает записи из очереди в файл и отключает настройку setup_logging."""
+    global _handler, _listener
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _handler = None
+    _listener = None
@@ -0,0 +1,171 @@
+"""
+Модуль хранилища библиотеки только для чтения, отображенного в память (mmap).
+
+Файл двоичного снимка (см. book.snapshot) отображается в память, а книги читаются из него
+при обращении: класс MappedBooks ведет себя как словарь {id: Book}, но находит запись книги
+двоичным поиском по id и декодирует ее строки только тогда, когда книга нужна.
+Поэтому библиотека открывается мгновенно при любом размере каталога, а несколько процессов,
+открывших один снимок, используют одни и те же страницы кэша операционной системы,
+а не отдельные копии книг. Контрольная сумма снимка при открытии не сверяется - для этого
+пришлось бы прочитать весь файл.
+
+Поиск и запросы по автору, году и статусу выполняет само хранилище (как SQLite): записи
+просматриваются прямо в отображенном файле. Индексов в снимке нет, поэтому каждый такой запрос
+перебирает все записи - отображение ускоряет открытие библиотеки и чтение книг по id, но не поиск. Для поиска по подстроке один раз, при первом поиске,
+строится список строк снимка в нижнем регистре - его размер зависит от количества разных
+названий и авторов, а не от количества книг.
+
+Любое изменение библиотеки поднимает ReadOnlyLibraryError. Чтобы изменить каталог, его открывают
+обычным образом (Library('library.snap')), а процессы только для чтения открывают снимок заново.
+
+Пример использования:
+library = Library('library.snap', read_only=True)
+books = library.search_books('толстой')
+"""
+
+import mmap
+import threading
+from collections.abc import Mapping
+from typing import ContextManager, Dict, Iterator, List, Optional, Set
+from book.book_class import Book
+from book.snapshot import Snapshot
+from book.storage import StorageBackend
+from book.user_exception import ReadOnlyLibraryError
+
+
+# Символы, из которых состоит год книги
+YEAR_CHARS = frozenset('-0123456789')
+
+
+class MappedBooks(Mapping):
+    def __init__(self, snapshot: Snapshot) -> None:
+        """
+        Инициализация словаря книг, которые читаются из снимка при обращении.
+
+        :param snapshot: Снимок, отображенный в память.
+        """
+        self.snapshot = snapshot
+
+    def _book(self, row: int) -> Book:
+        """Создает объект Book по записи снимка."""
+        book_id, title, author, year, status = self.snapshot.row(row)
+        book = Book(book_id, title, author, year)
+        book.status = status
+        return book
+
+    def __getitem__(self, book_id: int) -> Book:
+        row = self.snapshot.find_row(book_id) if isinstance(book_id, int) else None
+        if row is None:
+            raise KeyError(book_id)
+        return self._book(row)
+
+    def __contains__(self, book_id: object) -> bool:
+        return isinstance(book_id, int) and self.snapshot.find_row(book_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (record[0] for record in self.snapshot.records())
+
+    def __len__(self) -> int:
+        return self.snapshot.count
+
+    def values(self) -> Iterator[Book]:
+        """Возвращает книги в порядке возрастания id."""
+        return (self._book(row) for row in range(self.snapshot.count))
+
+    def page(self, offset: int, limit: int) -> List[Book]:
+        """Возвращает limit книг в порядке возрастания id, пропустив первые offset книг."""
+        return [self._book(row) for row in range(offset, min(offset + limit, self.snapshot.count))]
+
+
+class MappedStorage(StorageBackend):
+    native_search = True
+
+    def __init__(self, filename: str) -> None:
+        """
+        Инициализация хранилища: отображение файла снимка в память.
+
+        :param filename: Имя файла снимка.
+        :raises SnapshotError: Если файл не является снимком или поврежден.
+        :raises OSError: Если файл не удалось открыть.
+        """
+        self.filename: str = filename
+        with open(filename, 'rb') as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.snapshot = Snapshot(self.mapping)
+        except Exception:
+            self.mapping.close()
+            raise
+        self.books = MappedBooks(self.snapshot)
+        self._lock = threading.Lock()
+        # Строки снимка в нижнем регистре для поиска (строятся при первом поиске)
+        self._lower_strings: Optional[List[str]] = None
+
+    def open_books(self) -> MappedBooks:
+        return self.books
+
+    def max_id(self) -> Optional[int]:
+        return self.snapshot.ids[self.snapshot.count - 1] if self.snapshot.count else None
+
+    def transaction(self, library) -> ContextManager[None]:
+        """Запрещает изменение библиотеки: каждое изменение Library выполняется в транзакции хранилища."""
+        raise ReadOnlyLibraryError
+
+    def _strings_lower(self) -> List[str]:
+        """Возвращает строки снимка в нижнем регистре."""
+        with self._lock:
+            if self._lower_strings is None:
+                self._lower_strings = [text.lower() for text in self.snapshot.strings()]
+            return self._lower_strings
+
+    def _string_numbers(self, predicate) -> Set[int]:
+        """Возвращает номера строк снимка, для которых predicate(строка в нижнем регистре) истинно."""
+        return {number for number, text in enumerate(self._strings_lower()) if predicate(text)}
+
+    def search(self, search_term: str) -> List[int]:
+        strings = self._string_numbers(lambda text: search_term in text)
+        records = self.snapshot.records()
+        if not set(search_term) <= YEAR_CHARS:
+            # Запрос не может входить в год - проверяются только строки
+            return [book_id for book_id, _, title, author, _ in records if title in strings or author in strings]
+        # Разных годов немного - вхождение запроса в год проверяется один раз для каждого года
+        years: Dict[int, bool] = {}
+        found = []
+        for book_id, year, title, author, _ in records:
+            if title in strings or author in strings:
+                found.append(book_id)
+                continue
+            matched = years.get(year)
+            if matched is None:
+                matched = years[year] = search_term in str(year)
+            if matched:
+                found.append(book_id)
+        return found
+
+    def find_by_author(self, author: str) -> List[int]:
+        lowered = author.lower()
+        strings = {number for number in self._string_numbers(lambda text: text == lowered)
+                   if self.snapshot.string(number) == author}
+        return [book_id for book_id, _, _, author_number, _ in self.snapshot.records() if author_number in strings]
+
+    def find_by_year_range(self, start: int, end: int) -> List[int]:
+        found = []
+        for book_id, year, _, _, _ in self.snapshot.records():
+            if isinstance(year, str):
+                # Год-строка из цифр сравнивается как число, остальные годы-строки в диапазон не входят
+                if not year.isdecimal():
+                    continue
+                year = int(year)
+            if start <= year <= end:
+                found.append((year, book_id))
+        return [book_id for _, book_id in sorted(found)]
+
+    def find_by_status(self, status: str) -> List[int]:
+        lowered = status.lower()
+        strings = {number for number in self._string_numbers(lambda text: text == lowered)
+                   if self.snapshot.string(number) == status}
+        return [book_id for book_id, _, _, _, status_number in self.snapshot.records() if status_number in strings]
+
+    def close(self) -> None:
+        self.snapshot.buffer.release()
+        self.mapping.close()
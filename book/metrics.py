@@ -0,0 +1,325 @@
+"""
+Модуль метрик библиотеки.
+
+Реестр метрик (MetricsRegistry) хранит счетчики и гистограммы и выводит их в текстовом
+формате Prometheus. Функция enable_metrics подключает измерения к методам Library и хранилища:
+- library_calls_total - количество вызовов методов (с результатом ok или error);
+- library_call_duration_seconds - гистограмма длительности вызовов;
+- library_lookups_total - поиски по индексу, хранилищу или перебором и доля успешных (hit/miss);
+- library_save_bytes - гистограмма размера файла, записанного при сохранении;
+- library_save_duration_seconds - гистограмма длительности записи файла;
+- library_journal_bytes_total - количество байт, дописанных в журнал изменений.
+
+Пока метрики выключены, методы библиотеки не обернуты и измерения ничего не стоят.
+enable_metrics заменяет методы классов обертками, а disable_metrics возвращает исходные методы.
+
+Пример использования:
+enable_metrics()
+server = start_metrics_server(9108)   # http://127.0.0.1:9108/metrics
+library = Library('library.json')
+print(REGISTRY.render())
+"""
+
+import functools
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+
+# Границы корзин гистограммы длительности (секунды)
+DURATION_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+# Границы корзин гистограммы размера файла (байты)
+SIZE_BUCKETS: Tuple[float, ...] = tuple(float(1024 * 4 ** power) for power in range(10))
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Приводит метки к упорядоченному кортежу, который служит ключом значения метрики."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Форматирует метки в виде {name="value",...} с экранированием по правилам Prometheus."""
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Форматирует число для Prometheus: целые значения без дробной части, бесконечность как +Inf."""
+    if math.isinf(value):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, lock: threading.Lock) -> None:
+        """
+        Инициализация счетчика.
+
+        :param name: Имя метрики.
+        :param documentation: Описание метрики (строка HELP).
+        :param lock: Блокировка реестра.
+        """
+        self.name: str = name
+        self.documentation: str = documentation
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = lock
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Увеличивает счетчик с заданными метками."""
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Возвращает значение счетчика с заданными метками."""
+        return self.values.get(_label_key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f'{self.name}{_format_labels(key)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...], lock: threading.Lock) -> None:
+        """
+        Инициализация гистограммы.
+
+        :param name: Имя метрики.
+        :param documentation: Описание метрики (строка HELP).
+        :param buckets: Верхние границы корзин по возрастанию.
+        :param lock: Блокировка реестра.
+        """
+        self.name: str = name
+        self.documentation: str = documentation
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        # Для каждого набора меток: [количество по корзинам..., сумма, общее количество]
+        self.values: Dict[LabelKey, List[float]] = {}
+        self._lock = lock
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Добавляет наблюдение с заданными метками."""
+        key = _label_key(labels)
+        with self._lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 2)
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[position] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels: Any) -> int:
+        """Возвращает количество наблюдений с заданными метками."""
+        state = self.values.get(_label_key(labels))
+        return int(state[-1]) if state else 0
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, state in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, state):
+                    cumulative += bucket_count
+                    lines.append(f'{self.name}_bucket{_format_labels(key, ("le", _format_value(bound)))} '
+                                 f'{_format_value(cumulative)}')
+                lines.append(f'{self.name}_bucket{_format_labels(key, ("le", "+Inf"))} {_format_value(state[-1])}')
+                lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(state[-2])}')
+                lines.append(f'{self.name}_count{_format_labels(key)} {_format_value(state[-1])}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        """Инициализация пустого реестра метрик."""
+        self.metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str = '') -> Counter:
+        """Возвращает счетчик с заданным именем, создавая его при первом обращении."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics.setdefault(name, Counter(name, documentation, self._lock))
+        return metric
+
+    def histogram(self, name: str, documentation: str = '',
+                  buckets: Tuple[float, ...] = DURATION_BUCKETS) -> Histogram:
+        """Возвращает гистограмму с заданным именем, создавая ее при первом обращении."""
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics.setdefault(name, Histogram(name, documentation, buckets, self._lock))
+        return metric
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus."""
+        lines: List[str] = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Удаляет все метрики."""
+        self.metrics.clear()
+
+
+# Реестр по умолчанию, в который пишут измерения библиотеки
+REGISTRY = MetricsRegistry()
+
+# Исходные методы классов, замененные обертками: (класс, имя метода) -> функция
+_ORIGINALS: Dict[Tuple[type, str], Callable] = {}
+
+# Методы Library, длительность и количество вызовов которых измеряется
+LIBRARY_METHODS: Tuple[str, ...] = (
+    'load_books', 'save_books', 'add_book', 'create_book', 'reserve_ids', 'add_books', 'remove_book', 'remove_books',
+    'update_status', 'update_status_many',
+    'search_books', 'find_by_author', 'find_by_year_range', 'find_by_status', 'display_books', 'get_book',
+)
+
+# Методы поиска и индекс, который они используют
+LOOKUP_INDEXES: Dict[str, str] = {
+    'search_books': 'index',
+    'find_by_author': 'secondary_index',
+    'find_by_year_range': 'secondary_index',
+    'find_by_status': 'secondary_index',
+}
+
+
+def metrics_enabled() -> bool:
+    """True, если измерения подключены к методам библиотеки."""
+    return bool(_ORIGINALS)
+
+
+def _lookup_path(library, method: str) -> str:
+    """Определяет, как выполняется поиск: средствами хранилища, по индексу Library или перебором."""
+    if library.storage.native_search:
+        return 'storage'
+    return 'index' if getattr(library, LOOKUP_INDEXES[method], None) is not None else 'scan'
+
+
+def _instrument_library_method(name: str, method: Callable, registry: MetricsRegistry) -> Callable:
+    from book.user_exception import NotBookError
+
+    calls = registry.counter('library_calls_total', 'Количество вызовов методов Library.')
+    durations = registry.histogram('library_call_duration_seconds', 'Длительность вызовов методов Library.')
+    lookups = registry.counter('library_lookups_total', 'Поиски книг: способ поиска и результат (hit/miss).')
+
+    @functools.wraps(method)
+    def wrapper(library, *args, **kwargs):
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            result = method(library, *args, **kwargs)
+            status = 'ok'
+            if name in LOOKUP_INDEXES:
+                lookups.inc(method=name, path=_lookup_path(library, name), result='hit')
+            return result
+        except NotBookError:
+            if name in LOOKUP_INDEXES:
+                lookups.inc(method=name, path=_lookup_path(library, name), result='miss')
+            raise
+        finally:
+            durations.observe(time.perf_counter() - started, method=name)
+            calls.inc(method=name, status=status)
+    return wrapper
+
+
+def _instrument_json_save(method: Callable, registry: MetricsRegistry) -> Callable:
+    sizes = registry.histogram('library_save_bytes', 'Размер файла библиотеки, записанного при сохранении.',
+                               SIZE_BUCKETS)
+    durations = registry.histogram('library_save_duration_seconds', 'Длительность записи файла библиотеки.')
+
+    @functools.wraps(method)
+    def wrapper(storage, books):
+        started = time.perf_counter()
+        method(storage, books)
+        durations.observe(time.perf_counter() - started)
+        sizes.observe(os.path.getsize(storage.filename))
+    return wrapper
+
+
+def _instrument_journal_append(method: Callable, registry: MetricsRegistry) -> Callable:
+    written = registry.counter('library_journal_bytes_total', 'Количество байт, дописанных в журнал изменений.')
+
+    @functools.wraps(method)
+    def wrapper(journal, records):
+        before = journal.size()
+        method(journal, records)
+        written.inc(journal.size() - before)
+    return wrapper
+
+
+def _replace(cls: type, name: str, wrapper: Callable) -> None:
+    _ORIGINALS[(cls, name)] = cls.__dict__[name]
+    setattr(cls, name, wrapper)
+
+
+def enable_metrics(registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Подключает измерения к методам Library, файлового хранилища и журнала.
+
+    Повторный вызов ничего не меняет.
+
+    :param registry: Реестр, в который записываются метрики.
+    """
+    if metrics_enabled():
+        return
+    # Импорт внутри функции: модули библиотеки не должны зависеть от модуля метрик
+    from book.book_class import Library
+    from book.journal import Journal
+    from book.storage import JsonStorage
+
+    for name in LIBRARY_METHODS:
+        _replace(Library, name, _instrument_library_method(name, Library.__dict__[name], registry))
+    _replace(JsonStorage, 'save', _instrument_json_save(JsonStorage.__dict__['save'], registry))
+    _replace(Journal, 'append_many', _instrument_journal_append(Journal.__dict__['append_many'], registry))
+
+
+def disable_metrics() -> None:
+    """Возвращает исходные методы классов: измерения перестают выполняться."""
+    for (cls, name), method in _ORIGINALS.items():
+        setattr(cls, name, method)
+    _ORIGINALS.clear()
+
+
+def start_metrics_server(port: int = 9108, host: str = '127.0.0.1',
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Запускает в фоновом потоке HTTP-сервер, который отдает метрики по адресу /metrics.
+
+    :param port: Порт (0 - выбрать свободный порт).
+    :param host: Адрес. По умолчанию сервер доступен только локально.
+    :param registry: Реестр метрик.
+    :return: Запущенный сервер (остановка - server.shutdown()).
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Запросы сборщика метрик не пишем в лог
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,153 @@
+"""
+Модуль индекса смещений книг в файле библиотеки JSON.
+
+При каждом сохранении файла библиотеки JSON (массив или JSON Lines) рядом записывается
+двоичный файл '<библиотека>.idx': отсортированные id книг и смещение в байтах, с которого
+в файле начинается объект каждой книги. По индексу одна книга читается из файла без загрузки
+всей библиотеки - так Library с отложенной загрузкой (параметры lazy и background_load) отвечает
+на запросы книги по id, пока каталог еще загружается.
+
+Файл индекса состоит из заголовка (HEADER: сигнатура b'BOOKIDX1', количество книг, размер и время
+изменения файла библиотеки, к которому относится индекс), массива id и массива смещений (int64,
+little-endian). Индекс, у которого размер и время изменения не совпадают с файлом библиотеки
+(файл изменили, не обновив индекс), не используется.
+
+Пример использования:
+index = OffsetIndex.open('library.json.idx', stamp=[size, mtime_ns])
+if index is not None:
+    book_data = read_record_at('library.json', index.find(1))
+"""
+
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+from book.atomic_file import atomic_write
+
+
+MAGIC = b'BOOKIDX1'
+# Сигнатура, количество книг, размер и время изменения файла библиотеки (нс)
+HEADER = struct.Struct('<8sQqq')
+
+# Размер блока, которым читается объект книги
+READ_SIZE = 4096
+
+_decoder = json.JSONDecoder()
+
+
+def _int64_array(data: bytes) -> array:
+    """Возвращает массив int64 из байтов little-endian."""
+    values = array('q')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class OffsetIndexBuilder:
+    def __init__(self) -> None:
+        """Инициализация построителя индекса: id и смещения добавляются по мере записи файла."""
+        self.ids: array = array('q')
+        self.offsets: array = array('q')
+
+    def add(self, book_id: int, offset: int) -> None:
+        """Добавляет смещение объекта книги в файле библиотеки."""
+        self.ids.append(book_id)
+        self.offsets.append(offset)
+
+    def write(self, filename: str, stamp: List[int]) -> None:
+        """
+        Атомарно записывает файл индекса.
+
+        :param filename: Имя файла индекса.
+        :param stamp: Размер и время изменения файла библиотеки [size, mtime_ns].
+        """
+        ids, offsets = self.ids, self.offsets
+        if any(ids[row] >= ids[row + 1] for row in range(len(ids) - 1)):
+            # Книги записываются в порядке словаря - после повторной выдачи id он не упорядочен по id
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            ids, offsets = array('q', (ids[row] for row in order)), array('q', (offsets[row] for row in order))
+        if sys.byteorder == 'big':
+            ids, offsets = array('q', ids), array('q', offsets)
+            ids.byteswap()
+            offsets.byteswap()
+        with atomic_write(filename, mode='wb') as f:
+            f.write(HEADER.pack(MAGIC, len(ids), *stamp))
+            f.write(ids.tobytes())
+            f.write(offsets.tobytes())
+
+
+class OffsetIndex:
+    def __init__(self, ids: array, offsets: array) -> None:
+        """
+        Инициализация индекса смещений.
+
+        :param ids: Id книг по возрастанию.
+        :param offsets: Смещения объектов книг в файле библиотеки (в том же порядке).
+        """
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def open(cls, filename: str, stamp: Optional[List[int]]) -> Optional['OffsetIndex']:
+        """
+        Читает файл индекса.
+
+        :param filename: Имя файла индекса.
+        :param stamp: Размер и время изменения файла библиотеки [size, mtime_ns].
+        :return: Индекс или None, если файла нет, он поврежден или относится к другой версии файла библиотеки.
+        """
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, count, size, mtime_ns = HEADER.unpack_from(data)
+        if magic != MAGIC or [size, mtime_ns] != stamp or len(data) != HEADER.size + 16 * count:
+            return None
+        middle = HEADER.size + 8 * count
+        return cls(_int64_array(data[HEADER.size:middle]), _int64_array(data[middle:]))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, book_id: int) -> Optional[int]:
+        """
+        Ищет смещение книги двоичным поиском по id.
+
+        :return: Смещение объекта книги в файле библиотеки или None, если книги нет.
+        """
+        row = bisect_left(self.ids, book_id)
+        if row < len(self.ids) and self.ids[row] == book_id:
+            return self.offsets[row]
+        return None
+
+
+def read_record_at(filename: str, offset: int) -> Dict[str, Any]:
+    """
+    Читает из файла библиотеки JSON один объект книги, начинающийся со смещения offset.
+
+    :param filename: Имя файла библиотеки.
+    :param offset: Смещение объекта книги в байтах (перед объектом допускаются пробельные символы).
+    :raises json.JSONDecodeError: Если по смещению нет объекта книги.
+    :return: Словарь книги.
+    """
+    size = READ_SIZE
+    with open(filename, 'rb') as f:
+        while True:
+            f.seek(offset)
+            data = f.read(size)
+            text = data.decode('utf-8', errors='ignore').lstrip()
+            try:
+                record, _ = _decoder.raw_decode(text)
+                return record
+            except json.JSONDecodeError:
+                if len(data) < size:
+                    # Прочитан весь остаток файла, а объект так и не закончился
+                    raise
+            # Объект книги длиннее прочитанного блока
+            size *= 4
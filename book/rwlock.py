@@ -0,0 +1,63 @@
+"""
+Модуль блокировки читателей-писателей для потоков одного процесса.
+
+Класс RWLock позволяет нескольким потокам одновременно читать библиотеку (поиск, вывод книг),
+а изменения выполнять по одному и только когда никто не читает. Ожидающий писатель получает
+преимущество: новые читатели ждут его, поэтому поток поисковых запросов не задерживает изменения
+бесконечно.
+
+Блокировка не реентерабельна: поток, который держит блокировку, не должен захватывать ее снова.
+
+Пример использования:
+lock = RWLock()
+with lock.read():
+    books = library.search_books('толстой')
+with lock.write():
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class RWLock:
+    def __init__(self) -> None:
+        """Инициализация блокировки читателей-писателей."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: int = 0
+        self._writer: bool = False
+        self._waiting_writers: int = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Захватывает блокировку для чтения (вместе с другими читателями)."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Захватывает блокировку для изменения (без других читателей и писателей)."""
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
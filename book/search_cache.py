@@ -0,0 +1,109 @@
+"""
+Модуль кэша результатов поиска книг.
+
+Класс SearchCache хранит результаты search_books (идентификаторы найденных книг) по поисковому
+запросу в нижнем регистре. Кэш ограничен по количеству запросов (вытесняется запрос, который
+дольше всех не использовался - LRU) и, при необходимости, по времени жизни записи (TTL).
+Слишком большие результаты не кэшируются, чтобы кэш не занимал много памяти.
+
+Кэш точно сбрасывается при изменении библиотеки: при добавлении или удалении книги удаляются
+только те запросы, которые являются подстрокой названия, автора или года этой книги, то есть
+результаты, которые могли измениться. Изменение статуса результаты поиска не меняет:
+в кэше хранятся идентификаторы, а книги берутся из библиотеки при каждом запросе.
+
+Пример использования:
+cache = SearchCache(max_entries=1024)
+ids = cache.get('толстой')
+if ids is None:
+    cache.put('толстой', search('толстой'), cache.version)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from book.search_index import book_fields
+
+
+class SearchCache:
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None, max_result: int = 10000) -> None:
+        """
+        Инициализация кэша результатов поиска.
+
+        :param max_entries: Наибольшее количество запросов в кэше.
+        :param ttl: Время жизни записи в секундах (None - без ограничения).
+        :param max_result: Наибольшее количество книг в результате, который кэшируется.
+        """
+        self.max_entries: int = max_entries
+        self.ttl: Optional[float] = ttl
+        self.max_result: int = max_result
+        self.hits: int = 0
+        self.misses: int = 0
+        # Номер версии увеличивается при каждом сбросе: результат, вычисленный до сброса, не сохраняется
+        self.version: int = 0
+        self._entries: 'OrderedDict[str, Tuple[List[int], Optional[float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, search_term: str) -> Optional[List[int]]:
+        """
+        Возвращает закэшированный результат поиска.
+
+        :param search_term: Поисковый запрос в нижнем регистре.
+        :return: Идентификаторы найденных книг или None, если результата нет в кэше.
+        """
+        with self._lock:
+            entry = self._entries.get(search_term)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                del self._entries[search_term]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(search_term)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, search_term: str, found_ids: List[int], version: int) -> None:
+        """
+        Сохраняет результат поиска.
+
+        :param search_term: Поисковый запрос в нижнем регистре.
+        :param found_ids: Идентификаторы найденных книг.
+        :param version: Значение version на момент начала поиска. Если с тех пор библиотека
+                        изменилась, результат может быть устаревшим и не сохраняется.
+        """
+        if len(found_ids) > self.max_result:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[search_term] = (list(found_ids), expires)
+            self._entries.move_to_end(search_term)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_book(self, book) -> None:
+        """
+        Удаляет результаты, на которые может повлиять добавление или удаление книги.
+
+        :param book: Экземпляр Book.
+        """
+        with self._lock:
+            self.version += 1
+            # При загрузке библиотеки кэш пуст - поля книги не нужны
+            if not self._entries:
+                return
+            fields = book_fields(book)
+            stale = [term for term in self._entries if any(term in field for field in fields)]
+            for term in stale:
+                del self._entries[term]
+
+    def clear(self) -> None:
+        """Удаляет все результаты."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,181 @@
+"""
+Модуль инвертированного индекса для поиска книг.
+
+Класс SearchIndex хранит отображение триграмм (подстрок из 3 символов) названия, автора
+и года книги в множество идентификаторов книг. Это позволяет отвечать на поисковые
+запросы без полного перебора библиотеки, сохраняя семантику поиска по подстроке:
+- для запроса из 3 символов множество книг берется из индекса напрямую;
+- для более длинного запроса пересекаются множества книг по всем его триграммам,
+  после чего кандидаты проверяются на точное вхождение подстроки по самим книгам;
+- запрос короче 3 символов индекс не обрабатывает (search возвращает None) - такой
+  запрос находит большую часть библиотеки, и его выполняет полный перебор.
+
+Поля книг в индексе не хранятся: для проверки кандидатов search получает словарь книг
+библиотеки, а remove - саму удаляемую книгу.
+
+Индекс, загруженный из файла (см. book.index_file), хранит id каждой триграммы массивом
+и создает множество только при первом обращении к триграмме, поэтому загрузка не зависит
+от количества вхождений триграмм.
+
+Пример использования:
+index = SearchIndex()
+index.add(book)
+ids = index.search('война', library.books)
+"""
+
+from typing import Dict, Set, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+
+# Длина n-граммы, хранимой в индексе
+GRAM_SIZE = 3
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит текст к виду, в котором выполняется поиск.
+
+    :param text: Исходная строка (название, автор, год или поисковый запрос).
+    :return: Строка в нижнем регистре.
+    """
+    return str(text).lower()
+
+
+def book_fields(book) -> Tuple[str, str, str]:
+    """
+    Возвращает нормализованные поля книги, по которым выполняется поиск.
+
+    :param book: Экземпляр Book.
+    :return: Кортеж (название, автор, год).
+    """
+    return normalize(book.title), normalize(book.author), str(book.year)
+
+
+def iter_grams(text: str) -> Iterator[str]:
+    """
+    Возвращает все триграммы строки (у строки короче GRAM_SIZE символов их нет).
+
+    :param text: Нормализованная строка.
+    :return: Итератор по триграммам (могут повторяться).
+    """
+    for start in range(len(text) - GRAM_SIZE + 1):
+        yield text[start:start + GRAM_SIZE]
+
+
+class SearchIndex:
+    def __init__(self, books: Iterable = ()) -> None:
+        """
+        Инициализация экземпляра класса SearchIndex.
+
+        :param books: Книги, которые нужно сразу добавить в индекс.
+        """
+        self.postings: Dict[str, Set[int]] = {}
+        # Id триграмм, загруженные из файла индекса и еще не развернутые в множества
+        self._packed: Dict[str, Sequence[int]] = {}
+        for book in books:
+            self.add(book)
+
+    @classmethod
+    def from_packed(cls, packed: Dict[str, Sequence[int]]) -> 'SearchIndex':
+        """
+        Создает индекс по id триграмм, загруженным из файла.
+
+        :param packed: Отображение триграмма -> последовательность id книг.
+        """
+        index = cls()
+        index._packed = packed
+        return index
+
+    def _ids(self, gram: str) -> Optional[Set[int]]:
+        """
+        Возвращает множество id триграммы, при необходимости разворачивая загруженный массив.
+
+        Поиск выполняется параллельно (под блокировкой чтения), поэтому массив из _packed не удаляется:
+        читатели, одновременно развернувшие одну триграмму, через setdefault получают одно множество,
+        и ни один из них не видит триграмму отсутствующей. Массив удаляет изменение индекса (_own_ids).
+        """
+        ids = self.postings.get(gram)
+        if ids is None:
+            packed = self._packed.get(gram)
+            if packed is not None:
+                ids = self.postings.setdefault(gram, set(packed))
+        return ids
+
+    def _own_ids(self, gram: str) -> Optional[Set[int]]:
+        """Возвращает множество id триграммы для изменения: загруженный массив больше не нужен."""
+        ids = self._ids(gram)
+        self._packed.pop(gram, None)
+        return ids
+
+    def items(self) -> Iterator[Tuple[str, Union[Set[int], Sequence[int]]]]:
+        """Возвращает все триграммы с id книг (множества или еще не развернутые массивы)."""
+        # Копии списков: читатели могут в это время развернуть в postings еще одну триграмму
+        yield from list(self.postings.items())
+        for gram, ids in list(self._packed.items()):
+            if gram not in self.postings:
+                yield gram, ids
+
+    def _grams(self, book) -> Set[str]:
+        """Возвращает множество триграмм всех полей книги."""
+        grams: Set[str] = set()
+        for field in book_fields(book):
+            grams.update(iter_grams(field))
+        return grams
+
+    def add(self, book) -> None:
+        """
+        Добавляет книгу в индекс.
+
+        :param book: Экземпляр Book.
+        """
+        if self._packed:
+            for gram in self._grams(book):
+                ids = self._own_ids(gram)
+                if ids is None:
+                    ids = self.postings[gram] = set()
+                ids.add(book.id)
+            return
+        for gram in self._grams(book):
+            self.postings.setdefault(gram, set()).add(book.id)
+
+    def remove(self, book) -> None:
+        """
+        Удаляет книгу из индекса.
+
+        :param book: Экземпляр Book в том состоянии, в котором он был добавлен в индекс.
+        """
+        for gram in self._grams(book):
+            ids = self._own_ids(gram)
+            if ids is not None:
+                ids.discard(book.id)
+                if not ids:
+                    del self.postings[gram]
+
+    def search(self, search_term: str, books: Mapping[int, object]) -> Optional[Set[int]]:
+        """
+        Ищет книги, у которых название, автор или год содержат поисковый запрос.
+
+        :param search_term: Поисковый запрос.
+        :param books: Словарь книг библиотеки (id -> Book) для проверки кандидатов.
+        :return: Множество идентификаторов найденных книг или None, если запрос короче
+                 триграммы и его нужно выполнить полным перебором.
+        """
+        term = normalize(search_term)
+        if len(term) < GRAM_SIZE:
+            return None
+        if len(term) == GRAM_SIZE:
+            return set(self._ids(term) or ())
+
+        # Пересекаем множества по триграммам, начиная с самого маленького
+        grams = set(iter_grams(term))
+        postings = sorted((self._ids(gram) or set() for gram in grams), key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+
+        # Триграммы могут совпасть в разных местах строки - проверяем точное вхождение
+        return {
+            book_id for book_id in candidates
+            if any(term in field for field in book_fields(books[book_id]))
+        }
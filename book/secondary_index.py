@@ -0,0 +1,146 @@
+"""
+Модуль вторичных индексов библиотеки по автору, году и статусу.
+
+Класс SecondaryIndex поддерживает три индекса, которые обновляются вместе с библиотекой:
+- хеш-индекс по автору: автор -> множество идентификаторов книг;
+- индекс по году: год -> множество идентификаторов книг и отсортированный список лет,
+  по которому диапазон лет находится двоичным поиском;
+- индекс по статусу: статус -> множество идентификаторов книг.
+
+Поэтому запрос "все книги автора", "книги 1800-1900 годов" или "все выданные книги" выполняется
+за O(log N + k), где k - количество найденных книг, а не полным перебором библиотеки.
+
+Пример использования:
+index = SecondaryIndex()
+index.add(book)
+ids = index.by_year_range(1800, 1900)
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Set, Iterable, List, Optional
+
+
+def book_year(book) -> Optional[int]:
+    """
+    Возвращает год книги числом.
+
+    :param book: Экземпляр Book.
+    :return: Год или None, если год книги не является числом.
+    """
+    try:
+        return int(book.year)
+    except (TypeError, ValueError):
+        return None
+
+
+class SecondaryIndex:
+    def __init__(self, books: Iterable = ()) -> None:
+        """
+        Инициализация экземпляра класса SecondaryIndex.
+
+        :param books: Книги, которые нужно сразу добавить в индекс.
+        """
+        self.authors: Dict[str, Set[int]] = {}
+        self.years: Dict[int, Set[int]] = {}
+        self.sorted_years: List[int] = []
+        self.statuses: Dict[str, Set[int]] = {}
+        for book in books:
+            self.add(book)
+
+    @classmethod
+    def from_buckets(cls, authors: Dict[str, Set[int]], years: Dict[int, Set[int]],
+                     statuses: Dict[str, Set[int]]) -> 'SecondaryIndex':
+        """
+        Создает индексы из готовых корзин (например, загруженных из файла, см. book.index_file).
+
+        :param authors: Автор -> множество id книг.
+        :param years: Год -> множество id книг.
+        :param statuses: Статус -> множество id книг.
+        """
+        index = cls()
+        index.authors, index.years, index.statuses = authors, years, statuses
+        index.sorted_years = sorted(years)
+        return index
+
+    @staticmethod
+    def _discard(buckets: Dict, key, book_id: int) -> bool:
+        """Удаляет id из корзины индекса; возвращает True, если корзина стала пустой и удалена."""
+        ids = buckets.get(key)
+        if ids is None:
+            return False
+        ids.discard(book_id)
+        if ids:
+            return False
+        del buckets[key]
+        return True
+
+    def add(self, book) -> None:
+        """
+        Добавляет книгу в индексы.
+
+        :param book: Экземпляр Book.
+        """
+        self.authors.setdefault(book.author, set()).add(book.id)
+        self.statuses.setdefault(book.status, set()).add(book.id)
+        year = book_year(book)
+        if year is not None:
+            if year not in self.years:
+                self.years[year] = set()
+                insort(self.sorted_years, year)
+            self.years[year].add(book.id)
+
+    def remove(self, book) -> None:
+        """
+        Удаляет книгу из индексов.
+
+        :param book: Экземпляр Book с теми значениями полей, с которыми он был добавлен.
+        """
+        self._discard(self.authors, book.author, book.id)
+        self._discard(self.statuses, book.status, book.id)
+        year = book_year(book)
+        if year is not None and self._discard(self.years, year, book.id):
+            del self.sorted_years[bisect_left(self.sorted_years, year)]
+
+    def update_status(self, book_id: int, old_status: str, new_status: str) -> None:
+        """
+        Переносит книгу в корзину нового статуса.
+
+        :param book_id: Идентификатор книги.
+        :param old_status: Прежний статус книги.
+        :param new_status: Новый статус книги.
+        """
+        self._discard(self.statuses, old_status, book_id)
+        self.statuses.setdefault(new_status, set()).add(book_id)
+
+    def by_author(self, author: str) -> List[int]:
+        """
+        Возвращает идентификаторы книг автора (точное совпадение имени автора).
+
+        :param author: Автор.
+        :return: Идентификаторы книг по возрастанию.
+        """
+        return sorted(self.authors.get(author, ()))
+
+    def by_year_range(self, start: int, end: int) -> List[int]:
+        """
+        Возвращает идентификаторы книг, изданных с start по end год включительно.
+
+        :param start: Первый год диапазона.
+        :param end: Последний год диапазона.
+        :return: Идентификаторы книг, упорядоченные по году, а внутри года - по id.
+        """
+        first = bisect_left(self.sorted_years, start)
+        last = bisect_right(self.sorted_years, end)
+        found: List[int] = []
+        for year in self.sorted_years[first:last]:
+            found.extend(sorted(self.years[year]))
+        return found
+
+    def by_status(self, status: str) -> List[int]:
+        """
+        Возвращает идентификаторы книг с заданным статусом.
+
+        :param status: Статус книги.
+        :return: Идентификаторы книг по возрастанию.
+        """
+        return sorted(self.statuses.get(status, ()))
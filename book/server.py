@@ -0,0 +1,340 @@
+"""
+Модуль HTTP-сервиса библиотеки с ответами в формате JSON.
+
+Одна библиотека (Library) обслуживает запросы многих клиентов:
+- запросы обрабатываются пулом потоков (ThreadPoolHTTPServer);
+- чтение (поиск, вывод книг) выполняется под блокировкой для чтения (book.rwlock.RWLock),
+  поэтому поисковые запросы выполняются одновременно;
+- изменения выполняются под блокировкой для записи - по одному.
+
+Запросы:
+GET    /books?offset=0&limit=100              - страница книг по возрастанию id
+GET    /books/search?q=толстой&offset=0&limit=100 - поиск книг (страница результатов)
+GET    /books/search?q=толстй&fuzzy=1&top_k=10    - нечеткий поиск
+GET    /books/<id>                            - книга по id
+POST   /books        {"title", "author", "year"} - добавление книги
+DELETE /books/<id>                            - удаление книги
+PUT    /books/<id>/status {"status"}          - изменение статуса книги
+POST   /books/remove {"ids": [1, 2] или "10-50,77"}              - удаление нескольких книг
+POST   /books/status {"ids": [1, 2] или "10-50,77", "status"}    - изменение статуса нескольких книг
+
+Ошибки возвращаются с кодом 400 (неверные данные) или 404 (книга не найдена) в виде
+{"error": "InvalidBookIDError", "message": "..."}. Непредвиденные ошибки (например, ошибки
+хранилища) записываются в лог и возвращаются с кодом 500 и {"error": "InternalError"}.
+
+Пример использования:
+python main.py serve --port 8080 --workers 8
+curl 'http://127.0.0.1:8080/books/search?q=толстой'
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from book.book_class import Library
+from book.lexicon import LEXICON, LEXICON_LOG
+from book.rwlock import RWLock
+from book.validators import MAX_BOOK_IDS, validate_book, parse_book_ids
+from book.user_exception import (BookError, BulkOperationError, InvalidBookIDError, NotBookError,
+                                 DisplayBookError, InvalidBookIntError, NotInputError, ReadOnlyLibraryError)
+
+
+# Размер страницы GET /books, если limit не указан
+DEFAULT_PAGE_SIZE = 100
+
+# Наибольший размер тела запроса в байтах
+MAX_BODY = 1024 * 1024
+
+# Пауза фонового сохранения сервиса (секунды)
+SAVE_DELAY = 0.2
+
+Response = Tuple[int, Any]
+
+
+class LibraryService:
+    def __init__(self, library: Library) -> None:
+        """
+        Инициализация сервиса: операции над библиотекой под блокировкой читателей-писателей.
+
+        :param library: Библиотека, общая для всех запросов.
+        """
+        self.library = library
+        self.lock = RWLock()
+
+    def display_books(self, query: Dict[str, str], body: Dict[str, Any]) -> Response:
+        offset = _int_param(query, 'offset', 0)
+        limit = _int_param(query, 'limit', DEFAULT_PAGE_SIZE)
+        with self.lock.read():
+            try:
+                books = self.library.display_books(offset, limit)
+            except DisplayBookError:
+                books = []
+        return 200, [book.book_dict() for book in books]
+
+    def search_books(self, query: Dict[str, str], body: Dict[str, Any]) -> Response:
+        fuzzy = query.get('fuzzy', '') in ('1', 'true')
+        top_k = _int_param(query, 'top_k', 10)
+        offset = _int_param(query, 'offset', 0)
+        limit = _int_param(query, 'limit', DEFAULT_PAGE_SIZE)
+        with self.lock.read():
+            books = self.library.search_books(query.get('q', ''), fuzzy=fuzzy, top_k=top_k)
+        # Частые слова находят тысячи книг - клиент получает их страницами
+        return 200, [book.book_dict() for book in books[offset:offset + limit]]
+
+    def get_book(self, query: Dict[str, str], body: Dict[str, Any], book_id: str) -> Response:
+        with self.lock.read():
+            book = self.library.get_book(book_id)
+        return 200, book.book_dict()
+
+    def add_book(self, query: Dict[str, str], body: Dict[str, Any]) -> Response:
+        title, author, year = (str(body.get(key, '')).strip() for key in ('title', 'author', 'year'))
+        validate_book(title, author, year)
+        with self.lock.write():
+            book = self.library.create_book(title, author, year)
+        return 201, book.book_dict()
+
+    def remove_book(self, query: Dict[str, str], body: Dict[str, Any], book_id: str) -> Response:
+        with self.lock.write():
+            self.library.remove_book(book_id)
+        return 200, {'removed': [int(book_id)]}
+
+    def update_status(self, query: Dict[str, str], body: Dict[str, Any], book_id: str) -> Response:
+        with self.lock.write():
+            self.library.update_status(book_id, str(body.get('status', '')))
+            book = self.library.get_book(book_id)
+        return 200, book.book_dict()
+
+    def remove_books(self, query: Dict[str, str], body: Dict[str, Any]) -> Response:
+        ids = _body_ids(body)
+        with self.lock.write():
+            self.library.remove_books(ids)
+        return 200, {'removed': ids}
+
+    def update_status_many(self, query: Dict[str, str], body: Dict[str, Any]) -> Response:
+        ids = _body_ids(body)
+        status = str(body.get('status', ''))
+        with self.lock.write():
+            self.library.update_status_many(ids, status)
+        return 200, {'updated': ids, 'status': status}
+
+
+def _int_param(query: Dict[str, str], name: str, default: int) -> int:
+    """Возвращает неотрицательный целый параметр запроса."""
+    value = query.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise InvalidBookIntError(value)
+    return int(value)
+
+
+def _body_ids(body: Dict[str, Any]) -> List[int]:
+    """Возвращает id книг из тела запроса: список чисел или строку с диапазонами."""
+    ids = body.get('ids')
+    if isinstance(ids, str):
+        return parse_book_ids(ids)
+    if not ids:
+        raise NotInputError
+    if not isinstance(ids, list) or not all(isinstance(book_id, int) for book_id in ids):
+        raise InvalidBookIntError(ids)
+    if len(ids) > MAX_BOOK_IDS:
+        raise InvalidBookIntError(f'{len(ids)} id')
+    return ids
+
+
+# Маршруты: (метод HTTP, путь, метод LibraryService). Группы пути передаются в метод сервиса
+ROUTES: List[Tuple[str, 're.Pattern', str]] = [
+    ('GET', re.compile(r'/books'), 'display_books'),
+    ('GET', re.compile(r'/books/search'), 'search_books'),
+    ('GET', re.compile(r'/books/(\d+)'), 'get_book'),
+    ('POST', re.compile(r'/books'), 'add_book'),
+    ('POST', re.compile(r'/books/remove'), 'remove_books'),
+    ('POST', re.compile(r'/books/status'), 'update_status_many'),
+    ('DELETE', re.compile(r'/books/(\d+)'), 'remove_book'),
+    ('PUT', re.compile(r'/books/(\d+)/status'), 'update_status'),
+]
+
+
+def error_status(error: BookError) -> int:
+    """Возвращает код HTTP для ошибки библиотеки."""
+    if isinstance(error, (InvalidBookIDError, NotBookError)):
+        return 404
+    if isinstance(error, ReadOnlyLibraryError):
+        return 403
+    if isinstance(error, BulkOperationError) and all(isinstance(e, InvalidBookIDError) for e in error.errors):
+        return 404
+    return 400
+
+
+def error_body(error: Exception) -> Dict[str, Any]:
+    """Возвращает описание ошибки для ответа."""
+    body: Dict[str, Any] = {'error': type(error).__name__, 'message': str(error)}
+    if isinstance(error, BulkOperationError):
+        body['errors'] = [str(e) for e in error.errors]
+    return body
+
+
+class LibraryRequestHandler(BaseHTTPRequestHandler):
+    server: 'ThreadPoolHTTPServer'
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def do_PUT(self) -> None:
+        self._dispatch('PUT')
+
+    def do_DELETE(self) -> None:
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str) -> None:
+        """Находит маршрут запроса, выполняет метод сервиса и отправляет ответ JSON."""
+        url = urlsplit(self.path)
+        handler: Optional[Callable[..., Response]] = None
+        path_allowed = False
+        for route_method, pattern, name in ROUTES:
+            match = pattern.fullmatch(url.path.rstrip('/') or '/')
+            if match:
+                path_allowed = True
+                if route_method == method:
+                    handler = getattr(self.server.service, name)
+                    break
+        if handler is None:
+            self._send(405 if path_allowed else 404, {'error': 'NotFound', 'message': self.path})
+            return
+        try:
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            status, payload = handler(query, self._read_body(), *match.groups())
+        except BookError as e:
+            logging.error("%s %s %s: %s", LEXICON_LOG['error_server_request'], method, self.path, e)
+            status, payload = error_status(e), error_body(e)
+        except ValueError as e:
+            # Неверный JSON в теле запроса
+            logging.error("%s %s %s: %s", LEXICON_LOG['error_server_request'], method, self.path, e)
+            status, payload = 400, error_body(e)
+        except Exception:
+            # Ошибка хранилища или самой библиотеки: клиент получает ответ, а не оборванное соединение
+            logging.exception("%s %s %s", LEXICON_LOG['error_server_internal'], method, self.path)
+            status, payload = 500, {'error': 'InternalError', 'message': LEXICON['error_server_internal']}
+        self._send(status, payload)
+
+    def _read_body(self) -> Dict[str, Any]:
+        """Читает тело запроса в формате JSON (пустое тело - пустой словарь)."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        if length > MAX_BODY:
+            raise ValueError(f'тело запроса больше {MAX_BODY} байт')
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError('тело запроса должно быть объектом JSON')
+        return body
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Каждый запрос пишется в лог на уровне DEBUG: при нагрузке лог не растет на каждый запрос
+        logging.debug("%s %s", LEXICON_LOG['server_request'], format % args)
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    # Очередь соединений, ожидающих accept: при значении по умолчанию (5) одновременные клиенты
+    # получают отказ в соединении и повторяют его с задержкой в секунду и больше
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], service: LibraryService, workers: int = 8) -> None:
+        """
+        Инициализация HTTP-сервера, который обрабатывает запросы пулом потоков.
+
+        В отличие от ThreadingHTTPServer, поток не создается на каждый запрос: количество
+        одновременно обрабатываемых запросов ограничено workers, остальные ждут в очереди пула.
+
+        :param address: Адрес и порт (порт 0 - выбрать свободный).
+        :param service: Сервис библиотеки.
+        :param workers: Количество потоков обработки запросов.
+        """
+        super().__init__(address, LibraryRequestHandler)
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='library-http')
+
+    def process_request(self, request, client_address) -> None:
+        self.executor.submit(self._process_request_in_pool, request, client_address)
+
+    def _process_request_in_pool(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def start_server(library: Library, port: int = 8080, host: str = '127.0.0.1',
+                 workers: int = 8) -> ThreadPoolHTTPServer:
+    """
+    Запускает HTTP-сервис библиотеки в фоновом потоке.
+
+    :param library: Библиотека.
+    :param port: Порт (0 - выбрать свободный порт).
+    :param host: Адрес. По умолчанию сервис доступен только локально.
+    :param workers: Количество потоков обработки запросов.
+    :return: Запущенный сервер (остановка - server.shutdown() и server.server_close()).
+    """
+    server = ThreadPoolHTTPServer((host, port), LibraryService(library), workers)
+    thread = threading.Thread(target=server.serve_forever, name='library-server', daemon=True)
+    thread.start()
+    return server
+
+
+def serve(filename: str = 'library.json', port: int = 8080, host: str = '127.0.0.1', workers: int = 8,
+          journal: bool = False, shared: bool = False, read_only: bool = False) -> None:
+    """
+    Запускает HTTP-сервис библиотеки и обслуживает запросы до прерывания (Ctrl+C).
+
+    :param filename: Файл библиотеки.
+    :param port: Порт.
+    :param host: Адрес.
+    :param workers: Количество потоков обработки запросов.
+    :param journal: Если True, изменения дописываются в журнал.
+    :param shared: Если True, с библиотекой могут работать несколько процессов
+                   (тогда изменения сохраняются сразу, без фонового сохранения).
+    :param read_only: Если True, снимок библиотеки отображается в память только для чтения 
+                      (см. book.mapped_storage), изменяющие запросы получают код 403.
+    """
+    if read_only:
+        library = Library(filename, read_only=True)
+    else:
+        # Каталог загружается в фоне: сервис сразу принимает запросы, а книги по id читаются из файла
+        library = Library(filename, journal=journal, shared=shared,
+                          background_save=None if shared else SAVE_DELAY, background_load=True)
+    server = ThreadPoolHTTPServer((host, port), LibraryService(library), workers)
+    logging.info("%s %s:%s", LEXICON_LOG['server_start'], host, server.server_port)
+    print(f"{LEXICON['server_start']} http://{host}:{server.server_port}", flush=True)
+    try:
+        # Методы библиотеки печатают сообщения для меню - сервис их не выводит
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        library.close()
+        logging.info(LEXICON_LOG['server_stop'])
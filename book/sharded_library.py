@@ -0,0 +1,333 @@
+"""
+Модуль библиотеки, разделенной на шарды.
+
+Одна библиотека (Library) хранит все книги в одном словаре и одном файле, поэтому поиск
+выполняется на одном ядре. ShardedLibrary делит книги по id на N шардов: книга с id
+хранится в шарде id % N, в отдельном файле '<имя>.<номер шарда><расширение>'
+('library.0.json', 'library.1.json', ...). Каждым шардом владеет свой процесс - пул
+ProcessPoolExecutor из одного процесса, в котором открыта обычная Library шарда:
+- поиск и вывод книг (search_books, find_by_*, display_books) выполняются во всех шардах
+  параллельно, а результаты сливаются в порядке id;
+- добавление книги, изменение статуса, удаление и чтение книги по id выполняются только
+  в шарде, которому принадлежит id.
+
+Id новым книгам выдает ShardedLibrary (следующий после наибольшего id всех шардов), поэтому
+id уникальны во всей библиотеке. Количество шардов записывается в '<имя>.shards' и при следующем
+открытии берется из этого файла: книги нельзя переложить в другое количество шардов, не перезаписав
+файлы (см. split_library).
+
+Пример использования:
+split_library('library.json', 'catalog.json', shards=4)
+with ShardedLibrary('catalog.json') as library:
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    books = library.search_books('толстой')
+"""
+
+import heapq
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from book.atomic_file import atomic_write
+from book.book_class import Book, Library, check_page
+from book.lexicon import LEXICON, LEXICON_STEP
+from book.storage import is_jsonl, iter_book_records, write_book_records
+from book.user_exception import (DisplayBookError, InvalidBookIDError, InvalidBookIntError, NotBookError,
+                                 NotInputError)
+from book.validators import validate_book
+
+
+# Книга, передаваемая из процесса шарда: (id, название, автор, год, статус)
+BookRow = Tuple[int, str, str, Union[int, str], str]
+
+# Библиотека шарда в процессе, который им владеет (см. _open_shard)
+_library: Optional[Library] = None
+
+
+def shard_filename(filename: str, shard: int) -> str:
+    """Возвращает имя файла шарда: 'library.json', 2 -> 'library.2.json'."""
+    root, extension = os.path.splitext(filename)
+    return f'{root}.{shard}{extension}'
+
+
+def _read_shard_count(filename: str) -> Optional[int]:
+    """Читает количество шардов из '<filename>.shards' (None, если файла нет)."""
+    try:
+        with open(f'{filename}.shards', encoding='utf-8') as f:
+            return json.load(f)['shards']
+    except FileNotFoundError:
+        return None
+
+
+def _write_shard_count(filename: str, shards: int) -> None:
+    with atomic_write(f'{filename}.shards') as f:
+        json.dump({'shards': shards}, f)
+
+
+def split_library(source: str, filename: str, shards: int) -> None:
+    """
+    Делит файл библиотеки JSON на файлы шардов по id книг.
+
+    :param source: Файл библиотеки (массив JSON или JSON Lines).
+    :param filename: Имя библиотеки с шардами (файлы шардов - см. shard_filename).
+    :param shards: Количество шардов.
+    """
+    if shards < 1:
+        raise ValueError('количество шардов должно быть больше 0')
+    parts: List[List[Dict[str, Any]]] = [[] for _ in range(shards)]
+    for book_data in iter_book_records(source):
+        parts[book_data['id'] % shards].append(book_data)
+    for shard, records in enumerate(parts):
+        name = shard_filename(filename, shard)
+        with atomic_write(name) as f:
+            write_book_records(f, records, jsonl=is_jsonl(name))
+    _write_shard_count(filename, shards)
+
+
+def _open_shard(filename: str, options: Dict[str, Any]) -> None:
+    """Открывает библиотеку шарда в процессе пула (инициализатор ProcessPoolExecutor)."""
+    global _library
+    _library = Library(filename, **options)
+
+
+def _book_row(book: Book) -> BookRow:
+    # Кортеж сериализуется для передачи между процессами быстрее, чем объект Book
+    return book.id, book.title, book.author, book.year, book.status
+
+
+def _row_book(row: BookRow) -> Book:
+    book = Book(row[0], row[1], row[2], row[3])
+    book.status = row[4]
+    return book
+
+
+def _next_id() -> int:
+    return _library.next_id
+
+
+def _call(method: str, *args: Any) -> Any:
+    """Вызывает метод библиотеки шарда."""
+    return getattr(_library, method)(*args)
+
+
+def _find_rows(method: str, *args: Any) -> Optional[List[BookRow]]:
+    """
+    Вызывает метод библиотеки шарда, возвращающий список книг.
+
+    :return: Книги шарда в порядке id или None, если в шарде книг не нашлось
+             (NotBookError или DisplayBookError).
+    """
+    try:
+        books = getattr(_library, method)(*args)
+    except (NotBookError, DisplayBookError):
+        return None
+    return [_book_row(book) for book in books]
+
+
+def _create_book(book_id: int, title: str, author: str, year: Union[int, str]) -> Tuple[BookRow, int]:
+    """
+    Добавляет в шард книгу с id, выданным ShardedLibrary.
+
+    :return: Добавленная книга и отметка next_id шарда после добавления.
+    """
+    if book_id >= _library.next_id:
+        # Id между прежней отметкой шарда и book_id выданы другим шардам
+        _library.next_id = book_id + 1
+    row = _book_row(_library.create_book(title, author, year, book_id))
+    return row, _library.next_id
+
+
+def _get_book(book_id: Union[int, str]) -> BookRow:
+    return _book_row(_library.get_book(book_id))
+
+
+def _close() -> None:
+    _library.close()
+
+
+class ShardedLibrary:
+    def __init__(self, filename: str = 'library.json', shards: Optional[int] = None,
+                 **options: Any) -> None:
+        """
+        Инициализация библиотеки с шардами: запускает процесс для каждого шарда и загружает шарды параллельно.
+
+        :param filename: Имя библиотеки. Книги хранятся в файлах шардов (см. shard_filename).
+        :param shards: Количество шардов. По умолчанию - из '<filename>.shards', а для новой
+                       библиотеки - количество процессоров.
+        :param options: Параметры Library каждого шарда (journal, search_index, ...).
+        :raises ValueError: Если shards не совпадает с количеством шардов существующей библиотеки.
+        """
+        saved = _read_shard_count(filename)
+        if saved is not None and shards is not None and shards != saved:
+            raise ValueError(f'библиотека {filename} разделена на {saved} шардов, а не на {shards}')
+        if shards is None:
+            shards = saved or os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError('количество шардов должно быть больше 0')
+        if saved is None:
+            _write_shard_count(filename, shards)
+        self.filename: str = filename
+        self.shards: List[ProcessPoolExecutor] = [
+            ProcessPoolExecutor(max_workers=1, initializer=_open_shard,
+                                initargs=(shard_filename(filename, shard), options))
+            for shard in range(shards)
+        ]
+        self._lock = threading.Lock()
+        try:
+            # Первое задание каждого процесса ждет загрузки его шарда - шарды загружаются одновременно
+            self._next_id: int = max(self._fan_out(_next_id))
+        except BaseException:
+            for shard in self.shards:
+                shard.shutdown(cancel_futures=True)
+            raise
+
+    def _fan_out(self, function: Callable, *args: Any) -> List[Any]:
+        """Выполняет функцию во всех шардах параллельно и возвращает результаты в порядке шардов."""
+        futures: List[Future] = [shard.submit(function, *args) for shard in self.shards]
+        return [future.result() for future in futures]
+
+    def _owner(self, book_id: Union[int, str]) -> Tuple[int, ProcessPoolExecutor]:
+        """
+        Возвращает id книги и пул шарда, которому она принадлежит.
+
+        :raises NotInputError: Если id пустой.
+        :raises InvalidBookIntError: Если id не является числом.
+        """
+        if not book_id:
+            raise NotInputError
+        if isinstance(book_id, str) and not book_id.strip().isdigit():
+            raise InvalidBookIntError(book_id)
+        book_id = int(book_id)
+        return book_id, self.shards[book_id % len(self.shards)]
+
+    def _merged(self, method: str, *args: Any, error: type = NotBookError) -> List[Book]:
+        """
+        Выполняет метод, возвращающий список книг, во всех шардах и сливает результаты в порядке id.
+
+        :param error: Ошибка, если ни в одном шарде книг не нашлось.
+        """
+        parts = [rows for rows in self._fan_out(_find_rows, method, *args) if rows is not None]
+        if not parts:
+            raise error
+        return [_row_book(row) for row in heapq.merge(*parts)]
+
+    @property
+    def next_id(self) -> int:
+        """Следующий еще не выданный id книги."""
+        return self._next_id
+
+    def add_book(self, title: str, author: str, year: str) -> str:
+        """
+        Добавляет новую книгу в шард, которому принадлежит ее id.
+
+        :return: Сообщение об успешном добавлении книги.
+        """
+        book = self.create_book(title, author, year)
+        print(f"{LEXICON_STEP['stars']}")
+        return f"{LEXICON['add_book_true']} {book.title}\n {LEXICON_STEP['stars']}"
+
+    def create_book(self, title: str, author: str, year: Union[int, str]) -> Book:
+        """
+        Добавляет новую книгу и возвращает ее (без сообщений для меню).
+
+        Книга проверяется до выдачи id, а id книги, которую шард не добавил, выдается снова
+        (если после него других id не выдавали), поэтому ошибки не оставляют пропусков в id.
+
+        :raises NotInputError: Если одно из полей пустое.
+        :raises InvalidBookIntError: Если год не является целым числом.
+        :raises YearBookError: Если год меньше(равен) 0 или больше текущего года.
+        """
+        validate_book(title, author, str(year))
+        with self._lock:
+            book_id = self._next_id
+            self._next_id += 1
+        shard = self.shards[book_id % len(self.shards)]
+        try:
+            row, shard_next_id = shard.submit(_create_book, book_id, title, author, year).result()
+        except InvalidBookIDError:
+            # Id уже занят книгой шарда - выдавать его снова нельзя
+            raise
+        except BaseException:
+            with self._lock:
+                if self._next_id == book_id + 1:
+                    self._next_id = book_id
+            raise
+        with self._lock:
+            # Отметка не должна отставать от id, которые шард выдал сам
+            if shard_next_id > self._next_id:
+                self._next_id = shard_next_id
+        return _row_book(row)
+
+    def get_book(self, book_id: Union[int, str]) -> Book:
+        """Возвращает книгу по идентификатору (см. Library.get_book)."""
+        book_id, shard = self._owner(book_id)
+        return _row_book(shard.submit(_get_book, book_id).result())
+
+    def remove_book(self, book_id: str) -> str:
+        """Удаляет книгу из шарда, которому она принадлежит (см. Library.remove_book)."""
+        book_id, shard = self._owner(book_id)
+        return shard.submit(_call, 'remove_book', book_id).result()
+
+    def update_status(self, book_id: int, new_status: str) -> str:
+        """Обновляет статус книги в шарде, которому она принадлежит (см. Library.update_status)."""
+        if not new_status:
+            raise NotInputError
+        book_id, shard = self._owner(book_id)
+        return shard.submit(_call, 'update_status', book_id, new_status).result()
+
+    def search_books(self, search_date: str) -> List[Book]:
+        """
+        Ищет книги по подстроке названия, автора или года во всех шардах параллельно.
+
+        :raises NotInputError: Если ввод пустой.
+        :raises NotBookError: Если ни в одном шарде не найдено ни одной книги.
+        :return: Список найденных книг по возрастанию id.
+        """
+        if not search_date:
+            raise NotInputError
+        return self._merged('search_books', search_date)
+
+    def find_by_author(self, author: str) -> List[Book]:
+        """Ищет все книги автора во всех шардах (см. Library.find_by_author)."""
+        if not author:
+            raise NotInputError
+        return self._merged('find_by_author', author)
+
+    def find_by_year_range(self, start: Union[int, str], end: Union[int, str]) -> List[Book]:
+        """Ищет книги, изданные с start по end год включительно, во всех шардах (см. Library.find_by_year_range)."""
+        return self._merged('find_by_year_range', start, end)
+
+    def find_by_status(self, status: str) -> List[Book]:
+        """Ищет книги с заданным статусом во всех шардах (см. Library.find_by_status)."""
+        return self._merged('find_by_status', status)
+
+    def display_books(self, offset: int = 0, limit: Optional[int] = None) -> List[Book]:
+        """
+        Отображает книги всех шардов по возрастанию id: все или одну страницу.
+
+        Каждый шард отдает первые offset + limit своих книг, поэтому страница стоит дороже
+        по мере удаления от начала библиотеки.
+
+        :raises ValueError: Если offset или limit отрицательные.
+        :raises DisplayBookError: Если ни в одном шарде нет книг.
+        :return: Список книг страницы (пустой, если offset за концом библиотеки).
+        """
+        check_page(offset, limit)
+        end = None if limit is None else offset + limit
+        books = self._merged('display_books', 0, end, error=DisplayBookError)
+        return books[offset:end]
+
+    def close(self) -> None:
+        """Закрывает библиотеки шардов и останавливает их процессы."""
+        try:
+            self._fan_out(_close)
+        finally:
+            for shard in self.shards:
+                shard.shutdown()
+
+    def __enter__(self) -> 'ShardedLibrary':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
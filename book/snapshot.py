@@ -0,0 +1,302 @@
+"""
+Модуль двоичного снимка библиотеки - компактного формата файла для быстрой загрузки.
+
+Файл снимка состоит из трех частей:
+- заголовок (HEADER): сигнатура b'BOOKSNAP', версия формата, количество книг, количество строк,
+  размер таблицы строк и контрольная сумма CRC32 всего, что следует за заголовком;
+- таблица строк: смещения строк (uint32, на одно больше, чем строк) и сами строки в UTF-8.
+  Одинаковые строки (авторы, статусы, повторяющиеся названия) хранятся один раз;
+- записи книг фиксированной длины (RECORD): id, год и номера названия, автора и статуса
+  в таблице строк и вид года. Записи упорядочены по id.
+
+Все числа записываются в порядке байтов little-endian. Год-число хранится в записи, а год-строка
+(например, 'неизв.' или '1877' из файла JSON) - в таблице строк: тогда в поле года записи номер
+строки, а вид года равен YEAR_STRING. Так год читается из снимка того же типа, каким был записан.
+Файл пишется и читается целиком, без разбора по одной книге, а строки таблицы декодируются
+один раз, поэтому загрузка снимка быстрее разбора JSON. Снимки версии 1 (год только числом,
+без вида года) читаются по-прежнему.
+
+Формат файла библиотеки при чтении определяется по сигнатуре, при записи - по расширению
+'.snap' или по формату уже существующего файла (см. book.storage).
+
+Пример использования:
+with open('library.snap', 'wb') as f:
+    write_snapshot(f, [(1, 'Война и мир', 'Лев Толстой', 1869, 'в наличии')])
+for book_id, title, author, year, status in read_snapshot('library.snap'):
+    print(title)
+"""
+
+import itertools
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+MAGIC = b'BOOKSNAP'
+VERSION = 2
+# Сигнатура, версия, количество книг, количество строк, размер строк в байтах, CRC32
+HEADER = struct.Struct('<8sIIIII')
+# id, год, номер названия, номер автора, номер статуса, вид года
+RECORD = struct.Struct('<qiIIIB')
+# Запись снимка версии 1: без вида года
+RECORD_V1 = struct.Struct('<qiIII')
+RECORD_ID = struct.Struct('<q')
+# Виды года: число в записи или номер строки в таблице строк
+YEAR_NUMBER = 0
+YEAR_STRING = 1
+YEAR_RANGE = range(-2 ** 31, 2 ** 31)
+STRING_BOUNDS = struct.Struct('<II')
+# Количество записей, которые читаются из буфера за один раз при переборе всех записей
+RECORD_BATCH = 512
+SNAPSHOT_EXTENSIONS = ('.snap',)
+
+# Книга в снимке: (id, название, автор, год, статус)
+BookRow = Tuple[int, str, str, Union[int, str], str]
+
+
+class SnapshotError(ValueError):
+    """Ошибка, возникающая при чтении поврежденного или неподдерживаемого файла снимка."""
+
+
+def is_snapshot_name(filename: str) -> bool:
+    """Проверяет, что файл библиотеки по расширению должен храниться в формате снимка."""
+    return filename.lower().endswith(SNAPSHOT_EXTENSIONS)
+
+
+def is_snapshot_file(filename: str) -> bool:
+    """
+    Проверяет сигнатуру файла библиотеки.
+
+    :param filename: Имя файла.
+    :return: True, если файл существует и является снимком.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _uint32_array(values: Iterable[int]) -> bytes:
+    """Возвращает массив uint32 в порядке байтов little-endian."""
+    data = array('I', values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def write_snapshot(f: BinaryIO, rows: Iterable[BookRow]) -> int:
+    """
+    Записывает книги в файл снимка.
+
+    :param f: Открытый на запись двоичный файл.
+    :param rows: Книги в виде кортежей (id, название, автор, год, статус).
+    :raises ValueError: Если год книги не целое число и не строка (или число вне диапазона int32).
+    :return: Количество записанных книг.
+    """
+    strings: Dict[str, int] = {}
+    encoded: List[bytes] = []
+
+    def string_number(value: str) -> int:
+        number = strings.get(value)
+        if number is None:
+            number = strings[value] = len(encoded)
+            encoded.append(value.encode('utf-8'))
+        return number
+
+    pack = RECORD.pack
+    records: List[bytes] = []
+    for book_id, title, author, year, status in sorted(rows, key=lambda row: row[0]):
+        if isinstance(year, str):
+            year, kind = string_number(year), YEAR_STRING
+        elif isinstance(year, int) and not isinstance(year, bool) and year in YEAR_RANGE:
+            kind = YEAR_NUMBER
+        else:
+            raise ValueError(f'год книги {book_id} нельзя записать в снимок: {year!r}')
+        records.append(pack(book_id, year, string_number(title), string_number(author), string_number(status), kind))
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    body = [_uint32_array(offsets), b''.join(encoded), b''.join(records)]
+    checksum = 0
+    for part in body:
+        checksum = zlib.crc32(part, checksum)
+    f.write(HEADER.pack(MAGIC, VERSION, len(records), len(encoded), offsets[-1], checksum))
+    for part in body:
+        f.write(part)
+    return len(records)
+
+
+class Snapshot:
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Разбирает заголовок снимка, не читая книги.
+
+        :param buffer: Содержимое файла снимка (байты или отображение файла в память).
+        :raises SnapshotError: Если сигнатура, версия или размеры частей файла неверны.
+        """
+        self.buffer = memoryview(buffer)
+        try:
+            self._parse_header()
+        except SnapshotError:
+            # Буфер может быть отображением файла, которое нельзя закрыть, пока на него есть ссылки
+            self.buffer.release()
+            raise
+        # Id записей для двоичного поиска (bisect) без чтения всех записей
+        self.ids: _RecordIds = _RecordIds(self)
+
+    def _parse_header(self) -> None:
+        """Читает заголовок и проверяет размеры частей файла."""
+        if len(self.buffer) < HEADER.size:
+            raise SnapshotError('файл снимка короче заголовка')
+        magic, version, self.count, self.string_count, strings_size, self.checksum = \
+            HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise SnapshotError('нет сигнатуры снимка')
+        if version not in (1, VERSION):
+            raise SnapshotError(f'неподдерживаемая версия снимка {version}')
+        self.version = version
+        self.record_struct = RECORD if version == VERSION else RECORD_V1
+        # Начала таблицы смещений, строк и записей книг
+        self.offsets_start = HEADER.size
+        self.strings_start = self.offsets_start + 4 * (self.string_count + 1)
+        self.records_start = self.strings_start + strings_size
+        if len(self.buffer) != self.records_start + self.record_struct.size * self.count:
+            raise SnapshotError('размер файла снимка не совпадает с заголовком')
+
+    def verify(self) -> None:
+        """
+        Сверяет контрольную сумму снимка.
+
+        :raises SnapshotError: Если файл поврежден.
+        """
+        if zlib.crc32(self.buffer[HEADER.size:]) != self.checksum:
+            raise SnapshotError('контрольная сумма снимка не совпадает')
+
+    def strings(self) -> List[str]:
+        """Декодирует всю таблицу строк."""
+        offsets = array('I')
+        offsets.frombytes(self.buffer[self.offsets_start:self.strings_start])
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        data = self.buffer[self.strings_start:self.records_start].tobytes()
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def string(self, number: int) -> str:
+        """Декодирует одну строку таблицы строк."""
+        if not 0 <= number < self.string_count:
+            raise SnapshotError('номер строки в записи книги вне таблицы строк')
+        start, end = STRING_BOUNDS.unpack_from(self.buffer, self.offsets_start + 4 * number)
+        return str(self.buffer[self.strings_start + start:self.strings_start + end], 'utf-8')
+
+    def record(self, row: int) -> Tuple[int, Union[int, str], int, int, int]:
+        """
+        Возвращает запись книги без декодирования строк, кроме года-строки:
+        (id, год, номер названия, автора, статуса).
+        """
+        record = self.record_struct.unpack_from(self.buffer, self.records_start + row * self.record_struct.size)
+        if self.version == 1:
+            return record
+        book_id, year, title, author, status, kind = record
+        return book_id, self.string(year) if kind == YEAR_STRING else year, title, author, status
+
+    def row(self, row: int) -> BookRow:
+        """Возвращает книгу из строки row записей."""
+        book_id, year, title, author, status = self.record(row)
+        return book_id, self.string(title), self.string(author), year, self.string(status)
+
+    def find_row(self, book_id: int) -> Optional[int]:
+        """
+        Ищет запись книги по id двоичным поиском.
+
+        :return: Номер записи или None, если книги нет.
+        """
+        if not self.count:
+            return None
+        # Id записей возрастают, поэтому запись книги не дальше book_id - (id первой записи);
+        # если id идут подряд, книга находится сразу
+        end = min(self.count, book_id - self.ids[0] + 1)
+        if end <= 0:
+            return None
+        if self.ids[end - 1] == book_id:
+            return end - 1
+        row = bisect_left(self.ids, book_id, 0, end)
+        if row < end and self.ids[row] == book_id:
+            return row
+        return None
+
+    def _batches(self) -> Iterator[List[tuple]]:
+        """Распаковывает записи книг порциями; между порциями на буфер нет ссылок."""
+        step = RECORD_BATCH * self.record_struct.size
+        for start in range(self.records_start, len(self.buffer), step):
+            with self.buffer[start:start + step] as view:
+                batch = list(self.record_struct.iter_unpack(view))
+            yield batch
+
+    def _unpacked(self) -> Iterator[tuple]:
+        """
+        Возвращает все записи книг в том виде, в каком они записаны в файле.
+
+        В отличие от iter_unpack по всему буферу, прерванный перебор не удерживает буфер:
+        отображение файла можно закрыть, даже если итератор записей еще не удален.
+        """
+        return itertools.chain.from_iterable(self._batches())
+
+    def records(self) -> Iterator[Tuple[int, Union[int, str], int, int, int]]:
+        """Возвращает все записи книг без декодирования строк, кроме годов-строк (см. record)."""
+        records = self._unpacked()
+        if self.version == 1:
+            return records
+        string = self.string
+        return ((book_id, string(year) if kind == YEAR_STRING else year, title, author, status)
+                for book_id, year, title, author, status, kind in records)
+
+    def rows(self) -> Iterator[BookRow]:
+        """Возвращает все книги снимка в порядке возрастания id."""
+        strings = self.strings()
+        records = self._unpacked()
+        try:
+            if self.version == 1:
+                for book_id, year, title, author, status in records:
+                    yield book_id, strings[title], strings[author], year, strings[status]
+                return
+            for book_id, year, title, author, status, kind in records:
+                yield (book_id, strings[title], strings[author], strings[year] if kind == YEAR_STRING else year,
+                       strings[status])
+        except IndexError:
+            raise SnapshotError('номер строки в записи книги вне таблицы строк') from None
+
+
+class _RecordIds(Sequence):
+    """Последовательность id записей снимка, которые читаются из буфера при обращении."""
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.count
+
+    def __getitem__(self, row: int) -> int:
+        return RECORD_ID.unpack_from(self.snapshot.buffer,
+                                     self.snapshot.records_start + row * self.snapshot.record_struct.size)[0]
+
+
+def read_snapshot(filename: str, verify: bool = True) -> Iterator[BookRow]:
+    """
+    Читает книги из файла снимка одним чтением файла.
+
+    :param filename: Имя файла снимка.
+    :param verify: Сверять контрольную сумму файла.
+    :raises SnapshotError: Если файл поврежден.
+    :return: Итератор по книгам (id, название, автор, год, статус).
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    snapshot = Snapshot(data)
+    if verify:
+        snapshot.verify()
+    return snapshot.rows()
@@ -0,0 +1,315 @@
+"""
+Модуль хранилища библиотеки в базе SQLite.
+
+Книги хранятся в таблице books с индексами по автору, году и статусу. Класс SqliteBooks
+ведет себя как словарь {id: Book}, но читает и пишет книги прямо в базу: каждое добавление,
+изменение статуса и удаление книги выполняется одним запросом UPSERT или DELETE,
+поэтому при запуске библиотеки книги не загружаются в память.
+
+Состояние выдачи id (отметка next_id и свободные id, см. book.id_allocator) хранится
+в таблице meta и обновляется в той же транзакции, что и книги.
+
+Запросы по автору, диапазону лет и статусу (Library.find_by_*) выполняются по индексам таблицы.
+Для поиска используется полнотекстовая таблица FTS5 с триграммным токенизатором,
+которая находит подстроки названия, автора и года. Если FTS5 недоступен, поиск
+выполняется перебором строк таблицы.
+
+Пример использования:
+library = Library('library.db')
+migrate_json_to_sqlite('library.json', 'library.db')
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+from book.book_class import Book, Library
+from book.storage import StorageBackend
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    year INTEGER,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_author ON books(author);
+CREATE INDEX IF NOT EXISTS books_year ON books(year);
+CREATE INDEX IF NOT EXISTS books_status ON books(status);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title, author, year, content='books', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts(rowid, title, author, year) VALUES (new.id, new.title, new.author, new.year);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts(books_fts, rowid, title, author, year)
+    VALUES ('delete', old.id, old.title, old.author, old.year);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author, year ON books BEGIN
+    INSERT INTO books_fts(books_fts, rowid, title, author, year)
+    VALUES ('delete', old.id, old.title, old.author, old.year);
+    INSERT INTO books_fts(rowid, title, author, year) VALUES (new.id, new.title, new.author, new.year);
+END;
+"""
+
+UPSERT = """
+INSERT INTO books (id, title, author, year, status) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title, author = excluded.author, year = excluded.year, status = excluded.status
+"""
+
+# Годы, записанные как текст базой со столбцом year без типа, приводятся к числу,
+# иначе BETWEEN с числовыми границами их не находит
+CAST_YEARS = """
+UPDATE books SET year = CAST(year AS INTEGER)
+WHERE typeof(year) = 'text' AND trim(year) != '' AND trim(year) NOT GLOB '*[^0-9]*'
+"""
+
+# Триграммный токенизатор FTS5 находит только подстроки длиной от 3 символов
+FTS_MIN_TERM = 3
+
+
+def _year(year: Any) -> Any:
+    """Возвращает год для записи в базу: год из цифр - числом (в файле JSON он может быть строкой)."""
+    if isinstance(year, str) and year.strip().isdecimal():
+        return int(year)
+    return year
+
+
+def _book_row(book: Book) -> tuple:
+    """Возвращает параметры UPSERT для книги."""
+    return book.id, book.title, book.author, _year(book.year), book.status
+
+
+def _book_from_row(row: tuple) -> Book:
+    """Создает объект Book по строке таблицы books."""
+    book = Book(row[0], row[1], row[2], row[3])
+    book.status = row[4]
+    return book
+
+
+def _matches(row: tuple, search_term: str) -> bool:
+    """Проверяет вхождение поискового запроса в название, автора или год строки (id, title, author, year)."""
+    return search_term in row[1].lower() or search_term in row[2].lower() or search_term in str(row[3])
+
+
+class SqliteBooks(MutableMapping):
+    def __init__(self, connection: sqlite3.Connection, lock: threading.RLock) -> None:
+        """
+        Инициализация словаря книг, хранящихся в SQLite.
+
+        :param connection: Соединение с базой.
+        :param lock: Блокировка, под которой выполняются запросы к соединению.
+        """
+        self.connection = connection
+        self.lock = lock
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def __getitem__(self, book_id: int) -> Book:
+        rows = self._query('SELECT id, title, author, year, status FROM books WHERE id = ?', (book_id,))
+        if not rows:
+            raise KeyError(book_id)
+        return _book_from_row(rows[0])
+
+    def __setitem__(self, book_id: int, book: Book) -> None:
+        self._query(UPSERT, (book_id, *_book_row(book)[1:]))
+
+    def __delitem__(self, book_id: int) -> None:
+        with self.lock:
+            cursor = self.connection.execute('DELETE FROM books WHERE id = ?', (book_id,))
+        if not cursor.rowcount:
+            raise KeyError(book_id)
+
+    def __contains__(self, book_id: object) -> bool:
+        return bool(self._query('SELECT 1 FROM books WHERE id = ?', (book_id,)))
+
+    def __iter__(self) -> Iterator[int]:
+        return (row[0] for row in self._query('SELECT id FROM books ORDER BY id'))
+
+    def __len__(self) -> int:
+        return self._query('SELECT COUNT(*) FROM books')[0][0]
+
+    def values(self) -> Iterator[Book]:
+        """Возвращает книги в порядке возрастания id, читая таблицу курсором."""
+        with self.lock:
+            cursor = self.connection.execute('SELECT id, title, author, year, status FROM books ORDER BY id')
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                yield _book_from_row(row)
+
+    def page(self, offset: int, limit: int) -> List[Book]:
+        """Возвращает limit книг в порядке возрастания id, пропустив первые offset книг."""
+        rows = self._query('SELECT id, title, author, year, status FROM books ORDER BY id LIMIT ? OFFSET ?',
+                           (limit, offset))
+        return [_book_from_row(row) for row in rows]
+
+
+class SqliteStorage(StorageBackend):
+    native_search = True
+
+    def __init__(self, filename: str) -> None:
+        """
+        Инициализация хранилища в базе SQLite.
+
+        :param filename: Имя файла базы.
+        """
+        self.filename: str = filename
+        self.lock = threading.RLock()
+        # Ожидание блокировки базы другими процессами - до 30 секунд
+        self.connection = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.fts: bool = True
+        except sqlite3.OperationalError:
+            # SQLite собран без FTS5 или без триграммного токенизатора
+            self.fts = False
+        self._cast_years()
+        self.connection.commit()
+        self.books = SqliteBooks(self.connection, self.lock)
+
+    def _cast_years(self) -> None:
+        """Приводит текстовые годы к числу в базе, созданной со столбцом year без типа (один раз)."""
+        columns = {row[1]: row[2] for row in self.connection.execute('PRAGMA table_info(books)')}
+        if columns.get('year', '').upper() == 'INTEGER':
+            return
+        if self.connection.execute("SELECT 1 FROM meta WHERE key = 'years_cast'").fetchone():
+            return
+        self.connection.execute(CAST_YEARS)
+        self.connection.execute("INSERT INTO meta (key, value) VALUES ('years_cast', '1')")
+
+    def open_books(self) -> SqliteBooks:
+        return self.books
+
+    def max_id(self) -> Optional[int]:
+        with self.lock:
+            return self.connection.execute('SELECT MAX(id) FROM books').fetchone()[0]
+
+    def data_version(self) -> int:
+        """Возвращает PRAGMA data_version: она меняется после фиксации транзакций других соединений."""
+        with self.lock:
+            return self.connection.execute('PRAGMA data_version').fetchone()[0]
+
+    def _read_ids(self) -> Optional[Dict[str, Any]]:
+        """Читает состояние выдачи id из таблицы meta."""
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'ids'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_ids(self, library) -> None:
+        """Записывает состояние выдачи id в таблицу meta (в текущей транзакции)."""
+        with self.lock:
+            self.connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('ids', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (json.dumps(library.ids.state()),))
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        """Возвращает состояние выдачи id, сохраненное в базе (книги в память не загружаются)."""
+        state = self._read_ids()
+        if state is not None:
+            yield {'op': 'ids', **state}
+
+    def save(self, books: MutableMapping) -> None:
+        """Сохраняет книги одной транзакцией (книги самого хранилища уже записаны в базу)."""
+        with self.lock:
+            if books is not self.books:
+                self.connection.executemany(
+                    UPSERT, (_book_row(book) for book in books.values()))
+            self.connection.commit()
+
+    def persist(self, library, records: List[Dict[str, Any]]) -> None:
+        """
+        Записывает состояние выдачи id и фиксирует транзакцию: книги уже записаны в базу
+        через SqliteBooks.
+        """
+        with self.lock:
+            self._write_ids(library)
+            self.connection.commit()
+
+    @contextmanager
+    def transaction(self, library) -> Iterator[None]:
+        """
+        Выполняет изменение в транзакции BEGIN IMMEDIATE: база блокируется на запись для других 
+        процессов, а выдача id восстанавливается по базе, а не по состоянию этого процесса.
+        """
+        with self.lock:
+            if self.connection.in_transaction:
+                yield
+                return
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                state = self._read_ids()
+                if state is not None:
+                    library.ids.restore(state)
+                library.ids.advance((self.max_id() or 0) + 1)
+                yield
+            except BaseException:
+                self.connection.rollback()
+                raise
+            self.connection.commit()
+
+    def search(self, search_term: str) -> List[int]:
+        with self.lock:
+            if self.fts and len(search_term) >= FTS_MIN_TERM:
+                phrase = '"' + search_term.replace('"', '""') + '"'
+                rows = self.connection.execute(
+                    'SELECT b.id, b.title, b.author, b.year FROM books_fts f JOIN books b ON b.id = f.rowid '
+                    'WHERE books_fts MATCH ? ORDER BY b.id', (phrase,)).fetchall()
+            else:
+                rows = self.connection.execute('SELECT id, title, author, year FROM books ORDER BY id').fetchall()
+        # Регистр в SQLite и Python сворачивается по-разному - проверяем вхождение так же, как Library
+        return [row[0] for row in rows if _matches(row, search_term)]
+
+    def _ids(self, sql: str, params: tuple) -> List[int]:
+        with self.lock:
+            return [row[0] for row in self.connection.execute(sql, params)]
+
+    def find_by_author(self, author: str) -> List[int]:
+        return self._ids('SELECT id FROM books WHERE author = ? ORDER BY id', (author,))
+
+    def find_by_year_range(self, start: int, end: int) -> List[int]:
+        return self._ids('SELECT id FROM books WHERE year BETWEEN ? AND ? ORDER BY year, id', (start, end))
+
+    def find_by_status(self, status: str) -> List[int]:
+        return self._ids('SELECT id FROM books WHERE status = ? ORDER BY id', (status,))
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+def migrate_json_to_sqlite(json_filename: str, db_filename: str) -> int:
+    """
+    Переносит библиотеку из файла JSON (с учетом журнала изменений) в базу SQLite.
+
+    :param json_filename: Файл библиотеки JSON.
+    :param db_filename: Файл базы SQLite.
+    :return: Количество перенесенных книг.
+    """
+    # Индексы и кэш поиска для переноса не нужны; библиотека закрывается, освобождая файл
+    with Library(json_filename, search_index=False, secondary_index=False, search_cache=0) as source:
+        storage = SqliteStorage(db_filename)
+        try:
+            storage.save(source.books)
+            return len(storage.books)
+        finally:
+            storage.close()
@@ -0,0 +1,710 @@
+"""
+Модуль хранилищ библиотеки и потокового чтения и записи файла библиотеки.
+
+Library сохраняет книги через хранилище (наследник StorageBackend). Хранилище по умолчанию - 
+JsonStorage, файл JSON с необязательным журналом изменений. Для файлов '.db'/'.sqlite' 
+используется SqliteStorage (модуль book.sqlite_storage).
+
+Файл библиотеки может храниться в трех форматах:
+- JSON-массив объектов книг (формат по умолчанию, 'library.json');
+- JSON Lines - по одному объекту книги в строке (файл с расширением '.jsonl');
+- двоичный снимок (файл с расширением '.snap', см. модуль book.snapshot).
+
+Чтение JSON выполняется потоково: файл читается блоками, и каждый элемент массива (или строка)
+разбирается отдельно, поэтому в памяти не создается список всех словарей книг.
+Формат при чтении определяется по первым байтам файла, при записи - по расширению файла
+(файл, который уже является снимком, остается снимком).
+Для библиотеки с отложенной загрузкой рядом с файлом JSON при сохранении записывается индекс
+смещений книг '<файл>.idx' (см. book.offset_index), по которому книга читается без загрузки
+библиотеки (read_book).
+Поисковый и вторичные индексы библиотеки хранятся в '<файл>.indexes' (см. book.index_file).
+
+Пример использования:
+for book_data in iter_book_records('library.json'):
+    print(book_data['title'])
+"""
+
+import json
+import mmap
+import os
+import textwrap
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Iterable, TextIO, List, Optional, MutableMapping
+from book.journal import Journal
+from book.locking import FileLock, read_meta, write_meta
+from book.atomic_file import atomic_write
+from book.index_file import DumpedIndexes, LoadedIndexes, dump_indexes, read_indexes, read_stamp, write_indexes
+from book.offset_index import OffsetIndex, OffsetIndexBuilder, read_record_at
+from book.snapshot import Snapshot, is_snapshot_file, is_snapshot_name, read_snapshot, write_snapshot
+
+
+# Размер блока, которым читается файл библиотеки
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def is_jsonl(filename: str) -> bool:
+    """
+    Проверяет, хранится ли библиотека в формате JSON Lines.
+
+    :param filename: Имя файла библиотеки.
+    :return: True для файлов с расширением '.jsonl'.
+    """
+    return filename.lower().endswith('.jsonl')
+
+
+def _skip_whitespace(f: TextIO, buffer: str, pos: int, chunk_size: int):
+    """Пропускает пробельные символы, при необходимости дочитывая файл."""
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            return buffer, pos
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return '', 0
+        buffer, pos = chunk, 0
+
+
+def iter_json_array(f: TextIO, buffer: str = '', chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Потоково разбирает JSON-массив и возвращает его элементы по одному.
+
+    :param f: Открытый текстовый файл.
+    :param buffer: Уже прочитанное начало файла.
+    :param chunk_size: Размер блока чтения.
+    :raises json.JSONDecodeError: Если файл не является корректным JSON-массивом.
+    :return: Итератор по элементам массива.
+    """
+    buffer, pos = _skip_whitespace(f, buffer, 0, chunk_size)
+    if not buffer or buffer[pos] != '[':
+        raise json.JSONDecodeError('Expecting array', buffer, pos)
+    pos += 1
+    # empty - еще не прочитан ни один элемент, need_comma - ожидается ',' или ']' после элемента
+    empty = True
+    need_comma = False
+    eof = False
+    while True:
+        buffer, pos = _skip_whitespace(f, buffer, pos, chunk_size)
+        if not buffer:
+            raise json.JSONDecodeError('Unterminated array', buffer, pos)
+        if need_comma:
+            if buffer[pos] == ']':
+                return
+            if buffer[pos] != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            need_comma = False
+            buffer, pos = _skip_whitespace(f, buffer, pos + 1, chunk_size)
+            if not buffer:
+                raise json.JSONDecodeError('Unterminated array', buffer, pos)
+        elif empty and buffer[pos] == ']':
+            return
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+            # Число на границе блока могло быть прочитано не полностью
+            if end == len(buffer) and not eof:
+                raise json.JSONDecodeError('Incomplete value', buffer, end)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        empty = False
+        need_comma = True
+        eof = False
+        pos = end
+        yield item
+
+
+def iter_json_lines(f: TextIO, buffer: str = '') -> Iterator[Dict[str, Any]]:
+    """
+    Разбирает файл в формате JSON Lines и возвращает объекты по одному.
+
+    :param f: Открытый текстовый файл.
+    :param buffer: Уже прочитанное начало файла.
+    :raises json.JSONDecodeError: Если строка файла не является корректным JSON.
+    :return: Итератор по объектам файла.
+    """
+    lines = buffer.split('\n')
+    # Последняя часть блока может быть неполной строкой - дочитываем ее из файла
+    lines[-1] += f.readline()
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_book_records(filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Потоково читает словари книг из файла библиотеки любого поддерживаемого формата.
+
+    :param filename: Имя файла библиотеки.
+    :param chunk_size: Размер блока чтения.
+    :raises json.JSONDecodeError: Если файл поврежден.
+    :raises SnapshotError: Если поврежден файл снимка.
+    :return: Итератор по словарям книг.
+    """
+    if is_snapshot_file(filename):
+        for book_id, title, author, year, status in read_snapshot(filename):
+            yield {'id': book_id, 'title': title, 'author': author, 'year': year, 'status': status}
+        return
+    with open(filename, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        if buffer.lstrip(_WHITESPACE).startswith('['):
+            yield from iter_json_array(f, buffer, chunk_size)
+        elif buffer.strip():
+            yield from iter_json_lines(f, buffer)
+        else:
+            raise json.JSONDecodeError('Expecting value', buffer, 0)
+
+
+def _byte_length(text: str) -> int:
+    """Возвращает длину строки в байтах UTF-8."""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def write_book_records(f: TextIO, records: Iterable[Dict[str, Any]], jsonl: bool = False,
+                       index: Optional[OffsetIndexBuilder] = None) -> None:
+    """
+    Потоково записывает словари книг в файл.
+
+    JSON-массив записывается в том же виде, что и json.dump(..., indent=4).
+
+    :param f: Открытый на запись текстовый файл.
+    :param records: Словари книг.
+    :param jsonl: Если True, файл записывается в формате JSON Lines.
+    :param index: Если задан, в него добавляются смещения объектов книг в байтах (см. book.offset_index).
+    """
+    position = 0
+    if jsonl:
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False) + '\n'
+            f.write(line)
+            if index is not None:
+                index.add(record['id'], position)
+                position += _byte_length(line)
+        return
+    separator = '[\n'
+    for record in records:
+        text = textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), ' ' * 4)
+        f.write(separator)
+        f.write(text)
+        if index is not None:
+            position += len(separator)
+            index.add(record['id'], position)
+            position += _byte_length(text)
+        separator = ',\n'
+    f.write('\n]' if separator != '[\n' else '[]')
+
+
+class StorageBackend:
+    """
+    Базовый класс хранилища библиотеки.
+
+    Изменения библиотеки передаются в хранилище в виде записей того же формата, 
+    что и записи журнала (см. модуль book.journal).
+    """
+
+    # True, если хранилище само выполняет поиск книг (Library не строит свой индекс)
+    native_search: bool = False
+
+    def open_books(self) -> Optional[MutableMapping]:
+        """
+        Возвращает словарь книг, который хранилище ведет само.
+
+        :return: Отображение {id: Book} или None, если книги нужно загрузить в память через load.
+        """
+        return None
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        """
+        Возвращает записи, из которых восстанавливается состояние библиотеки в памяти.
+
+        :return: Итератор по записям изменений.
+        """
+        return iter(())
+
+    def max_id(self) -> Optional[int]:
+        """Возвращает наибольший id книги в хранилище, если хранилище знает его без загрузки книг."""
+        return None
+
+    def data_version(self) -> Optional[int]:
+        """
+        Возвращает версию данных, которая меняется, когда хранилище изменяют другие процессы.
+
+        По версии Library решает, нужно ли перестроить индекс нечеткого поиска. Хранилища, 
+        изменения которых подтягиваются через refresh, возвращают None: при refresh 
+        записи других процессов проигрываются в библиотеке вместе с индексами.
+
+        :return: Версия данных или None, если хранилище не отслеживает чужие изменения.
+        """
+        return None
+
+    def read_book(self, book_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Читает одну книгу прямо из хранилища, не загружая библиотеку.
+
+        :param book_id: Id книги.
+        :raises KeyError: Если книги с таким id в хранилище точно нет.
+        :return: Словарь книги или None, если хранилище не может прочитать книгу отдельно
+                 (тогда книгу ищут в загруженной библиотеке).
+        """
+        return None
+
+    def read_indexes(self) -> Optional[LoadedIndexes]:
+        """
+        Читает сохраненные индексы библиотеки, если они относятся к текущей версии хранилища.
+
+        Вызывается перед load. Если индексы возвращены, load передает записи в том же порядке, 
+        но после записей, уже учтенных в индексах, добавляет запись {'op': 'indexed'}: 
+        начиная с нее записи применяются и к индексам.
+
+        :return: Отметка версии и индексы (см. book.index_file) или None, если индексы нужно построить.
+        """
+        return None
+
+    def save_indexes(self, library) -> None:
+        """
+        Сохраняет индексы библиотеки, чтобы при следующей загрузке не строить их заново.
+
+        :param library: Экземпляр Library, все изменения которого уже сохранены.
+        """
+
+    def prepare_save(self, library) -> None:
+        """
+        Готовит хранилище к сохранению снимка библиотеки.
+
+        Вызывается под блокировкой библиотеки в момент, когда фиксируется набор сохраняемых книг;
+        сама запись (save) может выполняться уже после снятия блокировки.
+
+        :param library: Экземпляр Library, снимок которого будет сохранен.
+        """
+
+    def save(self, books: MutableMapping) -> None:
+        """
+        Сохраняет все книги библиотеки.
+
+        :param books: Словарь книг библиотеки {id: Book}.
+        """
+        raise NotImplementedError
+
+    def persist(self, library, records: List[Dict[str, Any]]) -> None:
+        """
+        Сохраняет изменения библиотеки.
+
+        :param library: Экземпляр Library, к которому уже применены изменения.
+        :param records: Записи об изменениях.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self, library) -> Iterator[None]:
+        """
+        Выполняет изменение библиотеки как одну транзакцию хранилища.
+
+        Хранилища, доступные нескольким процессам, захватывают блокировку, подтягивают
+        изменения других процессов и согласуют следующий id до выполнения изменения.
+
+        :param library: Экземпляр Library, который изменяется.
+        """
+        yield
+
+    def refresh(self, library) -> None:
+        """
+        Подтягивает в библиотеку изменения, сделанные другими процессами.
+
+        :param library: Экземпляр Library.
+        """
+
+    def search(self, search_term: str) -> Optional[List[int]]:
+        """
+        Ищет книги средствами хранилища.
+
+        :param search_term: Поисковый запрос в нижнем регистре.
+        :return: Список id найденных книг или None, если хранилище не умеет искать.
+        """
+        return None
+
+    def find_by_author(self, author: str) -> Optional[List[int]]:
+        """
+        Ищет книги автора по индексу хранилища.
+
+        :param author: Автор (точное совпадение).
+        :return: Список id по возрастанию или None, если у хранилища нет своих индексов.
+        """
+        return None
+
+    def find_by_year_range(self, start: int, end: int) -> Optional[List[int]]:
+        """
+        Ищет книги, изданные с start по end год включительно, по индексу хранилища.
+
+        :return: Список id, упорядоченный по году и id, или None, если у хранилища нет своих индексов.
+        """
+        return None
+
+    def find_by_status(self, status: str) -> Optional[List[int]]:
+        """
+        Ищет книги с заданным статусом по индексу хранилища.
+
+        :return: Список id по возрастанию или None, если у хранилища нет своих индексов.
+        """
+        return None
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+
+
+class JsonStorage(StorageBackend):
+    def __init__(self, filename: str, journal: bool = False, compact_threshold: int = 1000,
+                 compact_bytes: int = 64 * 1024 * 1024, shared: bool = False, backups: int = 0,
+                 offset_index: bool = False, journal_fsync: bool = True) -> None:
+        """
+        Инициализация хранилища в файле JSON.
+
+        :param filename: Имя файла библиотеки ('.json', '.jsonl' или '.snap').
+        :param journal: Если True, изменения дописываются в журнал '<filename>.journal'.
+        :param compact_threshold: Количество записей в журнале, после которого журнал сворачивается.
+        :param compact_bytes: Размер журнала в байтах, после которого журнал сворачивается.
+        :param shared: Если True, файл библиотеки могут одновременно изменять несколько процессов:
+                       изменения выполняются под блокировкой '<filename>.lock', а версия библиотеки
+                       хранится в '<filename>.meta' (см. модуль book.locking).
+        :param backups: Количество хранимых предыдущих версий файла ('<filename>.1', '<filename>.2', ...).
+        :param offset_index: Если True, при сохранении файла JSON записывается индекс смещений книг
+                             '<filename>.idx' для чтения книги без загрузки библиотеки (см. read_book).
+        :param journal_fsync: Если True, записи журнала сбрасываются на диск при каждом изменении
+                              (см. book.journal).
+        """
+        self.filename: str = filename
+        self.use_journal: bool = journal
+        self.compact_threshold: int = compact_threshold
+        self.compact_bytes: int = compact_bytes
+        self.journal: Journal = Journal(f'{filename}.journal', fsync=journal_fsync)
+        self.shared: bool = shared
+        self.backups: int = backups
+        self.lock: FileLock = FileLock(f'{filename}.lock')
+        self.meta_filename: str = f'{filename}.meta'
+        # Индекс смещений книг в файле JSON (см. book.offset_index), читается при первом read_book
+        self.offset_index: bool = offset_index
+        self.index_filename: str = f'{filename}.idx'
+        self._offsets: Optional[OffsetIndex] = None
+        self._offsets_stamp: Optional[List[int]] = None
+        # Файл поискового и вторичных индексов (см. book.index_file) и отметка версии библиотеки,
+        # к которой относятся индексы в файле: {'file': [size, mtime_ns], 'journal': позиция в журнале}
+        self.indexes_filename: str = f'{filename}.indexes'
+        self._indexes_stamp: Optional[Dict[str, Any]] = None
+        # Позиция в журнале, до которой записи учтены в загруженных индексах (см. read_indexes)
+        self._indexed_offset: Optional[int] = None
+        # Индексы на момент снимка, который сохраняется в режиме журнала (см. prepare_save)
+        self._dumped_indexes: Optional[DumpedIndexes] = None
+        # Версия библиотеки и номер снимка, которые сейчас загружены в память
+        self.generation: int = 0
+        self.snapshot: int = 0
+        # Состояние выдачи id на момент снимка, который сохраняется (см. prepare_save)
+        self._ids_state: Optional[Dict[str, Any]] = None
+        # Размер и время изменения файла библиотеки, к которому относятся метаданные
+        self._stamp: Optional[List[int]] = None
+
+    def _read(self) -> Iterator[Dict[str, Any]]:
+        """
+        Возвращает книги из файла библиотеки, а затем записи журнала изменений.
+
+        Если загружены сохраненные индексы (read_indexes), после записей, учтенных в индексах, 
+        передается запись {'op': 'indexed'}.
+        """
+        indexed, self._indexed_offset = self._indexed_offset, None
+        if is_snapshot_file(self.filename):
+            # Книги снимка передаются одной записью, без промежуточных словарей книг
+            yield {'op': 'books', 'rows': read_snapshot(self.filename)}
+        elif os.path.exists(self.filename):
+            # Книги читаются из файла потоково, по одной, без промежуточного списка словарей
+            for book_data in iter_book_records(self.filename):
+                yield {'op': 'add', 'book': book_data}
+        if indexed is not None and indexed <= 0:
+            yield {'op': 'indexed'}
+            indexed = None
+        for record in self.journal.replay():
+            yield record
+            if indexed is not None and self.journal.offset >= indexed:
+                yield {'op': 'indexed'}
+                indexed = None
+        if indexed is not None:
+            yield {'op': 'indexed'}
+
+    def _indexes_version(self) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает отметку текущей версии библиотеки для файла индексов: размер и время изменения
+        файла библиотеки (None, если файла еще нет - все книги в журнале) и размер журнала.
+        """
+        if os.path.exists(self.journal.previous_filename):
+            # Пока свертка журнала не завершена, часть изменений есть только в отложенном журнале
+            return None
+        stamp, journal_size = self._file_stamp(), self.journal.size()
+        if stamp is None and not journal_size:
+            # Библиотека еще не сохранялась - индексировать нечего
+            return None
+        return {'file': stamp, 'journal': journal_size}
+
+    def _file_stamp(self) -> Optional[List[int]]:
+        """Возвращает размер и время изменения файла библиотеки (None, если файла нет)."""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        """
+        Читает метаданные библиотеки.
+
+        :return: Метаданные или None, если файла метаданных нет, он поврежден или относится
+                 к другой версии файла библиотеки (файл изменили, не обновив метаданные).
+        """
+        if not os.path.exists(self.meta_filename):
+            return None
+        try:
+            meta = read_meta(self.meta_filename)
+        except (OSError, ValueError, TypeError):
+            return None
+        if not isinstance(meta, dict) or 'next_id' not in meta or meta.get('file') != self._file_stamp():
+            return None
+        return meta
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        """
+        Возвращает состояние выдачи id из метаданных, затем книги файла и записи журнала.
+
+        Книги и записи журнала, сделанные после сохранения метаданных, только поднимают отметку next_id.
+        """
+        if not self.shared:
+            meta = self._read_meta()
+            if meta is not None:
+                self._stamp = meta['file']
+                yield {'op': 'ids', 'next_id': meta['next_id'], 'free_ids': meta.get('free_ids', [])}
+            yield from self._read()
+            return
+        with self.lock:
+            meta = read_meta(self.meta_filename)
+            self._stamp = meta.get('file')
+            yield {'op': 'ids', 'next_id': meta['next_id'], 'free_ids': meta.get('free_ids', [])}
+            yield from self._read()
+            self.generation, self.snapshot = meta['generation'], meta['snapshot']
+
+    def refresh(self, library) -> None:
+        """
+        Если другой процесс изменил библиотеку, подтягивает его изменения: в режиме журнала
+        дочитываются только новые записи журнала, иначе библиотека загружается заново.
+        """
+        if not self.shared:
+            return
+        with self.lock:
+            meta = read_meta(self.meta_filename)
+            if meta['generation'] == self.generation:
+                return
+            if self.use_journal and meta['snapshot'] == self.snapshot:
+                for record in self.journal.replay(self.journal.offset):
+                    library._apply_record(record)
+                self.generation = meta['generation']
+                library.ids.restore(meta)
+            else:
+                library.reload()
+
+    def read_indexes(self) -> Optional[LoadedIndexes]:
+        """
+        Читает индексы, сохраненные для текущего файла библиотеки.
+
+        Индексы подходят, если файл библиотеки не менялся после их сохранения, а журнал только 
+        дописывался: записи журнала после сохраненной позиции применяются к индексам при загрузке.
+        Библиотека, которую меняют другие процессы, строит индексы заново.
+        """
+        self._indexed_offset = None
+        if self.shared or not os.path.exists(self.indexes_filename):
+            return None
+        version = self._indexes_version()
+        stamp = read_stamp(self.indexes_filename)
+        if version is None or not isinstance(stamp, dict) or stamp.get('file') != version['file'] \
+                or not isinstance(stamp.get('journal'), int) or stamp['journal'] > version['journal']:
+            return None
+        loaded = read_indexes(self.indexes_filename)
+        if loaded is None or loaded[0] != stamp:
+            return None
+        self._indexes_stamp = stamp
+        self._indexed_offset = stamp['journal']
+        return loaded
+
+    def save_indexes(self, library) -> None:
+        """Записывает индексы, если файл индексов не относится к текущей версии библиотеки."""
+        if self.shared:
+            return
+        version = self._indexes_version()
+        if version is None or version == self._indexes_stamp:
+            return
+        dumped = dump_indexes(library.index, library.secondary_index)
+        if dumped is not None:
+            write_indexes(self.indexes_filename, version, dumped)
+            self._indexes_stamp = version
+
+    def read_book(self, book_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Читает книгу из снимка по id или из файла JSON по индексу смещений.
+
+        Книга не читается отдельно, если у библиотеки есть журнал изменений (запись журнала может 
+        изменить книгу), если библиотеку изменяют другие процессы или если индекс смещений устарел.
+        """
+        if self.shared or self.journal.size() or os.path.exists(self.journal.previous_filename):
+            return None
+        if is_snapshot_file(self.filename):
+            with open(self.filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                snapshot = Snapshot(mapping)
+                try:
+                    row = snapshot.find_row(book_id)
+                    if row is None:
+                        raise KeyError(book_id)
+                    book_id, title, author, year, status = snapshot.row(row)
+                finally:
+                    snapshot.buffer.release()
+            return {'id': book_id, 'title': title, 'author': author, 'year': year, 'status': status}
+        stamp = self._file_stamp()
+        if self._offsets is None or self._offsets_stamp != stamp:
+            self._offsets, self._offsets_stamp = OffsetIndex.open(self.index_filename, stamp), stamp
+        if self._offsets is None:
+            return None
+        offset = self._offsets.find(book_id)
+        if offset is None:
+            raise KeyError(book_id)
+        return read_record_at(self.filename, offset)
+
+    @contextmanager
+    def transaction(self, library) -> Iterator[None]:
+        """Под блокировкой файла подтягивает чужие изменения, а после изменения увеличивает версию."""
+        if not self.shared or self.lock.locked:
+            yield
+            return
+        with self.lock:
+            self.refresh(library)
+            yield
+            self.generation += 1
+            write_meta(self.meta_filename, {
+                'generation': self.generation, 'snapshot': self.snapshot, 'file': self._stamp,
+                **library.ids.state()})
+
+    def prepare_save(self, library) -> None:
+        """
+        Откладывает записи журнала, которые войдут в сохраняемый снимок (см. Journal.rotate),
+        и запоминает состояние выдачи id (а в режиме журнала - и индексы) на момент снимка.
+        """
+        self.journal.rotate()
+        self._ids_state = library.ids.state()
+        if self.use_journal and not self.shared:
+            # В режиме журнала файл сохраняется редко (при свертке) - вместе с ним сохраняются индексы
+            self._dumped_indexes = dump_indexes(library.index, library.secondary_index)
+
+    def save(self, books: MutableMapping) -> None:
+        """
+        Записывает файл библиотеки атомарно: во временный файл с fsync и затем os.replace, 
+        поэтому при сбое во время записи остается прежняя версия файла.
+        """
+        index: Optional[OffsetIndexBuilder] = None
+        if is_snapshot_name(self.filename) or is_snapshot_file(self.filename):
+            with atomic_write(self.filename, mode='wb', backups=self.backups) as f:
+                write_snapshot(f, ((book.id, book.title, book.author, book.year, book.status)
+                                   for book in books.values()))
+        else:
+            # Смещения считаются в байтах записанного текста - при замене '\n' на '\r\n' они неверны
+            if self.offset_index and os.linesep == '\n':
+                index = OffsetIndexBuilder()
+            with atomic_write(self.filename, backups=self.backups) as f:
+                records = (book.book_dict() for book in books.values())
+                write_book_records(f, records, jsonl=is_jsonl(self.filename), index=index)
+        # Все отложенные изменения из журнала теперь есть в файле библиотеки
+        self.journal.drop_previous()
+        self.snapshot += 1
+        self._stamp = self._file_stamp()
+        if index is not None and self._stamp is not None:
+            index.write(self.index_filename, self._stamp)
+        else:
+            # Индекс смещений от прежней версии файла уже не подходит к нему
+            _remove_file(self.index_filename)
+        dumped, self._dumped_indexes = self._dumped_indexes, None
+        if dumped is not None and self._stamp is not None:
+            # Записи, сделанные во время сохранения, уже в новом журнале - индексы учитывают его с начала
+            stamp = {'file': self._stamp, 'journal': 0}
+            write_indexes(self.indexes_filename, stamp, dumped)
+            self._indexes_stamp = stamp
+        if self._ids_state is None:
+            return
+        if self.shared or self._ids_state['free_ids'] or self._ids_state['next_id'] != max(books, default=0) + 1:
+            # Метаданные пишутся после файла: если запись прервется, метаданные не совпадут
+            # с файлом и при загрузке отметка next_id будет вычислена по книгам файла
+            write_meta(self.meta_filename, {
+                'generation': self.generation, 'snapshot': self.snapshot, 'file': self._stamp,
+                **self._ids_state})
+        else:
+            # Отметка next_id вычисляется по книгам файла, а свободных id нет - метаданные не нужны
+            _remove_file(self.meta_filename)
+
+    def persist(self, library, records: List[Dict[str, Any]]) -> None:
+        """
+        В режиме журнала дописывает записи в журнал и при превышении порога сворачивает журнал.
+        Без журнала файл библиотеки перезаписывается целиком.
+        """
+        if not self.use_journal:
+            library.request_save()
+            return
+        self.journal.append_many(records)
+        if self.journal.records >= self.compact_threshold or self.journal.size() >= self.compact_bytes:
+            library.compact()
+
+
+def _remove_file(filename: str) -> None:
+    """Удаляет файл, если он есть."""
+    if os.path.exists(filename):
+        os.remove(filename)
+
+
+def convert_library(source: str, target: str) -> int:
+    """
+    Переводит библиотеку из одного формата файла в другой (JSON, JSON Lines или двоичный снимок).
+
+    Исходный файл читается в любом формате вместе с журналом изменений,
+    формат нового файла определяется по его расширению.
+
+    :param source: Файл исходной библиотеки.
+    :param target: Файл новой библиотеки.
+    :return: Количество перенесенных книг.
+    """
+    from book.book_class import Library
+    with Library(source, search_index=False, secondary_index=False, search_cache=0) as library:
+        books = library.books.values()
+        if is_snapshot_name(target):
+            with atomic_write(target, mode='wb') as f:
+                return write_snapshot(f, ((book.id, book.title, book.author, book.year, book.status)
+                                          for book in books))
+        with atomic_write(target) as f:
+            write_book_records(f, (book.book_dict() for book in books), jsonl=is_jsonl(target))
+        return len(library.books)
+
+
+def open_storage(filename: str, read_only: bool = False, **options) -> StorageBackend:
+    """
+    Создает хранилище по имени файла библиотеки.
+
+    :param filename: Имя файла библиотеки. Файлы '.db', '.sqlite' и '.sqlite3' открываются в SQLite.
+    :param read_only: Если True, файл двоичного снимка отображается в память только для чтения
+                      (см. book.mapped_storage).
+    :param options: Параметры JsonStorage (journal, compact_threshold, compact_bytes, shared, backups,
+                    offset_index, journal_fsync).
+    :return: Экземпляр хранилища.
+    """
+    if read_only:
+        from book.mapped_storage import MappedStorage
+        return MappedStorage(filename)
+    if filename.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        from book.sqlite_storage import SqliteStorage
+        return SqliteStorage(filename)
+    return JsonStorage(filename, **options)
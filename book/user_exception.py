@@ -2,10 +2,23 @@
 Модуль содержит различные пользовательские исключения, связанные с обработкой книг в библиотеки
 """
 
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _restore_error(cls: type, state: Dict[str, Any]) -> 'BookError':
+    """Восстанавливает ошибку после передачи в другой процесс (см. BookError.__reduce__)."""
+    error = cls.__new__(cls)
+    error.__dict__.update(state)
+    return error
+
 
 class BookError(Exception):
     """Базовый класс для всех ошибок, связанных с книгами."""
-    pass
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Конструкторы ошибок не передают аргументы в Exception, поэтому ошибка сериализуется
+        # по атрибутам - так она возвращается из процесса шарда (см. book.sharded_library)
+        return _restore_error, (type(self), self.__dict__)
 
 class InvalidBookIntError(BookError):
     """Ошибка, возникающая при передаче строки вместо числового значения."""
@@ -77,9 +90,51 @@ class InvalidStatusError(BookError):
 class DuplicateStatusError(BookError):
     """Ошибка, возникающая при попытке изменить статус на тот же самый."""
 
-    def __init__(self, status: str) -> None:
+    def __init__(self, status: str, book_id: Optional[int] = None) -> None:
         super().__init__()
         self.status = status
+        self.book_id = book_id
+
+    def __str__(self) -> str:
+        if self.book_id is not None:
+            return f"Попытка изменить статус на тот же самый: {self.status} (id - {self.book_id})"
+        return f"Попытка изменить статус на тот же самый: {self.status}"
+
+class InvalidRowError(BookError):
+    """Ошибка, возникающая при чтении поврежденной строки файла импорта."""
+
+    def __init__(self, details: str) -> None:
+        super().__init__()
+        self.details = details
+
+    def __str__(self) -> str:
+        return f"Не удалось прочитать строку файла: {self.details}"
+
+class BulkOperationError(BookError):
+    """Ошибка, возникающая при групповой операции, если часть книг не прошла проверку."""
+
+    def __init__(self, errors: List[BookError]) -> None:
+        super().__init__()
+        self.errors = errors
+
+    def __str__(self) -> str:
+        return "Изменения не выполнены, ошибки проверки:\n" + "\n".join(str(error) for error in self.errors)
+
+class BatchCommandError(BookError):
+    """Ошибка, возникающая при неверной команде пакетного режима."""
+
+    def __init__(self, details: str) -> None:
+        super().__init__()
+        self.details = details
+
+    def __str__(self) -> str:
+        return f"Неверная команда: {self.details}"
+
+class ReadOnlyLibraryError(BookError):
+    """Ошибка, возникающая при попытке изменить библиотеку, открытую только для чтения."""
+
+    def __init__(self) -> None:
+        super().__init__()
 
     def __str__(self) -> str:
-        return f"Попытка изменить статус на тот же самый: {self.status}"
\ No newline at end of file
+        return "Библиотека открыта только для чтения"
@@ -0,0 +1,83 @@
+"""
+Модуль с проверками данных книги.
+
+Проверки используются и консольным интерфейсом (book_console), и пакетным импортом 
+(Library.add_books), чтобы правила для новой книги были одинаковыми:
+- название, автор и год должны быть заполнены;
+- год должен быть целым числом;
+- год должен быть больше 0 и не больше текущего года.
+
+Функция parse_book_ids разбирает ввод нескольких идентификаторов книг для групповых операций
+(не больше MAX_BOOK_IDS id, чтобы огромный диапазон не исчерпал память).
+"""
+
+from datetime import datetime
+from typing import List
+from book.user_exception import NotInputError, YearBookError, InvalidBookIntError
+
+
+def validate_book(title: str, author: str, year: str) -> None:
+    """
+    Проверяет данные новой книги.
+
+    :param title: Название книги.
+    :param author: Автор книги.
+    :param year: Год издания книги (строка из ввода пользователя или файла).
+    :raises NotInputError: Если одно из полей пустое.
+    :raises InvalidBookIntError: Если год не является целым числом.
+    :raises YearBookError: Если год меньше(равен) 0 или больше текущего года.
+    """
+    # Проверяем наличие введенных данных на пустоту. Если поступила пустая строка - поднимает ошибку
+    if not title or not author or not year:
+        raise NotInputError
+    # Проверяем чтобы год был числом, а не строкой. При не правильных данных - поднимает ошибку.
+    # isdigit() пропускает символы вроде '²', которые int() не принимает, поэтому проверяется isdecimal()
+    if not year.isdecimal():
+        raise InvalidBookIntError(year)
+    try:
+        year_number = int(year)
+    except ValueError:
+        raise InvalidBookIntError(year) from None
+    # Проверяем правильность года. Если год меньше(равен) 0 или больше текущего кода - поднимает ошибку
+    if year_number <= 0 or year_number > datetime.now().year:
+        raise YearBookError(datetime.now().year)
+
+
+# Наибольшее количество id в одной групповой операции: диапазон вроде '1-999999999999'
+# иначе разворачивался бы в список, на который не хватит памяти
+MAX_BOOK_IDS = 100000
+
+
+def parse_book_ids(text: str) -> List[int]:
+    """
+    Разбирает список идентификаторов книг с диапазонами, например '10-50,77'.
+
+    Диапазон включает обе границы. Повторяющиеся id возвращаются один раз, в порядке ввода.
+
+    :param text: Идентификаторы и диапазоны через запятую.
+    :raises NotInputError: Если ввод пустой.
+    :raises InvalidBookIntError: Если часть ввода не является числом или диапазоном чисел
+                                 или всего id (с учетом диапазонов) больше MAX_BOOK_IDS.
+    :return: Список идентификаторов.
+    """
+    if not text or not text.strip():
+        raise NotInputError
+    ids: List[int] = []
+    for part in text.split(','):
+        part = part.strip()
+        start, separator, end = part.partition('-')
+        start, end = start.strip(), end.strip()
+        if not start.isdecimal() or (separator and not end.isdecimal()):
+            raise InvalidBookIntError(part)
+        if not separator:
+            ids.append(int(start))
+        elif int(start) > int(end):
+            raise InvalidBookIntError(part)
+        elif int(end) - int(start) + 1 > MAX_BOOK_IDS - len(ids):
+            # Размер диапазона проверяется до того, как он развернут в список
+            raise InvalidBookIntError(part)
+        else:
+            ids.extend(range(int(start), int(end) + 1))
+        if len(ids) > MAX_BOOK_IDS:
+            raise InvalidBookIntError(part)
+    return list(dict.fromkeys(ids))
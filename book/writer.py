@@ -0,0 +1,96 @@
+"""
+Модуль фонового сохранения библиотеки.
+
+Класс BackgroundWriter выполняет сохранение в отдельном потоке. Запросы на сохранение,
+поступившие подряд, объединяются: сохранение выполняется, когда запросов не было delay секунд,
+но не позже чем через max_delay секунд после первого несохраненного изменения.
+Так серия из сотни изменений приводит к одной записи файла.
+
+Пример использования:
+writer = BackgroundWriter(library.save_books, delay=0.5)
+writer.schedule()
+writer.close()
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class BackgroundWriter:
+    def __init__(self, save: Callable[[], None], delay: float = 0.5, max_delay: float = 5.0) -> None:
+        """
+        Инициализация и запуск потока фонового сохранения.
+
+        :param save: Функция, которая сохраняет библиотеку.
+        :param delay: Пауза без новых запросов, после которой выполняется сохранение (секунды).
+        :param max_delay: Наибольшая задержка сохранения после первого запроса (секунды).
+        """
+        self.save = save
+        self.delay: float = delay
+        self.max_delay: float = max_delay
+        self.saves: int = 0
+        self._condition = threading.Condition()
+        self._dirty_since: Optional[float] = None
+        self._last_request: float = 0.0
+        self._saving: bool = False
+        self._flushing: bool = False
+        self._closed: bool = False
+        self._thread = threading.Thread(target=self._run, name='library-writer', daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> bool:
+        """True, если есть изменения, которые еще не сохранены."""
+        with self._condition:
+            return self._dirty_since is not None or self._saving
+
+    def schedule(self) -> None:
+        """Запрашивает сохранение библиотеки."""
+        with self._condition:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_request = now
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        """Основной цикл потока: ждет запросы и сохраняет библиотеку после паузы."""
+        while True:
+            with self._condition:
+                while self._dirty_since is None and not self._closed:
+                    self._condition.wait()
+                if self._dirty_since is None:
+                    return
+                while not self._flushing and not self._closed:
+                    deadline = min(self._last_request + self.delay, self._dirty_since + self.max_delay)
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                self._dirty_since = None
+                self._saving = True
+            try:
+                self.save()
+            finally:
+                with self._condition:
+                    self._saving = False
+                    self.saves += 1
+                    self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Немедленно сохраняет несохраненные изменения и ждет окончания записи."""
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            while (self._dirty_since is not None or self._saving) and self._thread.is_alive():
+                self._condition.wait()
+            self._flushing = False
+
+    def close(self) -> None:
+        """Сохраняет несохраненные изменения и останавливает поток."""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
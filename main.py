@@ -1,7 +1,98 @@
 """Функция для запуска приложения"""
 
-
+import argparse
+import sys
 from book.book_console import book_console
+from book.log_config import setup_logging, stop_logging
+from book.lexicon import LEXICON
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Без аргументов запускается консольное меню. Дополнительные команды:
+    - import <файл.csv|файл.jsonl> - пакетный импорт книг из файла.
+    - migrate <файл.json> <файл.db> - перенос библиотеки из JSON в базу SQLite.
+    - convert <исходный файл> <новый файл> - перевод библиотеки между JSON, JSON Lines и двоичным снимком.
+    - serve [--port 8080] - HTTP-сервис библиотеки с ответами JSON (см. book.server).
+    Параметр --log-file задает файл логов (по умолчанию book.log).
+    Параметр --batch <файл|-> выполняет команды из файла или стандартного ввода без меню (см. book.batch).
+    """
+    parser = argparse.ArgumentParser(description='Book Library')
+    parser.add_argument('--library', default='library.json', help='файл библиотеки')
+    parser.add_argument('--log-file', default='book.log', help='файл логов')
+    parser.add_argument('--journal', action='store_true', help='дописывать изменения в журнал')
+    parser.add_argument('--shared', action='store_true', 
+                        help='разрешить одновременную работу нескольких процессов с библиотекой')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="выполнить команды из файла ('-' - из стандартного ввода) без меню, "
+                             "результаты выводятся в формате JSON Lines")
+    parser.add_argument('--metrics-port', type=int, 
+                        help='включить метрики и отдавать их по адресу http://127.0.0.1:<порт>/metrics')
+    subparsers = parser.add_subparsers(dest='command')
+
+    import_parser = subparsers.add_parser('import', help='пакетный импорт книг из CSV или JSON Lines')
+    import_parser.add_argument('file', help='файл .csv или .jsonl')
+    import_parser.add_argument('--batch-size', type=int, default=10000, 
+                               help='количество книг, после которого библиотека сохраняется')
+
+    migrate_parser = subparsers.add_parser('migrate', help='перенос библиотеки из JSON в базу SQLite')
+    migrate_parser.add_argument('source', help='файл библиотеки .json')
+    migrate_parser.add_argument('target', help='файл базы .db')
+
+    convert_parser = subparsers.add_parser(
+        'convert', help='перевод библиотеки между форматами JSON, JSON Lines и двоичным снимком (.snap)')
+    convert_parser.add_argument('source', help='исходный файл библиотеки')
+    convert_parser.add_argument('target', help='новый файл библиотеки (формат - по расширению)')
+
+    serve_parser = subparsers.add_parser('serve', help='HTTP-сервис библиотеки с ответами в формате JSON')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='адрес сервиса')
+    serve_parser.add_argument('--port', type=int, default=8080, help='порт сервиса')
+    serve_parser.add_argument('--workers', type=int, default=8, help='количество потоков обработки запросов')
+    serve_parser.add_argument('--read-only', action='store_true',
+                              help='открыть снимок библиотеки (.snap) только для чтения, отобразив его в память')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # Логирование настраивается только при запуске приложения и останавливается при выходе из него
+    setup_logging(args.log_file)
+    try:
+        return _run(args)
+    finally:
+        stop_logging()
+
+
+def _run(args: argparse.Namespace) -> int:
+    """Выполняет команду, выбранную аргументами командной строки."""
+    if args.metrics_port is not None:
+        from book.metrics import enable_metrics, start_metrics_server
+        enable_metrics()
+        start_metrics_server(args.metrics_port)
+    if args.command == 'import':
+        from book.book_class import Library
+        from book.importer import import_books
+        with Library(args.library, journal=args.journal, shared=args.shared) as library:
+            print(import_books(library, args.file, batch_size=args.batch_size))
+    elif args.command == 'migrate':
+        from book.sqlite_storage import migrate_json_to_sqlite
+        print(f"{LEXICON['migrate_true']}{migrate_json_to_sqlite(args.source, args.target)}")
+    elif args.command == 'convert':
+        from book.storage import convert_library
+        print(f"{LEXICON['convert_true']}{convert_library(args.source, args.target)}")
+    elif args.command == 'serve':
+        from book.server import serve
+        serve(args.library, port=args.port, host=args.host, workers=args.workers,
+              journal=args.journal, shared=args.shared, read_only=args.read_only)
+    elif args.batch is not None:
+        from book.batch import batch_console
+        return batch_console(args.library, args.batch, journal=args.journal, shared=args.shared)
+    else:
+        book_console(args.library, journal=args.journal, shared=args.shared)
+    return 0
+
 
 if __name__ == "__main__":
-    book_console()
\ No newline at end of file
+    sys.exit(main())
@@ -225,5 +225,22 @@ def test_book_console_update_book(mock_print_main_menu, mock_input, mock_library
     mock_library.update_status.assert_called_once_with('1', 'выдана')
 
 
+
+@pytest.mark.parametrize('error', [EOFError, KeyboardInterrupt])
+@patch('builtins.input')
+@patch('book.menu.print_main_menu')
+def test_book_console_closes_library_on_interrupt(mock_print_main_menu, mock_input, mock_library, error):
+    """Тестирует, что библиотека закрывается при конце ввода и Ctrl+C, а не только через пункт 6."""
+
+    mock_input.side_effect = ['1', 'Горе программист', 'Иванов', '1990', error]
+
+    with patch('book.book_console.Library', return_value=mock_library):
+        with pytest.raises(error):
+            book_console()
+
+    mock_library.add_book.assert_called_once_with('Горе программист', 'Иванов', '1990')
+    mock_library.close.assert_called_once_with()
+
+
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Модуль для тестирования асинхронного интерфейса библиотеки.
+"""
+
+import asyncio
+import threading
+import time
+from book.async_library import AsyncLibrary
+from book.book_class import Library
+
+
+def test_concurrent_mutations_are_serialized(tmp_path):
+    """Тестирует, что одновременные изменения не теряются и получают разные id."""
+    filename = str(tmp_path / 'library.json')
+
+    async def scenario():
+        async with await AsyncLibrary.open(filename, journal=True) as library:
+            await asyncio.gather(*(library.add_book(f'Книга {number}', 'Автор', '2000') for number in range(20)))
+            await library.update_status('1', 'выдана')
+            await library.remove_book('2')
+            return await library.display_books()
+
+    books = asyncio.run(scenario())
+    assert [book.id for book in books] == [1] + list(range(3, 21))
+
+    reloaded = Library(filename=filename, journal=True)
+    assert len(reloaded.books) == 19
+    assert reloaded.books[1].status == 'выдана'
+
+
+def test_reads_do_not_wait_for_save(tmp_path):
+    """Тестирует, что поиск выполняется, пока фоновое сохранение записывает файл."""
+    filename = str(tmp_path / 'library.json')
+    writing = threading.Event()
+    release = threading.Event()
+
+    async def scenario():
+        library = await AsyncLibrary.open(filename, save_delay=0)
+        save = library.library.storage.save
+
+        def slow_save(books):
+            writing.set()
+            release.wait(5)
+            save(books)
+
+        library.library.storage.save = slow_save
+        await library.add_book('Война и мир', 'Лев Толстой', '1869')
+        assert await asyncio.to_thread(writing.wait, 5)
+
+        started = time.monotonic()
+        books = await asyncio.wait_for(library.search_books('война'), 2)
+        elapsed = time.monotonic() - started
+        release.set()
+        await library.close()
+        return books, elapsed
+
+    books, elapsed = asyncio.run(scenario())
+    assert [book.title for book in books] == ['Война и мир']
+    assert elapsed < 1
+    assert len(Library(filename=filename).books) == 1
+
+
+def test_reads_do_not_wait_for_snapshot(tmp_path):
+    """Тестирует, что поиск не ждет блокировку библиотеки, которую держит фоновое сохранение."""
+    filename = str(tmp_path / 'library.json')
+    snapshot = threading.Event()
+    release = threading.Event()
+
+    async def scenario():
+        library = await AsyncLibrary.open(filename, save_delay=0)
+        prepare_save = library.library.storage.prepare_save
+
+        def slow_prepare_save(target):
+            snapshot.set()
+            release.wait(5)
+            prepare_save(target)
+
+        library.library.storage.prepare_save = slow_prepare_save
+        await library.add_book('Война и мир', 'Лев Толстой', '1869')
+        assert await asyncio.to_thread(snapshot.wait, 5)
+
+        started = time.monotonic()
+        books = await asyncio.wait_for(asyncio.gather(library.search_books('война'), library.get_book(1)), 2)
+        elapsed = time.monotonic() - started
+        release.set()
+        await library.close()
+        return books, elapsed
+
+    (found, book), elapsed = asyncio.run(scenario())
+    assert [book.title for book in found] == ['Война и мир'] and book.id == 1
+    assert elapsed < 1
@@ -0,0 +1,92 @@
+"""
+Модуль для тестирования атомарного сохранения библиотеки и фонового сохранения.
+"""
+
+import json
+import os
+from unittest.mock import patch
+import pytest
+from book.book_class import Library
+
+
+def read_titles(filename):
+    with open(filename, encoding='utf-8') as f:
+        return [book['title'] for book in json.load(f)]
+
+
+def test_failed_save_keeps_previous_file(tmp_path):
+    """Тестирует, что сбой во время записи не портит файл библиотеки."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+
+    with patch('book.storage.write_book_records', side_effect=OSError('No space left on device')):
+        library.add_book('Горе от ума', 'Грибоедов', '1825')
+
+    assert read_titles(filename) == ['Война и мир']
+    # Временных файлов не осталось
+    assert sorted(os.listdir(tmp_path)) == ['library.json']
+
+
+def test_backups_rotation(tmp_path):
+    """Тестирует хранение заданного количества предыдущих версий файла."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, backups=2)
+    for year in ('2001', '2002', '2003', '2004'):
+        library.add_book(f'Книга {year}', 'Автор', year)
+
+    assert len(read_titles(filename)) == 4
+    assert len(read_titles(f'{filename}.1')) == 3
+    assert len(read_titles(f'{filename}.2')) == 2
+    assert not os.path.exists(f'{filename}.3')
+
+
+def test_background_save_coalesces_mutations(tmp_path):
+    """Тестирует объединение серии изменений в одно фоновое сохранение."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, background_save=10)
+    with patch.object(library.storage, 'save', wraps=library.storage.save) as save:
+        for number in range(50):
+            library.add_book(f'Книга {number}', 'Автор', '2000')
+        library.update_status('1', 'выдана')
+        library.remove_book('2')
+        assert not os.path.exists(filename)
+        library.close()
+
+    assert save.call_count == 1
+    reloaded = Library(filename=filename)
+    assert len(reloaded.books) == 49
+    assert reloaded.books[1].status == 'выдана'
+
+
+def test_background_save_requires_exclusive_access(tmp_path):
+    """Тестирует запрет фонового сохранения для библиотеки нескольких процессов."""
+    with pytest.raises(ValueError):
+        Library(filename=str(tmp_path / 'library.json'), shared=True, background_save=1)
+
+
+def test_background_save_copies_books_only_on_write(tmp_path):
+    """Тестирует, что снимок для фонового сохранения не копирует книги, пока их не изменят во время записи."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, background_save=10)
+    library.add_books([('Война и мир', 'Лев Толстой', '1869'), ('Горе от ума', 'Грибоедов', '1825')])
+    save = library.storage.save
+    saved = []
+
+    def remove_during_save(books):
+        saved.append(books is library.books)
+        if len(saved) == 1:
+            library.remove_book('2')
+        save(books)
+
+    library.storage.save = remove_during_save
+    written = []
+    with patch('book.storage.write_book_records', side_effect=lambda f, records, **options: written.append(
+            [record['title'] for record in records])):
+        library.flush()
+    # Книги отданы сохранению без копирования, а удаление скопировало словарь до изменения:
+    # первая запись получила книги на момент снимка, вторая - после удаления
+    assert saved == [True, True]
+    assert written == [['Война и мир', 'Горе от ума'], ['Война и мир']]
+    assert not library._books_shared
+    library.close()
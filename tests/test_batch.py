@@ -0,0 +1,127 @@
+"""
+Модуль для тестирования пакетного режима (book.batch и main.py --batch).
+"""
+
+import io
+import json
+import sys
+import time
+import pytest
+from book.batch import parse_command, run_batch
+from book.book_class import Library
+from book.user_exception import BatchCommandError
+from main import main
+
+
+def run(library, text):
+    output = io.StringIO()
+    counts = run_batch(library, text.splitlines(), output)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = Library(filename=str(tmp_path / 'library.json'))
+    yield library
+    library.close()
+
+
+def test_commands_produce_json_lines(library, capsys):
+    """Тестирует выполнение команд и вывод результатов в формате JSON Lines без сообщений меню."""
+    counts, responses = run(library, '''
+# комментарий
+add "Война и мир" "Лев Толстой" 1869
+add "Горе от ума" Грибоедов 1825
+status 1 выдана
+search толстой
+fuzzy грибоедв
+list 1 1
+remove 1-2
+''')
+    assert counts == (7, 0)
+    assert [response['line'] for response in responses] == [3, 4, 5, 6, 7, 8, 9]
+    assert all(response['ok'] for response in responses)
+    assert responses[0]['result'] == {'id': 1, 'title': 'Война и мир', 'author': 'Лев Толстой',
+                                      'year': 1869, 'status': 'в наличии'}
+    assert responses[3]['result'][0]['status'] == 'выдана'
+    assert [book['id'] for book in responses[4]['result']] == [2]
+    assert [book['id'] for book in responses[5]['result']] == [2]
+    assert responses[6]['result'] == {'removed': [1, 2]}
+    assert library.books == {}
+    # Методы библиотеки печатают сообщения для меню - в пакетном режиме они скрыты
+    assert capsys.readouterr().out == ''
+
+
+def test_errors_do_not_stop_batch(library):
+    """Тестирует, что ошибка в команде выводится в результат, а следующие команды выполняются."""
+    counts, responses = run(library, '''add "Книга" Автор 1990
+remove 7
+add Книга Автор
+unknown 1
+status 1,5 выдана
+add "Книга" Автор 1991
+''')
+    assert counts == (6, 4)
+    assert [response['ok'] for response in responses] == [True, False, False, False, False, True]
+    assert responses[1]['error'] == 'InvalidBookIDError'
+    assert responses[2]['error'] == responses[3]['error'] == 'BatchCommandError'
+    assert responses[4]['error'] == 'BulkOperationError'
+    assert responses[4]['errors'] == ['Книга не найдена с id - 5']
+    assert responses[5]['result']['id'] == 2
+
+
+def test_negative_list_arguments_rejected(library):
+    """Тестирует, что отрицательные offset и limit команды list - ошибка команды, а не неверная страница."""
+    library.add_book('Книга', 'Автор', '1990')
+    counts, responses = run(library, 'list -1 1\nlist 0 -1\nfuzzy книга -1\nlist 0 1\n')
+    assert counts == (4, 3)
+    assert [response.get('error') for response in responses] == ['InvalidBookIntError'] * 3 + [None]
+    assert [book['id'] for book in responses[3]['result']] == [1]
+
+
+def test_storage_error_does_not_stop_batch(library, monkeypatch):
+    """Тестирует, что ошибка хранилища выводится как ошибка команды, а следующие команды выполняются."""
+    def broken():
+        raise OSError('диск недоступен')
+
+    monkeypatch.setattr(library, 'save_books', broken)
+    counts, responses = run(library, 'save\nadd Книга Автор 1990\n')
+    assert counts == (2, 1)
+    assert responses[0]['ok'] is False and responses[0]['error'] == 'OSError'
+    assert responses[0]['message'] == 'диск недоступен'
+    assert responses[1]['ok'] is True
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('status 1 выдана', ['status', '1', 'выдана']),
+    ('add  "Война и мир"   "Лев Толстой" 1869', ['add', 'Война и мир', 'Лев Толстой', '1869']),
+    ('add "Сказка ""Морозко""" Народ 1900', ['add', 'Сказка "Морозко"', 'Народ', '1900']),
+])
+def test_parse_command(line, expected):
+    """Тестирует разбор строки команды с кавычками."""
+    assert parse_command(line) == expected
+
+
+def test_parse_command_unclosed_quote():
+    """Тестирует ошибку при незакрытой кавычке."""
+    with pytest.raises(BatchCommandError):
+        parse_command('add "Война и мир Толстой 1869')
+
+
+def test_main_batch_from_file_and_stdin(tmp_path, monkeypatch, capsys):
+    """Тестирует запуск main.py --batch из файла и из стандартного ввода и сохранение изменений."""
+    filename = str(tmp_path / 'library.json')
+    commands = tmp_path / 'commands.txt'
+    commands.write_text('add "Война и мир" "Лев Толстой" 1869\nadd Ревизор Гоголь 1836\n', encoding='utf-8')
+    started = time.perf_counter()
+    assert main(['--library', filename, '--log-file', str(tmp_path / 'book.log'), '--batch', str(commands)]) == 0
+    # Выход без паузы консольного меню
+    assert time.perf_counter() - started < 2
+    assert len(capsys.readouterr().out.splitlines()) == 2
+    assert sorted(Library(filename).books) == [1, 2]
+
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('remove 1\nremove 1\n'))
+    assert main(['--library', filename, '--log-file', str(tmp_path / 'book.log'), '--batch', '-']) == 1
+    responses = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [response['ok'] for response in responses] == [True, False]
+    assert sorted(Library(filename).books) == [2]
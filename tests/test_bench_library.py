@@ -0,0 +1,48 @@
+"""
+Модуль для тестирования бенчмарка библиотеки (генератор каталога, запуск и поиск регрессий).
+"""
+
+import json
+from benchmarks.bench_library import compare_results, main, percentile
+from benchmarks.catalog import generate_catalog
+
+
+def test_catalog_is_reproducible():
+    """Тестирует, что каталог с одним seed всегда одинаковый."""
+    first = list(generate_catalog(100, seed=1))
+    assert first == list(generate_catalog(100, seed=1))
+    assert [book['id'] for book in first] == list(range(1, 101))
+    assert all(1700 <= book['year'] <= 2024 for book in first)
+
+
+def test_percentile():
+    """Тестирует вычисление процентилей задержки."""
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 0.5) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+
+
+def test_compare_results_flags_regressions():
+    """Тестирует, что регрессией считается только рост больше порога."""
+    baseline = {'sizes': {'10': {'add_book': {'p50_ms': 1.0, 'peak_memory_mb': 1.0}}}}
+    results = {'sizes': {'10': {'add_book': {'p50_ms': 1.2, 'peak_memory_mb': 2.0},
+                                'save_books': {'p50_ms': 5.0}}}}
+    regressions = compare_results(results, baseline, threshold=0.25)
+    assert len(regressions) == 1
+    assert 'peak_memory_mb' in regressions[0]
+
+
+def test_bench_run_writes_results(tmp_path, monkeypatch):
+    """Тестирует запуск бенчмарка на маленьком каталоге с сохранением и сравнением результатов."""
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / 'results.json'
+    assert main(['--sizes', '50', '--max-seconds', '0', '--journal', '--save-baseline', str(output)]) == 0
+
+    with open(output, encoding='utf-8') as f:
+        results = json.load(f)
+    assert set(results['sizes']['50']) == {'load_books', 'search_books', 'fuzzy_index', 'fuzzy_search',
+                                           'update_status', 'add_book', 'remove_book', 'save_books'}
+    assert results['sizes']['50']['add_book']['iterations'] == 1
+    assert main(['--sizes', '50', '--max-seconds', '0', '--journal', '--no-memory',
+                 '--baseline', str(output), '--threshold', '1000']) == 0
@@ -0,0 +1,129 @@
+"""
+Модуль для тестирования групповых операций: update_status_many, remove_books и разбора диапазонов id.
+"""
+
+from unittest.mock import patch, MagicMock
+import pytest
+from book.book_class import Library
+from book.book_console import book_console
+from book.validators import MAX_BOOK_IDS, parse_book_ids
+from book.user_exception import (BulkOperationError, InvalidBookIDError, DuplicateStatusError,
+                                 InvalidBookIntError, InvalidStatusError, NotInputError)
+
+
+@pytest.fixture(params=['json', 'journal', 'columnar', 'sqlite'])
+def library(request, tmp_path):
+    if request.param == 'sqlite':
+        library = Library(filename=str(tmp_path / 'library.db'))
+    else:
+        library = Library(filename=str(tmp_path / 'library.json'), journal=request.param == 'journal',
+                          columnar=request.param == 'columnar')
+    library.add_books((f'Книга {number}', 'Автор', '2000') for number in range(1, 11))
+    yield library
+    library.close()
+
+
+def reopen(library):
+    library.close()
+    return Library(filename=library.filename, journal=getattr(library.storage, 'use_journal', False))
+
+
+def test_update_status_many(library):
+    """Тестирует изменение статуса нескольких книг и сохранение изменений."""
+    library.update_status_many([2, '3', 5, 5], 'выдана')
+    reloaded = reopen(library)
+    assert [book.id for book in reloaded.find_by_status('выдана')] == [2, 3, 5]
+    reloaded.close()
+
+
+def test_remove_books(library):
+    """Тестирует удаление нескольких книг и сохранение изменений."""
+    library.remove_books(range(3, 9))
+    assert sorted(library.books) == [1, 2, 9, 10]
+    assert [book.title for book in library.search_books('книга 1')] == ['Книга 1', 'Книга 10']
+    reloaded = reopen(library)
+    assert sorted(reloaded.books) == [1, 2, 9, 10]
+    reloaded.close()
+
+
+def test_update_status_many_reports_all_errors_and_changes_nothing(library):
+    """Тестирует, что при ошибках проверки сообщаются все ошибки, а статусы не меняются."""
+    library.update_status('4', 'выдана')
+    with pytest.raises(BulkOperationError) as error:
+        library.update_status_many([1, 4, 42, 'x', 43], 'выдана')
+    assert [type(e) for e in error.value.errors] == [InvalidBookIntError, DuplicateStatusError,
+                                                   InvalidBookIDError, InvalidBookIDError]
+    assert 'id - 4' in str(error.value)
+    assert [book.id for book in library.find_by_status('выдана')] == [4]
+
+
+def test_remove_books_changes_nothing_on_error(library):
+    """Тестирует, что при неверном id ни одна книга не удаляется."""
+    with pytest.raises(BulkOperationError) as error:
+        library.remove_books([1, 2, 99])
+    assert [e.book_id for e in error.value.errors] == [99]
+    assert len(library.books) == 10
+
+
+def test_bulk_operations_validate_input(library):
+    """Тестирует проверку пустого ввода и недопустимого статуса."""
+    with pytest.raises(NotInputError):
+        library.remove_books([])
+    with pytest.raises(NotInputError):
+        library.update_status_many([1], '')
+    with pytest.raises(InvalidStatusError):
+        library.update_status_many([1], 'потеряна')
+
+
+def test_bulk_operations_persist_once(tmp_path):
+    """Тестирует, что групповая операция перезаписывает файл библиотеки один раз."""
+    library = Library(filename=str(tmp_path / 'library.json'))
+    library.add_books((f'Книга {number}', 'Автор', '2000') for number in range(1, 501))
+    with patch.object(library.storage, 'save', wraps=library.storage.save) as save:
+        library.update_status_many(range(1, 501), 'выдана')
+        library.remove_books(range(1, 251))
+    assert save.call_count == 2
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('7', [7]),
+    ('10-13,77', [10, 11, 12, 13, 77]),
+    (f'1-{MAX_BOOK_IDS}', list(range(1, MAX_BOOK_IDS + 1))),
+    (' 3 - 4 , 2, 3 ', [3, 4, 2]),
+])
+def test_parse_book_ids(text, expected):
+    """Тестирует разбор списка id с диапазонами."""
+    assert parse_book_ids(text) == expected
+
+
+@pytest.mark.parametrize('text, exception', [
+    ('', NotInputError),
+    ('abc', InvalidBookIntError),
+    ('5-', InvalidBookIntError),
+    ('9-3', InvalidBookIntError),
+    ('1,,2', InvalidBookIntError),
+    ('1²', InvalidBookIntError),
+    ('1-999999999999', InvalidBookIntError),
+    (f'1-{MAX_BOOK_IDS}, {MAX_BOOK_IDS + 1}', InvalidBookIntError),
+])
+def test_parse_book_ids_errors(text, exception):
+    """Тестирует ошибки разбора списка id."""
+    with pytest.raises(exception):
+        parse_book_ids(text)
+
+
+@patch('builtins.input')
+@patch('book.menu.print_main_menu')
+def test_console_accepts_id_ranges(mock_print_main_menu, mock_input):
+    """Тестирует, что консоль передает диапазон id в групповые операции."""
+    mock_input.side_effect = [
+        '2', '10-12,77',              # Удаляем книги 10, 11, 12 и 77
+        '5', '3-4', 'выдана',         # Выдаем книги 3 и 4
+        '6',
+    ]
+    mock_library = MagicMock()
+    with patch('book.book_console.Library', return_value=mock_library):
+        book_console()
+    mock_library.remove_books.assert_called_once_with([10, 11, 12, 77])
+    mock_library.update_status_many.assert_called_once_with([3, 4], 'выдана')
+    mock_library.remove_book.assert_not_called()
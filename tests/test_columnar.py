@@ -0,0 +1,52 @@
+"""
+Модуль для тестирования компактного представления книг (__slots__ и ColumnarBooks).
+"""
+
+import json
+import pytest
+from book.book_class import Library, Book
+
+
+def test_book_has_no_instance_dict():
+    """Тестирует, что экземпляры Book не создают __dict__."""
+    book = Book(1, 'Тестовое Название', 'Тестовый Автор', 2020)
+    assert not hasattr(book, '__dict__')
+    with pytest.raises(AttributeError):
+        book.extra = 'значение'
+
+
+def test_columnar_library_operations(tmp_path):
+    """Тестирует работу библиотеки с колоночным хранилищем."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, columnar=True)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Анна Каренина', 'Лев Толстой', '1877')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+    library.update_status('2', 'выдана')
+    library.remove_book('1')
+
+    assert library.books[2].book_dict() == {
+        'id': 2, 'title': 'Анна Каренина', 'author': 'Лев Толстой', 'year': 1877, 'status': 'выдана'}
+    assert [book.id for book in library.search_books('лев')] == [2]
+    assert library.books.authors == ['Лев Толстой', 'Грибоедов']
+
+    reloaded = Library(filename=filename, columnar=True)
+    assert [book.book_dict() for book in reloaded.display_books()] == \
+           [book.book_dict() for book in Library(filename=filename).display_books()]
+
+
+def test_columnar_keeps_non_integer_years(tmp_path):
+    """Тестирует, что нечисловой год и год-строка загружаются и сохраняются без изменений."""
+    filename = str(tmp_path / 'library.json')
+    records = [{'id': 1, 'title': 'Слово о полку Игореве', 'author': 'Неизвестен', 'year': 'неизв.', 'status': 'в наличии'},
+               {'id': 2, 'title': 'Мы', 'author': 'Евгений Замятин', 'year': '2020', 'status': 'в наличии'},
+               {'id': 3, 'title': 'Война и мир', 'author': 'Лев Толстой', 'year': 1869, 'status': 'в наличии'}]
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+    library = Library(filename=filename, columnar=True)
+    assert [book.book_dict() for book in library.display_books()] == records
+    library.update_status('2', 'выдана')
+    library.remove_book('1')
+    library.close()
+    with open(filename, encoding='utf-8') as f:
+        assert json.load(f) == [dict(records[1], status='выдана'), records[2]]
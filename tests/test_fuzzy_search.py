@@ -0,0 +1,150 @@
+"""
+Модуль для тестирования нечеткого поиска книг (book.fuzzy_search).
+"""
+
+import pytest
+from book.book_class import Library
+from book.fuzzy_search import MAX_QUERY_WORDS, FuzzyIndex, bounded_distance, max_typos
+from book.user_exception import NotBookError, NotInputError
+
+
+@pytest.fixture(params=['json', 'journal', 'columnar', 'sqlite'])
+def library(request, tmp_path):
+    if request.param == 'sqlite':
+        library = Library(filename=str(tmp_path / 'library.db'))
+    else:
+        library = Library(filename=str(tmp_path / 'library.json'), journal=request.param == 'journal',
+                          columnar=request.param == 'columnar')
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Александр Грибоедов', '1825')
+    library.add_book('Анна Каренина', 'Лев Толстой', '1877')
+    library.add_book('Ёлка', 'Фёдор Достоевский', '1876')
+    yield library
+    library.close()
+
+
+def titles(books):
+    return [book.title for book in books]
+
+
+def test_typo_in_author(library):
+    """Тестирует, что автор находится с пропущенной буквой."""
+    assert titles(library.search_books('Грибоедв', fuzzy=True)) == ['Горе от ума']
+
+
+def test_typo_in_title_words(library):
+    """Тестирует поиск по нескольким словам с опечаткой и в другом регистре."""
+    assert titles(library.search_books('гОре от умаа', fuzzy=True))[0] == 'Горе от ума'
+
+
+def test_yo_and_e_are_equal(library):
+    """Тестирует, что 'ё' и 'е' не различаются."""
+    assert titles(library.search_books('елка', fuzzy=True)) == ['Ёлка']
+    assert titles(library.search_books('федор достоевскии', fuzzy=True)) == ['Ёлка']
+
+
+def test_ranking_and_top_k(library):
+    """Тестирует порядок по сходству и ограничение количества результатов."""
+    books = library.search_books('толстой война', fuzzy=True)
+    # Совпали оба слова - книга выше, чем книга, где совпал только автор
+    assert titles(books) == ['Война и мир', 'Анна Каренина']
+    assert titles(library.search_books('толстой война', fuzzy=True, top_k=1)) == ['Война и мир']
+
+
+def test_exact_match_ranked_above_typo():
+    """Тестирует, что точное совпадение слова выше совпадения с опечаткой."""
+    index = FuzzyIndex()
+    for book_id, author in enumerate(['Иван Толстый', 'Лев Толстой'], start=1):
+        index.add(type('Book', (), {'id': book_id, 'title': 'Сказки', 'author': author, 'year': 1900})())
+    assert index.search('толстой') == [2, 1]
+
+
+def test_year_is_matched_exactly(library):
+    """Тестирует, что год с опечаткой считается другим годом."""
+    assert titles(library.search_books('1869', fuzzy=True)) == ['Война и мир']
+    with pytest.raises(NotBookError):
+        library.search_books('1868', fuzzy=True)
+
+
+def test_index_follows_library_changes(library):
+    """Тестирует, что индекс обновляется при добавлении, удалении и перезагрузке книг."""
+    with pytest.raises(NotBookError):
+        library.search_books('Чехов', fuzzy=True)
+    library.add_book('Вишневый сад', 'Антон Чехов', '1904')
+    assert titles(library.search_books('Чехв', fuzzy=True)) == ['Вишневый сад']
+    library.remove_book('2')
+    with pytest.raises(NotBookError):
+        library.search_books('Грибоедв', fuzzy=True)
+    library.load_books()
+    assert titles(library.search_books('Чехв', fuzzy=True)) == ['Вишневый сад']
+
+
+@pytest.mark.parametrize('journal', [False, True])
+def test_index_follows_other_process_after_refresh(tmp_path, journal):
+    """Тестирует, что после refresh индекс учитывает книги, добавленные другой библиотекой (shared=True)."""
+    filename = str(tmp_path / 'library.json')
+    with Library(filename=filename, journal=journal, shared=True) as first, \
+            Library(filename=filename, journal=journal, shared=True) as second:
+        first.add_book('Горе от ума', 'Александр Грибоедов', '1825')
+        second.refresh()
+        assert titles(second.search_books('Грибоедв', fuzzy=True)) == ['Горе от ума']
+        first.add_book('Вишневый сад', 'Антон Чехов', '1904')
+        first.remove_book('1')
+        second.refresh()
+        assert titles(second.search_books('Чехв', fuzzy=True)) == ['Вишневый сад']
+        with pytest.raises(NotBookError):
+            second.search_books('Грибоедв', fuzzy=True)
+
+
+def test_sqlite_index_rebuilt_after_other_connection(tmp_path):
+    """Тестирует, что индекс SQLite строится заново после изменений через другое соединение."""
+    filename = str(tmp_path / 'library.db')
+    with Library(filename=filename) as first, Library(filename=filename) as second:
+        first.add_book('Горе от ума', 'Александр Грибоедов', '1825')
+        assert titles(second.search_books('Грибоедв', fuzzy=True)) == ['Горе от ума']
+        index = second.fuzzy_index
+        # Свои изменения обновляют индекс без перестроения
+        second.add_book('Анна Каренина', 'Лев Толстой', '1877')
+        assert titles(second.search_books('Толстй', fuzzy=True)) == ['Анна Каренина']
+        assert second.fuzzy_index is index
+        first.add_book('Вишневый сад', 'Антон Чехов', '1904')
+        assert titles(second.search_books('Чехв', fuzzy=True)) == ['Вишневый сад']
+        assert second.fuzzy_index is not index
+
+
+def test_default_search_is_unchanged(library):
+    """Тестирует, что без fuzzy поиск по-прежнему ищет точную подстроку."""
+    assert titles(library.search_books('толст')) == ['Война и мир', 'Анна Каренина']
+    with pytest.raises(NotBookError):
+        library.search_books('Грибоедв')
+    with pytest.raises(NotInputError):
+        library.search_books('', fuzzy=True)
+
+
+@pytest.mark.parametrize('first, second, limit, expected', [
+    ('грибоедов', 'грибоедов', 2, 0),
+    ('грибоедв', 'грибоедов', 2, 1),
+    ('толстой', 'толстый', 1, 1),
+    ('война', 'вайно', 1, 2),
+    ('мир', 'миросозерцание', 2, 3),
+])
+def test_bounded_distance(first, second, limit, expected):
+    """Тестирует расстояние Левенштейна с ограничением (limit + 1 означает 'больше limit')."""
+    assert bounded_distance(first, second, limit) == expected
+
+
+def test_max_typos():
+    """Тестирует допустимое количество опечаток в зависимости от длины слова."""
+    assert [max_typos(word) for word in ('мир', '1869', 'война', 'грибоедов')] == [0, 0, 1, 2]
+
+
+def test_long_query_uses_rarest_words():
+    """Тестирует, что из длинного запроса ранжирование идет по MAX_QUERY_WORDS самым редким словам."""
+    index = FuzzyIndex()
+    for book_id in range(1, 21):
+        index.add(type('Book', (), {'id': book_id, 'title': f'Сказки том {book_id}', 'author': 'Лев Толстой',
+                                    'year': 1900})())
+    index.add(type('Book', (), {'id': 21, 'title': 'Горе от ума', 'author': 'Александр Грибоедов', 'year': 1825})())
+    query = 'лев толстой сказки том 1900 ' * 2 + 'грибоедв горе ума ' + ' '.join(f'слово{n}' for n in range(10))
+    assert len(set(query.split())) > MAX_QUERY_WORDS
+    assert index.search(query, top_k=1) == [21]
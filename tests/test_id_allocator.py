@@ -0,0 +1,108 @@
+"""
+Модуль для тестирования выдачи id книг (book.id_allocator) и ее сохранения вместе с метаданными библиотеки.
+"""
+
+import pytest
+from book.book_class import Library
+from book.id_allocator import IdAllocator
+from book.user_exception import InvalidBookIDError
+
+
+@pytest.fixture(params=['json', 'journal', 'sqlite'])
+def filename(request, tmp_path):
+    return str(tmp_path / ('library.db' if request.param == 'sqlite' else 'library.json')), request.param == 'journal'
+
+
+def open_library(filename, reuse_ids=False):
+    name, journal = filename
+    return Library(filename=name, journal=journal, reuse_ids=reuse_ids)
+
+
+def test_allocator_reuse_and_blocks():
+    """Тестирует выдачу id, повторную выдачу свободных id и выдачу блоков."""
+    ids = IdAllocator(reuse=True)
+    assert [ids.allocate() for _ in range(5)] == [1, 2, 3, 4, 5]
+    ids.release(4)
+    ids.release(2)
+    ids.release(2)
+    assert ids.free_ids == [2, 4]
+    assert ids.allocate_block(3) == range(6, 9)
+    ids.observe(4)
+    assert [ids.allocate(), ids.allocate()] == [2, 9]
+    ids.restore({'next_id': 3, 'free_ids': [1]})
+    assert ids.state() == {'next_id': 10, 'free_ids': [1]}
+
+
+def test_allocator_without_reuse_keeps_free_ids():
+    """Тестирует, что без повторной выдачи освобожденные id не выдаются, а сохраненные - хранятся."""
+    ids = IdAllocator(next_id=5, free_ids=[3])
+    ids.release(4)
+    assert ids.allocate() == 5
+    assert ids.state() == {'next_id': 6, 'free_ids': [3]}
+
+
+def test_high_water_mark_survives_restart(filename):
+    """Тестирует, что id удаленной последней книги не выдается снова после перезапуска."""
+    library = open_library(filename)
+    library.add_books((f'Книга {number}', 'Автор', '2000') for number in range(1, 6))
+    library.remove_books([4, 5])
+    library.close()
+    library = open_library(filename)
+    assert library.next_id == 6
+    assert library.create_book('Новая', 'Автор', '2001').id == 6
+    library.close()
+
+
+def test_reuse_ids_across_restart(filename):
+    """Тестирует повторную выдачу наименьшего свободного id, в том числе после перезапуска."""
+    library = open_library(filename, reuse_ids=True)
+    library.add_books((f'Книга {number}', 'Автор', '2000') for number in range(1, 6))
+    library.remove_books([2, 4])
+    assert library.create_book('Вторая', 'Автор', '2001').id == 2
+    library.close()
+    library = open_library(filename, reuse_ids=True)
+    assert library.ids.free_ids == [4]
+    assert library.create_book('Четвертая', 'Автор', '2001').id == 4
+    assert library.create_book('Шестая', 'Автор', '2001').id == 6
+    library.close()
+
+
+def test_reserve_ids(filename):
+    """Тестирует выдачу блока id и добавление книг с id из блока."""
+    library = open_library(filename)
+    library.add_book('Первая', 'Автор', '2000')
+    block = library.reserve_ids(3)
+    assert block == range(2, 5)
+    assert library.create_book('Без блока', 'Автор', '2000').id == 5
+    assert library.create_book('Из блока', 'Автор', '2000', book_id=3).id == 3
+    for book_id in (3, 5, 7, 0):
+        with pytest.raises(InvalidBookIDError):
+            library.create_book('Ошибка', 'Автор', '2000', book_id=book_id)
+    library.close()
+    library = open_library(filename)
+    assert library.next_id == 6
+    assert sorted(library.books) == [1, 3, 5]
+    library.close()
+
+
+def test_stale_meta_is_ignored(tmp_path):
+    """Тестирует, что метаданные измененного вручную файла не используются: next_id вычисляется по книгам."""
+    name = str(tmp_path / 'library.json')
+    library = Library(filename=name)
+    library.add_books((f'Книга {number}', 'Автор', '2000') for number in range(1, 11))
+    library.close()
+    with open(name, 'w', encoding='utf-8') as f:
+        f.write('[{"id": 1, "title": "Книга", "author": "Автор", "year": 2000, "status": "в наличии"}]')
+    assert Library(filename=name).next_id == 2
+
+
+def test_shared_reserved_blocks_do_not_overlap(tmp_path):
+    """Тестирует, что блоки id, выданные разными экземплярами общей библиотеки, не пересекаются."""
+    name = str(tmp_path / 'library.json')
+    first = Library(filename=name, journal=True, shared=True)
+    second = Library(filename=name, journal=True, shared=True)
+    blocks = [first.reserve_ids(10), second.reserve_ids(10), first.reserve_ids(5)]
+    assert blocks == [range(1, 11), range(11, 21), range(21, 26)]
+    assert second.create_book('Книга', 'Автор', '2000').id == 26
+    first.close()
+    second.close()
@@ -0,0 +1,79 @@
+"""
+Модуль для тестирования пакетного импорта книг (Library.add_books и book.importer).
+"""
+
+import json
+from unittest.mock import patch
+from book.book_class import Library
+from book.importer import import_books, read_rows
+from book.user_exception import NotInputError, YearBookError, InvalidBookIntError, InvalidRowError
+
+
+def test_add_books_reports_errors_and_saves_once(tmp_path):
+    """Тестирует проверку строк, назначение id подряд и однократное сохранение пакета."""
+    library = Library(filename=str(tmp_path / 'library.json'))
+    rows = [
+        {'title': 'Война и мир', 'author': 'Лев Толстой', 'year': '1869'},
+        {'title': '', 'author': 'Лев Толстой', 'year': '1877'},
+        ('Горе от ума', 'Грибоедов', 1825),
+        {'title': 'Книга', 'author': 'Автор', 'year': '3000'},
+        {'title': 'Книга', 'author': 'Автор', 'year': 'год'},
+    ]
+    with patch.object(library, 'save_books', wraps=library.save_books) as save_books:
+        added, errors = library.add_books(rows)
+
+    assert added == 2
+    assert save_books.call_count == 1
+    assert [book.title for book in library.books.values()] == ['Война и мир', 'Горе от ума']
+    assert list(library.books) == [1, 2]
+    assert [(row, type(error)) for row, error in errors] == [
+        (2, NotInputError), (4, YearBookError), (5, InvalidBookIntError)]
+
+
+def test_add_books_persists_per_batch(tmp_path):
+    """Тестирует сохранение библиотеки один раз на каждый пакет."""
+    library = Library(filename=str(tmp_path / 'library.json'))
+    rows = ({'title': f'Книга {i}', 'author': 'Автор', 'year': '2000'} for i in range(5))
+    with patch.object(library, 'save_books') as save_books:
+        added, errors = library.add_books(rows, batch_size=2)
+    assert added == 5
+    assert save_books.call_count == 3
+
+
+def test_import_books_from_files(tmp_path):
+    """Тестирует импорт из CSV и JSON Lines с поврежденной строкой."""
+    csv_file = tmp_path / 'books.csv'
+    csv_file.write_text('title,author,year\nВойна и мир,Лев Толстой,1869\n', encoding='utf-8')
+    jsonl_file = tmp_path / 'books.jsonl'
+    jsonl_file.write_text(
+        json.dumps({'title': 'Горе от ума', 'author': 'Грибоедов', 'year': 1825}, ensure_ascii=False)
+        + '\n{"title": \n', encoding='utf-8')
+
+    assert isinstance(list(read_rows(str(jsonl_file)))[1], InvalidRowError)
+
+    library = Library(filename=str(tmp_path / 'library.json'))
+    import_books(library, str(csv_file))
+    report = import_books(library, str(jsonl_file))
+
+    assert [book.year for book in library.books.values()] == [1869, 1825]
+    assert 'Строка 2' in report
+
+
+def test_bad_rows_do_not_stop_import(tmp_path):
+    """Тестирует, что год вроде '1²', строка неверной формы и не UTF-8 строка - ошибки только своих строк."""
+    library = Library(filename=str(tmp_path / 'library.json'))
+    rows = [('Книга', 'Автор', '1²'), ('Книга', 'Автор'), ('Ревизор', 'Гоголь', '1836')]
+    added, errors = library.add_books(rows)
+    assert added == 1
+    assert [(row, type(error)) for row, error in errors] == [(1, InvalidBookIntError), (2, InvalidRowError)]
+
+    csv_file = tmp_path / 'books.csv'
+    csv_file.write_bytes('title,author,year\nВойна и мир,Лев Толстой,1869\n'.encode('utf-8')
+                         + b'\xff\xfe,x,1\n' + 'Горе от ума,Грибоедов,1825\n'.encode('utf-8'))
+    jsonl_file = tmp_path / 'books.jsonl'
+    jsonl_file.write_bytes(b'{"title": "\xff"}\n'
+                           + '{"title": "Обломов", "author": "Гончаров", "year": 1859}\n'.encode('utf-8'))
+    csv_rows, jsonl_rows = list(read_rows(str(csv_file))), list(read_rows(str(jsonl_file)))
+    assert [type(row) for row in csv_rows] == [dict, InvalidRowError, dict]
+    assert [type(row) for row in jsonl_rows] == [InvalidRowError, dict]
+    assert library.add_books(csv_rows)[0] == 2 and library.add_books(jsonl_rows)[0] == 1
@@ -0,0 +1,163 @@
+"""
+Модуль для тестирования файла индексов библиотеки (book.index_file) и загрузки индексов вместо их построения.
+"""
+
+import logging
+import os
+import threading
+import pytest
+from book.book_class import Book, Library
+from book.index_file import dump_indexes, read_indexes, write_indexes
+from book.lexicon import LEXICON_LOG
+from book.search_index import SearchIndex
+from book.secondary_index import SecondaryIndex
+from book.user_exception import NotBookError
+
+
+BOOKS = [
+    ('Война и мир', 'Лев Толстой', '1869'),
+    ('Горе от ума', 'Александр Грибоедов', '1825'),
+    ('Анна Каренина', 'Лев Толстой', '1877'),
+    ('Мертвые души', 'Николай Гоголь', '1842'),
+]
+QUERIES = ['толстой', 'ар', 'о', '18', 'ревизор', 'мир']
+
+
+def found_ids(library, method, *args):
+    try:
+        return [book.id for book in getattr(library, method)(*args)]
+    except NotBookError:
+        return []
+
+
+def results(library):
+    """Возвращает результаты всех видов поиска для сравнения библиотек."""
+    return ([found_ids(library, 'search_books', query) for query in QUERIES],
+            found_ids(library, 'find_by_author', 'Лев Толстой'),
+            found_ids(library, 'find_by_year_range', 1800, 1850),
+            found_ids(library, 'find_by_status', 'выдана'))
+
+
+def rebuilt(filename, **options):
+    """Открывает библиотеку, построив индексы заново (файл индексов на время откладывается)."""
+    indexes = f'{filename}.indexes'
+    os.replace(indexes, f'{indexes}.saved')
+    try:
+        return Library(filename=filename, **options)
+    finally:
+        os.replace(f'{indexes}.saved', indexes)
+
+
+def loads_saved_indexes(caplog, filename, **options):
+    """Открывает библиотеку и проверяет, что индексы загружены из файла."""
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        library = Library(filename=filename, **options)
+    assert LEXICON_LOG['load_indexes'] in caplog.text
+    return library
+
+
+def test_write_and_read_indexes(tmp_path):
+    """Тестирует запись и чтение индексов и отказ от поврежденного файла."""
+    books = [Book(book_id, *row) for book_id, row in enumerate(BOOKS, start=1)]
+    index, secondary_index = SearchIndex(books), SecondaryIndex(books)
+    filename = str(tmp_path / 'library.json.indexes')
+    write_indexes(filename, {'file': [1, 2], 'journal': 0}, dump_indexes(index, secondary_index))
+
+    stamp, loaded, loaded_secondary = read_indexes(filename)
+    assert stamp == {'file': [1, 2], 'journal': 0}
+    by_id = {book.id: book for book in books}
+    assert all(loaded.search(query, by_id) == index.search(query, by_id) for query in QUERIES)
+    assert loaded_secondary.authors == secondary_index.authors
+    assert loaded_secondary.sorted_years == [1825, 1842, 1869, 1877]
+
+    data = bytearray(open(filename, 'rb').read())
+    data[-1] ^= 0xFF
+    with open(filename, 'wb') as f:
+        f.write(bytes(data))
+    assert read_indexes(filename) is None
+
+
+@pytest.mark.parametrize('journal', [False, True])
+def test_indexes_saved_on_close(tmp_path, caplog, journal):
+    """Тестирует, что индексы, сохраненные при закрытии библиотеки, загружаются вместо построения."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=journal)
+    library.add_books(BOOKS)
+    library.update_status('2', 'выдана')
+    library.close()
+    library = loads_saved_indexes(caplog, filename, journal=journal)
+    assert results(library) == results(rebuilt(filename, journal=journal))
+    assert found_ids(library, 'search_books', 'грибоедов') == [2]
+
+
+def test_journal_applied_to_saved_indexes(tmp_path, caplog):
+    """Тестирует, что записи журнала после сохранения индексов применяются к загруженным индексам."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True)
+    library.add_books(BOOKS)
+    library.close()
+    # Изменения без закрытия библиотеки (как при сбое): индексы в файле их не учитывают
+    library = Library(filename=filename, journal=True)
+    library.remove_book('1')
+    library.add_book('Ревизор', 'Николай Гоголь', '1836')
+    library.update_status('4', 'выдана')
+
+    library = loads_saved_indexes(caplog, filename, journal=True)
+    assert found_ids(library, 'search_books', 'ревизор') == [5]
+    assert found_ids(library, 'search_books', 'мир') == []
+    assert found_ids(library, 'find_by_status', 'выдана') == [4]
+    assert results(library) == results(rebuilt(filename, journal=True))
+
+
+def test_compaction_saves_indexes(tmp_path, caplog):
+    """Тестирует, что при свертке журнала индексы сохраняются вместе с файлом библиотеки."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True, compact_threshold=3)
+    library.add_books(BOOKS)
+    library.update_status('3', 'выдана')
+    library.remove_book('2')
+    library = loads_saved_indexes(caplog, filename, journal=True)
+    assert results(library) == results(rebuilt(filename, journal=True))
+
+
+def test_stale_indexes_are_rebuilt(tmp_path, caplog):
+    """Тестирует, что индексы измененного вручную файла библиотеки не используются."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename)
+    library.add_books(BOOKS)
+    library.close()
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('[{"id": 1, "title": "Ревизор", "author": "Николай Гоголь", "year": 1836, "status": "в наличии"}]')
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        library = Library(filename=filename)
+    assert LEXICON_LOG['load_indexes'] not in caplog.text
+    assert found_ids(library, 'search_books', 'толстой') == []
+    assert found_ids(library, 'find_by_author', 'Николай Гоголь') == [1]
+
+
+def test_loaded_index_concurrent_search():
+    """Тестирует, что поиск не удаляет загруженные триграммы: параллельные читатели видят полный результат."""
+    books = {book_id: Book(book_id, *row) for book_id, row in enumerate(BOOKS, start=1)}
+    index = SearchIndex.from_packed({gram: list(ids) for gram, ids in SearchIndex(books.values()).items()})
+    barrier = threading.Barrier(8)
+    results = []
+
+    def search():
+        barrier.wait()
+        results.extend(index.search('толстой', books) for _ in range(100))
+
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(found == {1, 3} for found in results)
+    assert 'тол' in index._packed and index._ids('тол') is index._ids('тол')
+    # Изменение индекса забирает триграмму из загруженных массивов - в items она не повторяется
+    index.remove(books[1])
+    assert 'тол' not in index._packed
+    grams = [gram for gram, _ in index.items()]
+    assert len(grams) == len(set(grams))
+    assert index.search('толстой', books) == {3}
@@ -0,0 +1,81 @@
+"""
+Модуль для тестирования журнала изменений библиотеки (режим journal=True).
+"""
+
+import json
+import os
+import pytest
+from book.book_class import Library
+
+
+def test_journal_appends_instead_of_rewrite(tmp_path):
+    """Тестирует, что в режиме журнала изменения не перезаписывают файл библиотеки."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+    library.update_status('1', 'выдана')
+    library.remove_book('2')
+
+    with open(f'{filename}.journal', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['op'] for record in records] == ['add', 'add', 'status', 'remove']
+
+    # Снимок + журнал дают то же состояние библиотеки
+    reloaded = Library(filename=filename, journal=True)
+    assert list(reloaded.books) == [1]
+    assert reloaded.books[1].status == 'выдана'
+    assert reloaded.next_id == 3
+
+
+def test_journal_compaction(tmp_path):
+    """Тестирует сворачивание журнала в файл библиотеки при достижении порога."""
+    filename = tmp_path / 'library.json'
+    library = Library(filename=str(filename), journal=True, compact_threshold=2)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+
+    assert not (tmp_path / 'library.json.journal').exists()
+    with open(filename, encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
+
+
+def test_journal_skips_torn_record(tmp_path):
+    """Тестирует, что недописанная запись в конце журнала не ломает загрузку."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    with open(f'{filename}.journal', 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "book": {"id"')
+
+    reloaded = Library(filename=filename, journal=True)
+    assert len(reloaded.books) == 1
+
+
+def test_journal_survives_failed_compaction(tmp_path):
+    """Тестирует, что записи журнала не теряются, если свертка прервалась после откладывания журнала."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.storage.journal.rotate()
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+
+    reloaded = Library(filename=filename, journal=True)
+    assert [book.title for book in reloaded.books.values()] == ['Война и мир', 'Горе от ума']
+
+    reloaded.save_books()
+    assert not (tmp_path / 'library.json.journal.prev').exists()
+    assert len(Library(filename=filename, journal=True).books) == 2
+
+
+@pytest.mark.parametrize('fsync', [True, False])
+def test_journal_fsync(tmp_path, monkeypatch, fsync):
+    """Тестирует, что записи журнала сбрасываются на диск одним fsync на порцию, если fsync не отключен."""
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+    library = Library(filename=str(tmp_path / 'library.json'), journal=True, journal_fsync=fsync)
+    library.add_books([('Война и мир', 'Лев Толстой', '1869'), ('Горе от ума', 'Грибоедов', '1825')])
+    library.update_status('1', 'выдана')
+    # Первая запись создает журнал - сбрасывается и запись каталога
+    assert len(synced) == (3 if fsync else 0)
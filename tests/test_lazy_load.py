@@ -0,0 +1,150 @@
+"""
+Модуль для тестирования отложенной и фоновой загрузки библиотеки и индекса смещений книг (book.offset_index).
+"""
+
+import json
+import os
+import threading
+import pytest
+from benchmarks.bench_startup import main as bench_startup
+from book.book_class import Library
+from book.offset_index import OffsetIndex, read_record_at
+from book.user_exception import InvalidBookIDError, InvalidBookIntError
+
+
+BOOKS = [
+    ('Война и мир', 'Лев Толстой', '1869'),
+    ('Горе от ума', 'Александр Грибоедов', '1825'),
+    ('Анна Каренина', 'Лев Толстой', '1877'),
+]
+
+
+def create_library(filename, **options):
+    library = Library(filename=filename, **options)
+    library.add_books(BOOKS)
+    library.update_status('2', 'выдана')
+    library.close()
+    return [book.book_dict() for book in library.books.values()]
+
+
+def file_stamp(filename):
+    stat = os.stat(filename)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+@pytest.mark.parametrize('name', ['library.json', 'library.jsonl'])
+def test_offset_index(tmp_path, name):
+    """Тестирует чтение каждой книги по смещению и отказ от индекса после изменения файла."""
+    filename = str(tmp_path / name)
+    books = create_library(filename, lazy=True)
+    index = OffsetIndex.open(f'{filename}.idx', file_stamp(filename))
+    assert len(index) == 3 and index.find(4) is None
+    assert [read_record_at(filename, index.find(book['id'])) for book in books] == books
+    with open(filename, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert OffsetIndex.open(f'{filename}.idx', file_stamp(filename)) is None
+
+
+def test_offset_index_unordered_ids(tmp_path):
+    """Тестирует индекс библиотеки, в которой порядок книг не совпадает с порядком id."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, reuse_ids=True, lazy=True)
+    library.add_books(BOOKS)
+    library.remove_book('1')
+    assert library.create_book('Ревизор', 'Николай Гоголь', '1836').id == 1
+    library.close()
+    index = OffsetIndex.open(f'{filename}.idx', file_stamp(filename))
+    assert list(index.ids) == [1, 2, 3]
+    assert read_record_at(filename, index.find(1))['title'] == 'Ревизор'
+
+
+def test_sidecar_files_only_when_needed(tmp_path):
+    """Тестирует, что индекс смещений пишется только для отложенной загрузки, а метаданные - только для выдачи id."""
+    filename = str(tmp_path / 'library.json')
+    sidecars = lambda: sorted(name for name in os.listdir(tmp_path) if name.endswith(('.idx', '.meta')))
+    create_library(filename)
+    assert sidecars() == []
+    Library(filename=filename, lazy=True).save_books()
+    assert sidecars() == ['library.json.idx']
+    library = Library(filename=filename)
+    library.remove_book('3')
+    # Отметку next_id удаленной последней книги нельзя вычислить по файлу
+    assert sidecars() == ['library.json.meta']
+    assert Library(filename=filename).next_id == 4
+
+
+def test_lazy_get_book_without_loading(tmp_path):
+    """Тестирует, что при отложенной загрузке книга по id читается из файла, а каталог загружается при поиске."""
+    filename = str(tmp_path / 'library.json')
+    create_library(filename, lazy=True)
+    library = Library(filename=filename, lazy=True)
+    assert not library.loaded and library.books == {}
+    assert library.get_book('2').book_dict()['status'] == 'выдана'
+    with pytest.raises(InvalidBookIDError):
+        library.get_book(7)
+    with pytest.raises(InvalidBookIntError):
+        library.get_book('x')
+    assert not library.loaded
+    assert [book.id for book in library.search_books('толстой')] == [1, 3]
+    assert library.loaded and library.next_id == 4
+
+
+def test_lazy_snapshot(tmp_path):
+    """Тестирует чтение книги по id из двоичного снимка до загрузки каталога."""
+    filename = str(tmp_path / 'library.snap')
+    create_library(filename)
+    library = Library(filename=filename, lazy=True)
+    assert library.get_book(3).title == 'Анна Каренина'
+    with pytest.raises(InvalidBookIDError):
+        library.get_book(4)
+    assert not library.loaded
+
+
+def test_lazy_with_journal_loads_catalog(tmp_path):
+    """Тестирует, что при непустом журнале книга берется из загруженной библиотеки, а не из файла."""
+    filename = str(tmp_path / 'library.json')
+    create_library(filename, journal=True)
+    library = Library(filename=filename, journal=True)
+    library.update_status('1', 'выдана')
+    library.close()
+    library = Library(filename=filename, journal=True, lazy=True)
+    assert library.get_book(1).status == 'выдана'
+    assert library.loaded
+
+
+def test_background_load(tmp_path, monkeypatch):
+    """Тестирует, что во время фоновой загрузки книга по id читается из файла, а изменения ждут загрузки."""
+    filename = str(tmp_path / 'library.json')
+    create_library(filename, background_load=True)
+    release = threading.Event()
+    load_books = Library.load_books
+
+    def slow_load_books(self):
+        release.wait(5)
+        load_books(self)
+
+    monkeypatch.setattr(Library, 'load_books', slow_load_books)
+    library = Library(filename=filename, background_load=True)
+    assert not library.loaded
+    assert library.get_book(1).title == 'Война и мир'
+    added = []
+    adder = threading.Thread(target=lambda: added.append(library.create_book('Ревизор', 'Гоголь', '1836')))
+    adder.start()
+    adder.join(0.1)
+    # Новая книга не может получить id, пока не загружена отметка next_id
+    assert adder.is_alive()
+    release.set()
+    adder.join()
+    assert added[0].id == 4
+    assert library.loaded and sorted(library.books) == [1, 2, 3, 4]
+    library.close()
+
+
+def test_startup_budget(tmp_path, monkeypatch, capsys):
+    """Тестирует бенчмарк запуска: код выхода 1 только при превышении бюджета."""
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / 'startup.json'
+    assert bench_startup(['--books', '20', '--repeat', '1', '--budget', '60', '--output', str(output)]) == 0
+    assert json.loads(output.read_text(encoding='utf-8'))['get_book_s'] >= 0
+    assert bench_startup(['--books', '20', '--repeat', '1', '--budget', '0']) == 1
+    assert 'first_prompt_s' in capsys.readouterr().out
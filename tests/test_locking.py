@@ -0,0 +1,103 @@
+"""
+Модуль для тестирования одновременной работы нескольких процессов с одной библиотекой.
+
+Несколько процессов одновременно добавляют, удаляют книги и меняют их статус.
+После этого проверяется, что ни одно изменение не потеряно, а id книг не повторяются.
+Блокировка файла проверяется и для потоков одного процесса.
+"""
+
+import multiprocessing
+import threading
+import time
+import pytest
+from book.book_class import Library
+from book.locking import FileLock
+
+
+WORKERS = 4
+OPERATIONS = 30
+
+
+def worker(filename: str, journal: bool, worker_number: int, results) -> None:
+    """Выполняет смешанные операции над общей библиотекой и возвращает их результаты."""
+    library = Library(filename=filename, journal=journal, shared=True, compact_threshold=25)
+    added, removed, issued = [], [], []
+    for step in range(OPERATIONS):
+        library.add_book(f'Книга {worker_number}-{step}', f'Автор {worker_number}', '2000')
+        # После добавления next_id указывает на id, следующий за только что выданным
+        added.append(library.next_id - 1)
+        if step % 3 == 1:
+            library.remove_book(str(added[-2]))
+            removed.append(added[-2])
+        elif step % 3 == 2:
+            library.update_status(str(added[-1]), 'выдана')
+            issued.append(added[-1])
+    results.put((added, removed, issued))
+
+
+@pytest.mark.parametrize('filename, journal', [('library.json', True), ('library.json', False),
+                                               ('library.db', False)])
+def test_concurrent_writers_lose_nothing(tmp_path, filename, journal):
+    """Тестирует, что одновременные изменения нескольких процессов не теряются."""
+    filename = str(tmp_path / filename)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=(filename, journal, number, results))
+                 for number in range(WORKERS)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    all_added = [book_id for added, _, _ in outcomes for book_id in added]
+    all_removed = {book_id for _, removed, _ in outcomes for book_id in removed}
+    all_issued = {book_id for _, _, issued in outcomes for book_id in issued}
+    assert len(all_added) == len(set(all_added)) == WORKERS * OPERATIONS
+
+    library = Library(filename=filename, journal=journal, shared=True)
+    assert set(library.books) == set(all_added) - all_removed
+    assert {book_id for book_id in library.books if library.books[book_id].status == 'выдана'} == all_issued
+
+
+def test_file_lock_between_threads(tmp_path):
+    """Тестирует, что потоки с общей блокировкой файла не входят в нее одновременно."""
+    lock = FileLock(str(tmp_path / 'library.json.lock'))
+    inside, overlaps = [], []
+
+    def work():
+        for _ in range(50):
+            with lock:
+                with lock:
+                    inside.append(1)
+                    overlaps.append(len(inside) > 1)
+                    time.sleep(0.0005)
+                    inside.pop()
+
+    with lock:
+        other = threading.Thread(target=lambda: overlaps.append(lock.locked))
+        other.start()
+        other.join()
+        assert lock.locked
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not any(overlaps) and len(overlaps) == 201
+    assert lock.depth == 0 and not lock.locked
+
+
+def test_refresh_waits_for_library_lock(tmp_path):
+    """Тестирует, что refresh меняет книги только под блокировкой потоков библиотеки."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True, shared=True)
+    other = Library(filename=filename, journal=True, shared=True)
+    other.add_book('Война и мир', 'Лев Толстой', '1869')
+    with library.lock:
+        refresher = threading.Thread(target=library.refresh)
+        refresher.start()
+        refresher.join(0.1)
+        assert refresher.is_alive() and library.books == {}
+    refresher.join()
+    assert [book.title for book in library.books.values()] == ['Война и мир']
@@ -0,0 +1,73 @@
+"""
+Модуль для тестирования настройки логирования (очередь, фоновый поток и ротация файла).
+"""
+
+import logging
+import pytest
+from book.log_config import setup_logging, stop_logging
+from main import main
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    # Консольные тесты могли уже настроить логирование в book.log
+    stop_logging()
+    filename = tmp_path / 'book.log'
+    yield filename
+    stop_logging()
+
+
+def test_setup_is_done_once(log_file):
+    """Тестирует, что повторная настройка не добавляет обработчиков."""
+    root = logging.getLogger()
+    handlers = len(root.handlers)
+    setup_logging(str(log_file))
+    setup_logging(str(log_file))
+    assert len(root.handlers) == handlers + 1
+    stop_logging()
+    assert len(root.handlers) == handlers
+
+
+def test_messages_written_by_listener_with_rotation(log_file):
+    """Тестирует запись сообщений в файл и ротацию по размеру."""
+    setup_logging(str(log_file), max_bytes=2000, backup_count=2)
+    for number in range(200):
+        logging.info('%s %s', 'Сообщение', number)
+    stop_logging()
+
+    assert 'Сообщение 199' in log_file.read_text(encoding='utf-8')
+    assert (log_file.parent / 'book.log.1').exists()
+    assert (log_file.parent / 'book.log.2').exists()
+    assert not (log_file.parent / 'book.log.3').exists()
+
+
+def test_disabled_level_is_not_formatted(log_file):
+    """Тестирует, что сообщения отключенного уровня не форматируются."""
+    formatted = []
+
+    class Value:
+        def __init__(self, name):
+            self.name = name
+
+        def __str__(self):
+            formatted.append(self.name)
+            return self.name
+
+    setup_logging(str(log_file), level=logging.INFO)
+    logging.debug('%s', Value('отладка'))
+    logging.info('%s', Value('информация'))
+    stop_logging()
+
+    assert 'отладка' not in formatted
+    assert 'информация' in log_file.read_text(encoding='utf-8')
+
+
+def test_main_logs_to_given_file(log_file, tmp_path):
+    """Тестирует, что main пишет логи в файл из --log-file и останавливает поток записи при выходе."""
+    source = tmp_path / 'library.json'
+    source.write_text('[]', encoding='utf-8')
+    root = logging.getLogger()
+    handlers = len(root.handlers)
+    assert main(['--log-file', str(log_file), 'convert', str(source), str(tmp_path / 'library.jsonl')]) == 0
+    assert len(root.handlers) == handlers
+    assert log_file.exists()
@@ -0,0 +1,114 @@
+"""
+Модуль для тестирования библиотеки только для чтения, отображенной в память (book.mapped_storage).
+"""
+
+import multiprocessing
+import pytest
+from benchmarks.load_test import request
+from book.book_class import Library
+from book.server import start_server
+from book.snapshot import SnapshotError
+from book.storage import convert_library
+from book.user_exception import ReadOnlyLibraryError, NotBookError
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    source = str(tmp_path / 'library.json')
+    library = Library(source)
+    library.add_books([('Война и мир', 'Лев Толстой', '1869'), ('Горе от ума', 'Александр Грибоедов', '1825'),
+                       ('Анна Каренина', 'Лев Толстой', '1877'), ('Ревизор', 'Николай Гоголь', '1836'),
+                       ('Тихий Дон', 'Михаил Шолохов', '1928')])
+    library.remove_book('2')
+    library.update_status('3', 'выдана')
+    library.close()
+    filename = str(tmp_path / 'library.snap')
+    convert_library(source, filename)
+    return source, filename
+
+
+def search_ids(filename, term):
+    """Открывает снимок только для чтения и возвращает id найденных книг (выполняется в другом процессе)."""
+    with Library(filename, read_only=True) as library:
+        return [book.id for book in library.search_books(term)]
+
+
+def test_reads_match_loaded_library(snapshot):
+    """Тестирует, что чтение из отображенного снимка совпадает с загруженной библиотекой."""
+    source, filename = snapshot
+    expected = Library(source)
+    with Library(filename, read_only=True) as library:
+        assert len(library.books) == 4 and 2 not in library.books and '1' not in library.books
+        assert library.books[3].book_dict() == expected.books[3].book_dict()
+        assert [book.book_dict() for book in library.display_books()] == \
+               [book.book_dict() for book in expected.display_books()]
+        assert [book.id for book in library.display_books(offset=1, limit=2)] == [3, 4]
+        for term in ('толстой', 'ТОЛ', '18', '9', 'дон'):
+            assert [book.id for book in library.search_books(term)] == \
+                   [book.id for book in expected.search_books(term)]
+        with pytest.raises(NotBookError):
+            library.search_books('чехов')
+        assert [book.id for book in library.find_by_author('Лев Толстой')] == [1, 3]
+        with pytest.raises(NotBookError):
+            library.find_by_author('лев толстой')
+        assert [book.id for book in library.find_by_year_range(1830, 1880)] == [4, 1, 3]
+        assert [book.id for book in library.find_by_status('выдана')] == [3]
+        assert library.next_id == 6
+
+
+def test_close_with_unfinished_iteration(snapshot, monkeypatch):
+    """Тестирует, что снимок закрывается, пока прерванный перебор книг еще не удален."""
+    _, filename = snapshot
+    # Записи читаются несколькими порциями
+    monkeypatch.setattr('book.snapshot.RECORD_BATCH', 3)
+    library = Library(filename, read_only=True)
+    assert list(library.books) == [1, 3, 4, 5]
+    ids = iter(library.books)
+    records = library.storage.snapshot.records()
+    assert next(ids) == 1 and next(records)[0] == 1
+    library.close()
+    assert library.storage.mapping.closed
+
+
+def test_changes_are_rejected(snapshot):
+    """Тестирует, что библиотека только для чтения не изменяется."""
+    _, filename = snapshot
+    with Library(filename, read_only=True) as library:
+        with pytest.raises(ReadOnlyLibraryError):
+            library.add_book('Чайка', 'Антон Чехов', '1896')
+        with pytest.raises(ReadOnlyLibraryError):
+            library.update_status('1', 'выдана')
+        with pytest.raises(ReadOnlyLibraryError):
+            library.remove_books([1, 3])
+        assert len(library.books) == 4
+
+
+def test_json_file_is_rejected(snapshot):
+    """Тестирует, что только для чтения открывается только файл снимка."""
+    source, _ = snapshot
+    with pytest.raises(SnapshotError):
+        Library(source, read_only=True)
+
+
+def test_shared_by_processes(snapshot):
+    """Тестирует поиск в одном снимке из нескольких процессов."""
+    _, filename = snapshot
+    with multiprocessing.Pool(2) as pool:
+        results = pool.starmap(search_ids, [(filename, 'толстой'), (filename, 'ревизор')])
+    assert results == [[1, 3], [4]]
+
+
+def test_read_only_service(snapshot):
+    """Тестирует HTTP-сервис над снимком только для чтения: поиск работает, изменения получают код 403."""
+    _, filename = snapshot
+    library = Library(filename, read_only=True)
+    server = start_server(library, port=0, workers=2)
+    try:
+        status, books = request('127.0.0.1', server.server_port, 'GET', '/books?offset=0&limit=2')
+        assert status == 200 and [book['id'] for book in books] == [1, 3]
+        status, body = request('127.0.0.1', server.server_port, 'DELETE', '/books/1')
+        assert status == 403 and body['error'] == 'ReadOnlyLibraryError'
+    finally:
+        server.shutdown()
+        server.server_close()
+        library.close()
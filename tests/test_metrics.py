@@ -0,0 +1,96 @@
+"""
+Модуль для тестирования метрик библиотеки (реестр, формат Prometheus, HTTP-сервер).
+"""
+
+import urllib.request
+import pytest
+from book.book_class import Library
+from book.metrics import (MetricsRegistry, enable_metrics, disable_metrics, metrics_enabled,
+                          start_metrics_server)
+from book.user_exception import NotBookError
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    enable_metrics(registry)
+    yield registry
+    disable_metrics()
+
+
+def test_disabled_metrics_leave_methods_untouched():
+    """Тестирует, что без enable_metrics методы библиотеки не обернуты."""
+    original = Library.__dict__['add_book']
+    registry = MetricsRegistry()
+    enable_metrics(registry)
+    assert metrics_enabled()
+    assert Library.__dict__['add_book'] is not original
+    disable_metrics()
+    assert not metrics_enabled()
+    assert Library.__dict__['add_book'] is original
+
+
+def test_library_calls_are_counted(registry, tmp_path):
+    """Тестирует счетчики вызовов, длительность, байты сохранения и результаты поиска."""
+    library = Library(filename=str(tmp_path / 'library.json'))
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+    library.search_books('война')
+    with pytest.raises(NotBookError):
+        library.search_books('чайка')
+
+    calls = registry.counter('library_calls_total')
+    assert calls.value(method='add_book', status='ok') == 2
+    assert calls.value(method='search_books', status='error') == 1
+    assert registry.histogram('library_call_duration_seconds').count(method='add_book') == 2
+    lookups = registry.counter('library_lookups_total')
+    assert lookups.value(method='search_books', path='index', result='hit') == 1
+    assert lookups.value(method='search_books', path='index', result='miss') == 1
+    assert registry.histogram('library_save_bytes').count() == 2
+
+
+def test_journal_bytes(registry, tmp_path):
+    """Тестирует подсчет байт, дописанных в журнал."""
+    filename = tmp_path / 'library.json'
+    library = Library(filename=str(filename), journal=True)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    journal_size = (tmp_path / 'library.json.journal').stat().st_size
+    assert registry.counter('library_journal_bytes_total').value() == journal_size
+
+
+def test_prometheus_text_format():
+    """Тестирует вывод счетчика и гистограммы в формате Prometheus."""
+    registry = MetricsRegistry()
+    registry.counter('requests_total', 'Запросы.').inc(method='say "hi"')
+    histogram = registry.histogram('latency_seconds', 'Задержка.', buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert registry.render().splitlines() == [
+        '# HELP latency_seconds Задержка.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        'latency_seconds_sum 5.55',
+        'latency_seconds_count 3',
+        '# HELP requests_total Запросы.',
+        '# TYPE requests_total counter',
+        'requests_total{method="say \\"hi\\""} 1',
+    ]
+
+
+def test_metrics_http_endpoint():
+    """Тестирует отдачу метрик по HTTP."""
+    registry = MetricsRegistry()
+    registry.counter('requests_total', 'Запросы.').inc()
+    server = start_metrics_server(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as response:
+            assert response.status == 200
+            assert 'requests_total 1' in response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,59 @@
+"""
+Модуль для тестирования постраничного вывода книг (Library.display_books с offset и limit).
+"""
+
+from unittest.mock import patch
+import pytest
+from book.book_class import Library
+from book.book_console import display_pages
+
+
+@pytest.fixture(params=['dict', 'columnar', 'sqlite'])
+def library(request, tmp_path):
+    if request.param == 'sqlite':
+        library = Library(filename=str(tmp_path / 'library.db'))
+    else:
+        library = Library(filename=str(tmp_path / 'library.json'), journal=True,
+                          columnar=request.param == 'columnar')
+    library.add_books((f'Книга {number}', 'Автор', '2000') for number in range(1, 26))
+    yield library
+    library.close()
+
+
+def ids(books):
+    return [book.id for book in books]
+
+
+def test_pages_in_id_order(library):
+    """Тестирует, что страницы идут по возрастанию id и не пересекаются."""
+    assert ids(library.display_books(0, 10)) == list(range(1, 11))
+    assert ids(library.display_books(20, 10)) == list(range(21, 26))
+    assert library.display_books(30, 10) == []
+    assert len(library.display_books()) == 25
+
+
+@pytest.mark.parametrize('offset, limit', [(-1, None), (-5, 10), (0, -1), (10, -3)])
+def test_negative_page_bounds_rejected(library, offset, limit):
+    """Тестирует, что отрицательные offset и limit отклоняются, а не возвращают не ту страницу."""
+    with pytest.raises(ValueError):
+        library.display_books(offset, limit)
+
+
+def test_pages_follow_mutations(library):
+    """Тестирует, что страницы учитывают удаление и добавление книг."""
+    library.display_books(0, 5)
+    library.remove_book('3')
+    library.add_book('Новая книга', 'Автор', '2001')
+    assert ids(library.display_books(0, 5)) == [1, 2, 4, 5, 6]
+    assert ids(library.display_books(20, 5)) == [22, 23, 24, 25, 26]
+
+
+@patch('builtins.print')
+def test_console_pages_navigation(mock_print, library):
+    """Тестирует переход по страницам в консоли: вперед, назад и возврат в меню."""
+    with patch('builtins.input', side_effect=['1', '1', '2', '0']):
+        display_pages(library, page_size=10)
+
+    printed = [call.args[0]['id'] for call in mock_print.call_args_list
+               if call.args and isinstance(call.args[0], dict)]
+    assert printed == list(range(1, 11)) + list(range(11, 21)) + list(range(21, 26)) + list(range(11, 21))
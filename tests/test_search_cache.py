@@ -0,0 +1,93 @@
+"""
+Модуль для тестирования кэша результатов поиска (book.search_cache).
+"""
+
+import pytest
+from book.book_class import Library, Book
+from book.search_cache import SearchCache
+from book.user_exception import NotBookError
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = Library(filename=str(tmp_path / 'library.json'), journal=True)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+    return library
+
+
+def titles(books):
+    return [book.title for book in books]
+
+
+def test_repeated_search_hits_cache(library):
+    """Тестирует, что повторный запрос берется из кэша (регистр запроса не важен)."""
+    assert titles(library.search_books('толстой')) == ['Война и мир']
+    assert titles(library.search_books('ТОЛСТОЙ')) == ['Война и мир']
+    assert library.search_cache.misses == 1
+    assert library.search_cache.hits == 1
+
+
+def test_add_and_remove_invalidate_only_affected_terms(library):
+    """Тестирует точный сброс: меняются только запросы, которые совпадают с книгой."""
+    library.search_books('толстой')
+    with pytest.raises(NotBookError):
+        library.search_books('анна')
+    library.search_books('грибоедов')
+
+    library.add_book('Анна Каренина', 'Лев Толстой', '1877')
+    assert titles(library.search_books('анна')) == ['Анна Каренина']
+    assert titles(library.search_books('толстой')) == ['Война и мир', 'Анна Каренина']
+    hits = library.search_cache.hits
+    library.search_books('грибоедов')
+    assert library.search_cache.hits == hits + 1
+
+    library.remove_book('1')
+    assert titles(library.search_books('толстой')) == ['Анна Каренина']
+
+
+def test_status_change_is_visible(library):
+    """Тестирует, что книги из кэшированного результата показывают текущий статус."""
+    library.search_books('война')
+    library.update_status('1', 'выдана')
+    assert library.search_books('война')[0].status == 'выдана'
+
+
+def test_changes_from_other_process_invalidate_cache(tmp_path):
+    """Тестирует сброс кэша при подтягивании изменений другой библиотеки на том же файле."""
+    filename = str(tmp_path / 'library.json')
+    first = Library(filename=filename, journal=True, shared=True)
+    second = Library(filename=filename, journal=True, shared=True)
+    first.add_book('Война и мир', 'Лев Толстой', '1869')
+    first.search_books('толстой')
+
+    second.refresh()
+    second.add_book('Анна Каренина', 'Лев Толстой', '1877')
+    first.refresh()
+    assert titles(first.search_books('толстой')) == ['Война и мир', 'Анна Каренина']
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    """Тестирует вытеснение давно не использованных запросов и время жизни записей."""
+    now = [100.0]
+    monkeypatch.setattr('book.search_cache.time.monotonic', lambda: now[0])
+    cache = SearchCache(max_entries=2, ttl=10)
+    cache.put('а', [1], cache.version)
+    cache.put('б', [2], cache.version)
+    cache.get('а')
+    cache.put('в', [3], cache.version)
+    assert cache.get('б') is None
+    assert cache.get('а') == [1]
+
+    now[0] += 11
+    assert cache.get('а') is None
+    assert len(cache) == 1
+
+
+def test_result_computed_before_change_is_not_stored():
+    """Тестирует, что результат, вычисленный до изменения библиотеки, не попадает в кэш."""
+    cache = SearchCache()
+    version = cache.version
+    cache.invalidate_book(Book(1, 'Война и мир', 'Лев Толстой', 1869))
+    cache.put('война', [], version)
+    assert cache.get('война') is None
@@ -0,0 +1,58 @@
+"""
+Модуль для тестирования инвертированного индекса поиска книг.
+"""
+
+import pytest
+from book.book_class import Book, Library
+from book.search_index import SearchIndex
+from book.user_exception import NotBookError
+
+
+BOOKS = [
+    ('Война и мир', 'Лев Толстой', '1869'),
+    ('Анна Каренина', 'Лев Толстой', '1877'),
+    ('Горе от ума', 'Александр Грибоедов', '1825'),
+    ('Мастер и Маргарита', 'Михаил Булгаков', '1967'),
+]
+
+
+@pytest.fixture
+def libraries(tmp_path):
+    """Создает две одинаковые библиотеки: с индексом и с полным перебором."""
+    indexed = Library(filename=str(tmp_path / 'indexed.json'))
+    scanned = Library(filename=str(tmp_path / 'scanned.json'), search_index=False)
+    for library in (indexed, scanned):
+        for title, author, year in BOOKS:
+            library.add_book(title, author, year)
+    return indexed, scanned
+
+
+@pytest.mark.parametrize('term', ['война', 'ВОЙНА', 'ойна и', 'лев', 'толстой', 'Л', 'а', '18', '186',
+                                  '1869', 'р и м', 'маргарита', 'ГРИБОЕДОВ'])
+def test_index_matches_full_scan(libraries, term):
+    """Тестирует, что поиск по индексу совпадает с поиском полным перебором."""
+    indexed, scanned = libraries
+    assert [book.id for book in indexed.search_books(term)] == [book.id for book in scanned.search_books(term)]
+
+
+def test_index_is_updated_on_remove_and_reload(libraries, tmp_path):
+    """Тестирует поддержку индекса в актуальном состоянии при удалении и загрузке."""
+    indexed, _ = libraries
+    indexed.remove_book('1')
+    with pytest.raises(NotBookError):
+        indexed.search_books('война')
+
+    reloaded = Library(filename=str(tmp_path / 'indexed.json'))
+    assert [book.id for book in reloaded.search_books('толстой')] == [2]
+
+
+def test_index_stores_only_trigrams():
+    """Тестирует, что индекс хранит только триграммы, а короткие запросы оставляет перебору."""
+    books = {book_id: Book(book_id, *row) for book_id, row in enumerate(BOOKS, start=1)}
+    index = SearchIndex(books.values())
+    assert all(len(gram) == 3 for gram in index.postings)
+    assert index.search('ев', books) is None
+    assert index.search('лев', books) == {1, 2}
+    assert index.search('р и м', books) == {4}
+    index.remove(books[1])
+    assert index.search('война', books) == set()
@@ -0,0 +1,79 @@
+"""
+Модуль для тестирования вторичных индексов библиотеки (find_by_author, find_by_year_range, find_by_status).
+"""
+
+import pytest
+from book.book_class import Library
+from book.user_exception import NotBookError, InvalidBookIntError, InvalidStatusError
+
+
+BOOKS = [
+    ('Война и мир', 'Лев Толстой', '1869'),
+    ('Анна Каренина', 'Лев Толстой', '1877'),
+    ('Горе от ума', 'Грибоедов', '1825'),
+    ('Мастер и Маргарита', 'Булгаков', '1967'),
+    ('Книга 18', 'Автор', '2001'),
+]
+
+
+@pytest.fixture(params=['json', 'journal', 'scan', 'sqlite'])
+def library(request, tmp_path):
+    if request.param == 'sqlite':
+        library = Library(filename=str(tmp_path / 'library.db'))
+    else:
+        library = Library(filename=str(tmp_path / 'library.json'), journal=request.param == 'journal',
+                          secondary_index=request.param != 'scan')
+    for title, author, year in BOOKS:
+        library.add_book(title, author, year)
+    yield library
+    library.close()
+
+
+def titles(books):
+    return [book.title for book in books]
+
+
+def test_find_by_author(library):
+    """Тестирует поиск всех книг автора по точному имени."""
+    assert titles(library.find_by_author('Лев Толстой')) == ['Война и мир', 'Анна Каренина']
+    with pytest.raises(NotBookError):
+        library.find_by_author('Толстой')
+
+
+def test_find_by_year_range(library):
+    """Тестирует поиск по диапазону лет без ложных совпадений в названии."""
+    assert titles(library.find_by_year_range('1800', '1900')) == ['Горе от ума', 'Война и мир', 'Анна Каренина']
+    assert titles(library.find_by_year_range(1869, 1869)) == ['Война и мир']
+    with pytest.raises(NotBookError):
+        library.find_by_year_range(1700, 1799)
+    with pytest.raises(InvalidBookIntError):
+        library.find_by_year_range('18xx', '1900')
+
+
+def test_find_by_status_follows_mutations(library):
+    """Тестирует, что индексы обновляются при изменении статуса и удалении книги."""
+    library.update_status('1', 'выдана')
+    library.update_status('3', 'выдана')
+    assert [book.id for book in library.find_by_status('выдана')] == [1, 3]
+    assert [book.id for book in library.find_by_status('в наличии')] == [2, 4, 5]
+
+    library.remove_book('1')
+    assert [book.id for book in library.find_by_status('выдана')] == [3]
+    assert titles(library.find_by_author('Лев Толстой')) == ['Анна Каренина']
+    with pytest.raises(NotBookError):
+        library.find_by_year_range(1869, 1869)
+    with pytest.raises(InvalidStatusError):
+        library.find_by_status('потеряна')
+
+
+def test_indexes_rebuilt_on_load(tmp_path):
+    """Тестирует, что индексы восстанавливаются при загрузке из файла и журнала."""
+    filename = str(tmp_path / 'library.json')
+    library = Library(filename=filename, journal=True)
+    for title, author, year in BOOKS:
+        library.add_book(title, author, year)
+    library.update_status('2', 'выдана')
+
+    reloaded = Library(filename=filename, journal=True)
+    assert [book.id for book in reloaded.find_by_status('выдана')] == [2]
+    assert titles(reloaded.find_by_year_range(1960, 2010)) == ['Мастер и Маргарита', 'Книга 18']
@@ -0,0 +1,128 @@
+"""
+Модуль для тестирования HTTP-сервиса библиотеки (book.server) и блокировки читателей-писателей (book.rwlock).
+"""
+
+import threading
+import time
+from urllib.parse import quote
+import pytest
+from benchmarks.load_test import request, run_load
+from book.book_class import Library
+from book.rwlock import RWLock
+from book.server import start_server
+
+
+@pytest.fixture
+def service(tmp_path):
+    library = Library(filename=str(tmp_path / 'library.json'), background_save=0.05)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Александр Грибоедов', '1825')
+    server = start_server(library, port=0, workers=4)
+    yield library, server.server_port
+    server.shutdown()
+    server.server_close()
+    library.close()
+
+
+def call(port, method, path, body=None):
+    return request('127.0.0.1', port, method, path, body)
+
+
+def test_read_endpoints(service):
+    """Тестирует поиск, нечеткий поиск и страницы книг."""
+    _, port = service
+    status, books = call(port, 'GET', f"/books/search?q={quote('толстой')}")
+    assert status == 200 and [book['id'] for book in books] == [1]
+    status, books = call(port, 'GET', f"/books/search?fuzzy=1&q={quote('грибоедв')}")
+    assert status == 200 and [book['id'] for book in books] == [2]
+    status, books = call(port, 'GET', '/books?offset=1&limit=5')
+    assert status == 200 and [book['title'] for book in books] == ['Горе от ума']
+    status, book = call(port, 'GET', '/books/2')
+    assert status == 200 and book['title'] == 'Горе от ума'
+    assert call(port, 'GET', '/books/7')[0] == 404
+
+
+def test_write_endpoints(service):
+    """Тестирует добавление, изменение статуса и удаление книг, включая групповые запросы."""
+    library, port = service
+    status, book = call(port, 'POST', '/books', {'title': 'Ревизор', 'author': 'Гоголь', 'year': 1836})
+    assert status == 201 and book['id'] == 3
+    status, book = call(port, 'PUT', '/books/3/status', {'status': 'выдана'})
+    assert status == 200 and book['status'] == 'выдана'
+    assert call(port, 'POST', '/books/status', {'ids': '1-2', 'status': 'выдана'})[0] == 200
+    assert [book.id for book in library.find_by_status('выдана')] == [1, 2, 3]
+    assert call(port, 'DELETE', '/books/3') == (200, {'removed': [3]})
+    assert call(port, 'POST', '/books/remove', {'ids': [1, 2]}) == (200, {'removed': [1, 2]})
+    assert library.books == {}
+    library.flush()
+    assert Library(library.filename).books == {}
+
+
+def test_errors(service):
+    """Тестирует коды ответов для неверных данных и неизвестных книг."""
+    _, port = service
+    status, body = call(port, 'DELETE', '/books/42')
+    assert status == 404 and body['error'] == 'InvalidBookIDError'
+    assert call(port, 'GET', f"/books/search?q={quote('чехов')}")[0] == 404
+    assert call(port, 'GET', '/books/search?q=')[1]['error'] == 'NotInputError'
+    assert call(port, 'POST', '/books', {'title': 'Книга', 'author': 'Автор', 'year': 'год'})[0] == 400
+    status, body = call(port, 'PUT', '/books/1/status', {'status': 'в наличии'})
+    assert status == 400 and body['error'] == 'DuplicateStatusError'
+    status, body = call(port, 'POST', '/books/status', {'ids': [1, 7, 8], 'status': 'выдана'})
+    assert status == 404 and len(body['errors']) == 2
+    assert call(port, 'GET', '/unknown')[0] == 404
+    assert call(port, 'PUT', '/books')[0] == 405
+
+
+def test_internal_error(service, monkeypatch):
+    """Тестирует, что непредвиденная ошибка возвращается как ответ JSON с кодом 500."""
+    library, port = service
+
+    def broken(*args, **kwargs):
+        raise OSError('диск недоступен')
+
+    monkeypatch.setattr(library, 'search_books', broken)
+    status, body = call(port, 'GET', f"/books/search?q={quote('толстой')}")
+    assert status == 500 and body['error'] == 'InternalError'
+    # Сервис продолжает отвечать на другие запросы
+    assert call(port, 'GET', '/books/1')[0] == 200
+
+
+def test_concurrent_clients(service):
+    """Тестирует нагрузку многими клиентами: изменения не теряются, ошибок сервера нет."""
+    library, port = service
+    results = run_load('127.0.0.1', port, clients=8, count=20, write_ratio=0.5, max_id=2)
+    assert results['requests'] == 160
+    assert not any(stats['errors'] for stats in results['operations'].values())
+    assert len(library.books) == 2 + results['operations']['add']['count']
+    assert sorted(library.books) == list(range(1, len(library.books) + 1))
+
+
+def test_rwlock_readers_share_writer_excludes():
+    """Тестирует, что читатели работают одновременно, а писатель ждет всех читателей."""
+    lock = RWLock()
+    both_reading = threading.Barrier(2, timeout=5)
+    reading = threading.Event()
+    events = []
+
+    def reader():
+        with lock.read():
+            # Оба читателя должны одновременно находиться под блокировкой
+            both_reading.wait()
+            reading.set()
+            time.sleep(0.05)
+            events.append('read')
+
+    def writer():
+        with lock.write():
+            events.append('write')
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    assert reading.wait(5)
+    writing = threading.Thread(target=writer)
+    writing.start()
+    for thread in readers + [writing]:
+        thread.join(5)
+    assert events == ['read', 'read', 'write']
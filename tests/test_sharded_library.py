@@ -0,0 +1,139 @@
+"""
+Модуль для тестирования библиотеки с шардами (book.sharded_library).
+"""
+
+import json
+import pickle
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from benchmarks.bench_sharded import main as bench_sharded
+from book.book_class import Library
+from book.sharded_library import ShardedLibrary, shard_filename, split_library
+from book.user_exception import (BulkOperationError, DisplayBookError, DuplicateStatusError,
+                                 InvalidBookIDError, InvalidBookIntError, NotBookError, NotInputError,
+                                 YearBookError)
+
+
+BOOKS = [
+    ('Война и мир', 'Лев Толстой', '1869'),
+    ('Горе от ума', 'Александр Грибоедов', '1825'),
+    ('Анна Каренина', 'Лев Толстой', '1877'),
+    ('Мертвые души', 'Николай Гоголь', '1842'),
+    ('Ревизор', 'Николай Гоголь', '1836'),
+]
+
+
+def book_dicts(books):
+    return [book.book_dict() for book in books]
+
+
+def test_sharded_library_matches_library(tmp_path):
+    """Тестирует, что библиотека с шардами отвечает так же, как одна библиотека."""
+    library = Library(filename=str(tmp_path / 'library.json'))
+    with ShardedLibrary(str(tmp_path / 'sharded.json'), shards=3) as sharded:
+        for target in (library, sharded):
+            for row in BOOKS:
+                target.add_book(*row)
+            target.update_status('2', 'выдана')
+            target.remove_book('4')
+        assert book_dicts(sharded.search_books('толстой')) == book_dicts(library.search_books('толстой'))
+        assert book_dicts(sharded.search_books('о')) == book_dicts(library.search_books('о'))
+        assert book_dicts(sharded.find_by_author('Николай Гоголь')) == [library.books[5].book_dict()]
+        assert [book.id for book in sharded.find_by_year_range(1800, 1870)] == [1, 2, 5]
+        assert [book.id for book in sharded.find_by_status('выдана')] == [2]
+        assert book_dicts(sharded.display_books()) == book_dicts(library.display_books())
+        assert [book.id for book in sharded.display_books(1, 2)] == [2, 3]
+        assert sharded.display_books(10, 2) == []
+        with pytest.raises(ValueError):
+            sharded.display_books(-1, 2)
+        assert sharded.get_book('3').title == 'Анна Каренина'
+
+
+def test_sharded_library_errors(tmp_path):
+    """Тестирует, что ошибки библиотеки шарда передаются вызывающему процессу."""
+    with ShardedLibrary(str(tmp_path / 'sharded.json'), shards=2) as sharded:
+        with pytest.raises(DisplayBookError):
+            sharded.display_books()
+        sharded.add_book(*BOOKS[0])
+        with pytest.raises(NotBookError):
+            sharded.search_books('ревизор')
+        with pytest.raises(InvalidBookIDError) as error:
+            sharded.get_book(7)
+        assert error.value.book_id == 7
+        with pytest.raises(InvalidBookIntError):
+            sharded.update_status('x', 'выдана')
+        with pytest.raises(DuplicateStatusError):
+            sharded.update_status(1, 'в наличии')
+
+
+class BrokenShard:
+    """Пул шарда, процесс которого завершился аварийно."""
+
+    def submit(self, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool('процесс шарда завершился'))
+        return future
+
+
+def test_failed_add_does_not_use_id(tmp_path):
+    """Тестирует, что книга, которую не удалось добавить, не занимает id."""
+    with ShardedLibrary(str(tmp_path / 'sharded.json'), shards=2) as sharded:
+        with pytest.raises(NotInputError):
+            sharded.add_book('', 'Лев Толстой', '1869')
+        with pytest.raises(InvalidBookIntError):
+            sharded.create_book('Война и мир', 'Лев Толстой', '18б9')
+        with pytest.raises(YearBookError):
+            sharded.create_book('Война и мир', 'Лев Толстой', '9999')
+        assert sharded.next_id == 1
+        shard, sharded.shards[1] = sharded.shards[1], BrokenShard()
+        with pytest.raises(BrokenProcessPool):
+            sharded.create_book('Война и мир', 'Лев Толстой', '1869')
+        sharded.shards[1] = shard
+        assert [sharded.create_book(*row).id for row in BOOKS[:2]] == [1, 2]
+        assert sharded.next_id == 3
+
+
+def test_book_error_pickle():
+    """Тестирует, что ошибки с атрибутами восстанавливаются после сериализации."""
+    error = pickle.loads(pickle.dumps(BulkOperationError([InvalidBookIDError(3), DuplicateStatusError('выдана', 2)])))
+    assert str(error) == str(BulkOperationError([InvalidBookIDError(3), DuplicateStatusError('выдана', 2)]))
+
+
+def test_sharded_library_reopen(tmp_path):
+    """Тестирует, что книги хранятся в файлах своих шардов, а id и количество шардов сохраняются."""
+    filename = str(tmp_path / 'sharded.json')
+    with ShardedLibrary(filename, shards=2, journal=True) as sharded:
+        for row in BOOKS:
+            sharded.add_book(*row)
+        sharded.remove_book('5')
+    with pytest.raises(ValueError):
+        ShardedLibrary(filename, shards=3)
+    with ShardedLibrary(filename) as sharded:
+        assert len(sharded.shards) == 2
+        assert sharded.create_book('Обломов', 'Иван Гончаров', '1859').id == 6
+    for shard in range(2):
+        shard_library = Library(filename=shard_filename(filename, shard), journal=True)
+        assert sorted(shard_library.books) == [book_id for book_id in (1, 2, 3, 4, 6) if book_id % 2 == shard]
+
+
+def test_split_library(tmp_path):
+    """Тестирует деление существующего файла библиотеки на шарды."""
+    source = str(tmp_path / 'library.json')
+    library = Library(filename=source)
+    library.add_books(BOOKS)
+    library.close()
+    filename = str(tmp_path / 'sharded.json')
+    split_library(source, filename, 4)
+    with ShardedLibrary(filename) as sharded:
+        assert len(sharded.shards) == 4 and sharded.next_id == 6
+        assert book_dicts(sharded.display_books()) == book_dicts(library.display_books())
+
+
+def test_bench_sharded(tmp_path, capsys):
+    """Тестирует бенчмарк поиска в библиотеке с шардами на маленьком каталоге."""
+    output = tmp_path / 'sharded.json'
+    assert bench_sharded(['--books', '50', '--shards', '1', '2', '--rounds', '1', '--output', str(output)]) == 0
+    results = json.loads(output.read_text(encoding='utf-8'))
+    assert set(results['shards']) == {'1', '2'} and results['library']['search_qps'] > 0
+    assert 'запросов/с' in capsys.readouterr().out
@@ -0,0 +1,148 @@
+"""
+Модуль для тестирования двоичного снимка библиотеки (book.snapshot) и перевода между форматами.
+"""
+
+import io
+import json
+import struct
+import zlib
+import pytest
+from book.book_class import Library
+from book.snapshot import (HEADER, MAGIC, RECORD_V1, Snapshot, SnapshotError, is_snapshot_file, read_snapshot,
+                           write_snapshot)
+from book.storage import convert_library, iter_book_records
+from main import main
+
+
+ROWS = [
+    (2, 'Горе от ума', 'Александр Грибоедов', 1825, 'выдана'),
+    (1, 'Война и мир', 'Лев Толстой', 1869, 'в наличии'),
+    (5, 'Анна Каренина', 'Лев Толстой', '1877', 'в наличии'),
+]
+
+
+def write_rows(filename, rows=ROWS):
+    with open(filename, 'wb') as f:
+        return write_snapshot(f, rows)
+
+
+def test_write_and_read_snapshot():
+    """Тестирует запись и чтение снимка: книги упорядочены по id, повторяющиеся строки хранятся один раз."""
+    buffer = io.BytesIO()
+    assert write_snapshot(buffer, ROWS) == 3
+    snapshot = Snapshot(buffer.getvalue())
+    snapshot.verify()
+    assert snapshot.count == 3
+    # 3 названия, 2 автора, 2 статуса и год-строка '1877'
+    assert snapshot.string_count == 8
+    assert list(snapshot.rows()) == sorted(ROWS)
+
+
+def test_corrupted_snapshot(tmp_path):
+    """Тестирует обнаружение поврежденного и обрезанного снимка."""
+    filename = tmp_path / 'library.snap'
+    write_rows(filename)
+    data = bytearray(filename.read_bytes())
+    data[-3] ^= 0xFF
+    filename.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(filename))
+    filename.write_bytes(bytes(data[:-1]))
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(filename))
+    assert Library(str(filename)).books == {}
+
+
+def test_library_detects_snapshot(tmp_path):
+    """Тестирует загрузку снимка, журнал поверх снимка и сохранение в прежнем формате."""
+    filename = str(tmp_path / 'library.json')
+    write_rows(filename)
+    library = Library(filename, journal=True)
+    assert sorted(library.books) == [1, 2, 5]
+    assert [book.title for book in library.search_books('толстой')] == ['Война и мир', 'Анна Каренина']
+    assert library.create_book('Ревизор', 'Николай Гоголь', '1836').id == 6
+    library.remove_book('2')
+    library.close()
+
+    library = Library(filename, journal=True)
+    assert sorted(library.books) == [1, 5, 6]
+    library.save_books()
+    library.close()
+    # Файл с расширением '.json', который был снимком, остается снимком
+    assert is_snapshot_file(filename)
+    assert [book['id'] for book in iter_book_records(filename)] == [1, 5, 6]
+
+
+def test_new_snap_file(tmp_path):
+    """Тестирует, что новая библиотека с расширением '.snap' сохраняется в формате снимка."""
+    filename = str(tmp_path / 'library.snap')
+    library = Library(filename)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.close()
+    with open(filename, 'rb') as f:
+        assert f.read(len(MAGIC)) == MAGIC
+    assert [book.title for book in Library(filename).books.values()] == ['Война и мир']
+
+
+def test_convert_both_directions(tmp_path):
+    """Тестирует перевод JSON в снимок и обратно с учетом журнала изменений."""
+    source = str(tmp_path / 'library.json')
+    library = Library(source, journal=True)
+    library.add_books([('Война и мир', 'Лев Толстой', '1869'), ('Горе от ума', 'Грибоедов', '1825')])
+    library.update_status('2', 'выдана')
+    library.close()
+
+    snap = str(tmp_path / 'library.snap')
+    assert convert_library(source, snap) == 2
+    assert is_snapshot_file(snap)
+    back = str(tmp_path / 'back.jsonl')
+    assert main(['--log-file', str(tmp_path / 'book.log'), 'convert', snap, back]) == 0
+    with open(back, encoding='utf-8') as f:
+        books = [json.loads(line) for line in f]
+    assert books == [book.book_dict() for book in Library(source, journal=True).books.values()]
+    assert books[1]['status'] == 'выдана'
+
+
+def test_snapshot_keeps_year_type(tmp_path):
+    """Тестирует, что нечисловой год сохраняется в снимок, а год, который записать нельзя, - ошибка сохранения."""
+    source = str(tmp_path / 'library.json')
+    records = [{'id': 1, 'title': 'Слово о полку Игореве', 'author': 'Неизвестен', 'year': 'неизв.', 'status': 'в наличии'},
+               {'id': 2, 'title': 'Мы', 'author': 'Евгений Замятин', 'year': '2020', 'status': 'выдана'},
+               {'id': 3, 'title': 'Война и мир', 'author': 'Лев Толстой', 'year': 1869, 'status': 'в наличии'}]
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+    snap = str(tmp_path / 'library.snap')
+    assert convert_library(source, snap) == 3
+    assert [book.book_dict() for book in Library(snap).books.values()] == records
+    mapped = Library(snap, read_only=True)
+    assert [book.book_dict() for book in mapped.search_books('неизв')] == records[:1]
+    assert [book.id for book in mapped.find_by_year_range(1800, 2020)] == [3, 2]
+    mapped.close()
+
+    library = Library(snap)
+    library.books[3].year = 1869.5
+    with pytest.raises(ValueError):
+        library.save_books()
+    assert [book.book_dict() for book in Library(snap).books.values()] == records
+
+
+def test_read_version_1_snapshot():
+    """Тестирует чтение снимка версии 1 (год только числом)."""
+    rows = sorted((book_id, title, author, int(year), status) for book_id, title, author, year, status in ROWS)
+    strings = []
+    for row in rows:
+        for value in (row[1], row[2], row[4]):
+            if value not in strings:
+                strings.append(value)
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    body = b''.join(struct.pack('<I', offset) for offset in offsets) + b''.join(encoded) + b''.join(
+        RECORD_V1.pack(row[0], row[3], strings.index(row[1]), strings.index(row[2]), strings.index(row[4]))
+        for row in rows)
+    data = HEADER.pack(MAGIC, 1, len(rows), len(strings), offsets[-1], zlib.crc32(body)) + body
+    snapshot = Snapshot(data)
+    snapshot.verify()
+    assert list(snapshot.rows()) == rows
+    assert snapshot.row(snapshot.find_row(5)) == rows[-1]
@@ -0,0 +1,117 @@
+"""
+Модуль для тестирования хранилища библиотеки в SQLite.
+"""
+
+import json
+import sqlite3
+import pytest
+from book.book_class import Book, Library
+from book.sqlite_storage import FTS_SCHEMA, SCHEMA, SqliteStorage, migrate_json_to_sqlite
+from book.user_exception import NotBookError, InvalidBookIDError
+
+
+@pytest.fixture
+def db_library(tmp_path):
+    """Создает библиотеку в базе SQLite с несколькими книгами."""
+    library = Library(filename=str(tmp_path / 'library.db'))
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Анна Каренина', 'Лев Толстой', '1877')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+    return library
+
+
+def test_sqlite_single_row_operations(db_library, tmp_path):
+    """Тестирует добавление, изменение статуса и удаление книг в SQLite."""
+    db_library.update_status('2', 'выдана')
+    db_library.remove_book('1')
+    with pytest.raises(InvalidBookIDError):
+        db_library.remove_book('1')
+
+    rows = sqlite3.connect(str(tmp_path / 'library.db')).execute(
+        'SELECT id, status FROM books ORDER BY id').fetchall()
+    assert rows == [(2, 'выдана'), (3, 'в наличии')]
+
+    reloaded = Library(filename=str(tmp_path / 'library.db'))
+    assert isinstance(reloaded.storage, SqliteStorage)
+    assert reloaded.next_id == 4
+    assert reloaded.books[2].status == 'выдана'
+
+
+@pytest.mark.parametrize('term, expected', [('ВОЙНА', [1]), ('лев', [1, 2]), ('ре', [2, 3]), ('18', [1, 2, 3]),
+                                            ('1877', [2]), ('грибоед', [3])])
+def test_sqlite_search(db_library, term, expected):
+    """Тестирует поиск по подстроке через FTS5 и перебором для коротких запросов."""
+    assert [book.id for book in db_library.search_books(term)] == expected
+
+
+def test_sqlite_search_not_found(db_library):
+    """Тестирует ошибку поиска, если книга не найдена."""
+    with pytest.raises(NotBookError):
+        db_library.search_books('пушкин')
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    """Тестирует перенос библиотеки из JSON в SQLite."""
+    json_library = Library(filename=str(tmp_path / 'library.json'), journal=True)
+    json_library.add_book('Война и мир', 'Лев Толстой', '1869')
+    json_library.add_book('Горе от ума', 'Грибоедов', '1825')
+
+    assert migrate_json_to_sqlite(str(tmp_path / 'library.json'), str(tmp_path / 'library.db')) == 2
+    db_library = Library(filename=str(tmp_path / 'library.db'))
+    assert [book.book_dict() for book in db_library.display_books()] == \
+           [book.book_dict() for book in json_library.display_books()]
+
+
+def test_migrate_closes_source_without_indexes(tmp_path, monkeypatch):
+    """Тестирует, что перенос не строит индексы исходной библиотеки и закрывает ее."""
+    json_filename = str(tmp_path / 'library.json')
+    with Library(filename=json_filename) as json_library:
+        json_library.add_book('Война и мир', 'Лев Толстой', '1869')
+    opened = []
+
+    class TrackedLibrary(Library):
+        def close(self):
+            opened.remove(self)
+            super().close()
+
+    def tracked(*args, **kwargs):
+        library = TrackedLibrary(*args, **kwargs)
+        opened.append(library)
+        assert library.index is None and library.secondary_index is None and library.search_cache is None
+        return library
+
+    monkeypatch.setattr('book.sqlite_storage.Library', tracked)
+    assert migrate_json_to_sqlite(json_filename, str(tmp_path / 'library.db')) == 1
+    assert opened == []
+
+
+def test_year_range_with_string_and_integer_years(tmp_path):
+    """Тестирует, что годы строкой (как в исходном файле JSON) и числом находятся одинаково в JSON и SQLite."""
+    json_filename = tmp_path / 'library.json'
+    json_filename.write_text(json.dumps([
+        {'id': 1, 'title': 'Война и мир', 'author': 'Лев Толстой', 'year': '1869', 'status': 'в наличии'},
+        {'id': 2, 'title': 'Горе от ума', 'author': 'Грибоедов', 'year': 1825, 'status': 'в наличии'},
+        {'id': 3, 'title': 'Ревизор', 'author': 'Гоголь', 'year': '1836', 'status': 'в наличии'},
+    ], ensure_ascii=False), encoding='utf-8')
+    json_library = Library(filename=str(json_filename))
+    migrate_json_to_sqlite(str(json_filename), str(tmp_path / 'library.db'))
+    db_library = Library(filename=str(tmp_path / 'library.db'))
+    for start, end in ((1800, 1870), (1830, 1840), (1869, 1869)):
+        assert [book.id for book in db_library.find_by_year_range(start, end)] == \
+               [book.id for book in json_library.find_by_year_range(start, end)]
+    db_library.books[4] = Book(4, 'Обломов', 'Гончаров', '1859')
+    assert [book.id for book in db_library.find_by_year_range(1850, 1860)] == [4]
+
+
+def test_text_years_cast_in_old_database(tmp_path):
+    """Тестирует приведение текстовых годов в базе, созданной со столбцом year без типа."""
+    filename = str(tmp_path / 'library.db')
+    connection = sqlite3.connect(filename)
+    connection.executescript(SCHEMA.replace('year INTEGER,', 'year,'))
+    connection.executescript(FTS_SCHEMA)
+    connection.executemany('INSERT INTO books VALUES (?, ?, ?, ?, ?)', [
+        (1, 'Война и мир', 'Лев Толстой', '1869', 'в наличии'), (2, 'Горе от ума', 'Грибоедов', 1825, 'в наличии')])
+    connection.commit()
+    connection.close()
+    library = Library(filename=filename)
+    assert [book.id for book in library.find_by_year_range(1800, 1870)] == [2, 1]
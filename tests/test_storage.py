@@ -0,0 +1,55 @@
+"""
+Модуль для тестирования потокового чтения и записи файла библиотеки.
+"""
+
+import io
+import json
+import pytest
+from book.book_class import Library
+from book.storage import iter_json_array, iter_book_records, write_book_records
+
+
+RECORDS = [
+    {'id': 1, 'title': 'Война и мир', 'author': 'Лев Толстой', 'year': 1869, 'status': 'в наличии'},
+    {'id': 20, 'title': 'Горе, [от] ума', 'author': 'Грибоедов', 'year': 1825, 'status': 'выдана'},
+    {'id': 300, 'title': '"Кавычки" }{', 'author': 'Автор', 'year': 2020, 'status': 'в наличии'},
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1024])
+def test_iter_json_array_any_chunk_size(chunk_size):
+    """Тестирует потоковый разбор массива при любом размере блока чтения."""
+    data = json.dumps(RECORDS, ensure_ascii=False, indent=4)
+    assert list(iter_json_array(io.StringIO(data), chunk_size=chunk_size)) == RECORDS
+    assert list(iter_json_array(io.StringIO(' [ ] '), chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize('data', ['', '[', '[{"id": 1}', '[{"id": 1} {"id": 2}]', '{"id": 1'])
+def test_iter_book_records_broken_file(tmp_path, data):
+    """Тестирует ошибку разбора поврежденного файла."""
+    filename = tmp_path / 'library.json'
+    filename.write_text(data, encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_book_records(str(filename), chunk_size=4))
+
+
+def test_write_book_records_matches_json_dump():
+    """Тестирует, что потоковая запись дает тот же файл, что и json.dump."""
+    for records in (RECORDS, []):
+        f = io.StringIO()
+        write_book_records(f, iter(records))
+        assert f.getvalue() == json.dumps(records, ensure_ascii=False, indent=4)
+
+
+def test_library_jsonl_roundtrip(tmp_path):
+    """Тестирует хранение библиотеки в формате JSON Lines."""
+    filename = str(tmp_path / 'library.jsonl')
+    library = Library(filename=filename)
+    library.add_book('Война и мир', 'Лев Толстой', '1869')
+    library.add_book('Горе от ума', 'Грибоедов', '1825')
+
+    with open(filename, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+    reloaded = Library(filename=filename)
+    assert [book.title for book in reloaded.books.values()] == ['Война и мир', 'Горе от ума']
+    assert reloaded.next_id == 3